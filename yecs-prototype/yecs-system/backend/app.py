@@ -1,11 +1,25 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
-from database.database import db, User, BusinessProfile, FinancialData, CreditScore
+from sqlalchemy import select, insert, func
+from database.database import (db, User, BusinessProfile, FinancialData, CreditScore,
+                               create_missing_indexes, load_scoring_inputs)
+from database.engine import configure_database, install_engine_hooks
 from models.scoring_algorithm import YECScoringAlgorithm
-from models.ml_models import YECSMLModel
+from models.model_artifact import LazyModel
+from models.ollama_async import AsyncOllamaIntegration, EventLoopThread
+from models.explanation_templates import TemplateExplainer
 from utils.bias_detector import BiasDetector
 from utils.data_processor import DatasetProcessor
+from utils.bias_statistics import BiasStatisticsStore, user_demographics
+from utils.score_cache import ScoreCache
+from utils.bulk_import import BulkImporter
+from utils.score_history import parse_fields, load_score_history
+from utils.score_distribution import ScoreDistributionStore
+from utils.quantile_sketch import PercentileSketchStore, SKETCH_METRICS
+from utils.job_queue import JobQueue, JOB_STATUSES, FINISHED_STATUSES, job_summary
 import os
+import json
+import math
 import logging
 from datetime import datetime
 
@@ -13,7 +27,7 @@ app = Flask(__name__)
 CORS(app)
 
 # Configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///yecs.db'
+configure_database(app)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
@@ -22,9 +36,28 @@ db.init_app(app)
 
 # Initialize models
 scoring_algorithm = YECScoringAlgorithm()
-ml_model = YECSMLModel()
-bias_detector = BiasDetector()
+# Loaded from its memory-mapped artifact on first prediction (or by warm_up)
+ml_model = LazyModel(os.environ.get('YECS_MODEL_ARTIFACT', 'artifacts/yecs_model'))
+bias_detector = BiasDetector(bootstrap_workers=int(os.environ.get('YECS_BIAS_BOOTSTRAP_WORKERS', 1)))
 data_processor = DatasetProcessor()
+bias_statistics = BiasStatisticsStore()
+score_distribution = ScoreDistributionStore(snapshot_ttl=float(os.environ.get('YECS_DISTRIBUTION_SNAPSHOT_TTL', 5)))
+percentile_sketches = PercentileSketchStore(
+    persist_interval=float(os.environ.get('YECS_SKETCH_PERSIST_INTERVAL', 30)),
+    refresh_interval=float(os.environ.get('YECS_SKETCH_REFRESH_INTERVAL', 10))
+)
+ollama = AsyncOllamaIntegration(base_url=os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'))
+# LLM calls run on one shared event loop; request threads only wait for their result
+ollama_loop = EventLoopThread()
+template_explainer = TemplateExplainer(scoring_algorithm.weights, scoring_algorithm.score_range)
+score_cache = ScoreCache(max_entries=int(os.environ.get('YECS_SCORE_CACHE_SIZE', 10000)))
+# Heavy work (bias audits, dataset processing, training) runs in `python job_worker.py` processes
+job_queue = JobQueue(
+    poll_interval=float(os.environ.get('YECS_JOB_POLL_INTERVAL', 1)),
+    stale_after=float(os.environ.get('YECS_JOB_STALE_AFTER', 60))
+)
+# Dataset job paths are resolved inside this directory
+DATA_DIR = os.environ.get('YECS_DATA_DIR', 'data')
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -34,11 +67,80 @@ logging.basicConfig(level=logging.INFO)
 def create_tables():
     """Create database tables"""
     with app.app_context():
+        install_engine_hooks(db.engine)
         db.create_all()
+        create_missing_indexes()
+
+
+def bootstrap_statistics():
+    """Rebuild derived statistics that don't match the stored scores, e.g. on the first deploy over existing data"""
+    with app.app_context():
+        stores = (('bias group statistics', bias_statistics), ('score histograms', score_distribution),
+                  ('percentile sketches', percentile_sketches))
+        for name, store in stores:
+            try:
+                if store.needs_rebuild():
+                    logging.info(f"Rebuilding {name} from the stored scores")
+                    store.rebuild()
+                    db.session.commit()
+            except Exception as e:
+                # Another process may be rebuilding at the same time; the endpoints can still rebuild later
+                db.session.rollback()
+                logging.error(f"Error rebuilding {name}: {str(e)}")
+        score_distribution.invalidate()
 
 
 # Initialize database tables
 create_tables()
+bootstrap_statistics()
+
+
+def warm_up():
+    """Load models ahead of the first request, e.g. from a server start-up hook"""
+    ml_model.warm_up()
+
+
+def build_user_data(business_profile, financial_data):
+    """Assemble the nested scoring input from a business profile and financial data row"""
+    return {
+        'business': {
+            'business_plan_quality': business_profile.business_plan_quality,
+            'revenue_projection': business_profile.revenue_projection,
+            'industry': business_profile.industry,
+            'years_of_experience': business_profile.years_of_experience,
+            'market_analysis_score': 0.7,
+            'industry_average_revenue': 100000
+        },
+        'financial': {
+            'monthly_income': financial_data.monthly_income,
+            'monthly_expenses': financial_data.monthly_expenses,
+            'savings_amount': financial_data.savings_amount,
+            'debt_amount': financial_data.debt_amount,
+            'utility_payment_score': financial_data.utility_payment_score,
+            'rent_payment_score': financial_data.rent_payment_score,
+            'student_loan_payment_score': 0.8,
+            'subscription_payment_score': 0.9,
+            'tax_filing_score': 0.9,
+            'overdraft_score': 0.8
+        },
+        'credit': {
+            'traditional_credit_score': 0,
+            'credit_utilization': 0.2,
+            'recent_credit_inquiries': 1
+        },
+        'education': {
+            'education_level': business_profile.education_level,
+            'industry_experience_years': business_profile.years_of_experience,
+            'professional_certifications': 2,
+            'entrepreneurship_courses': 1
+        },
+        'social': {
+            'identity_verification_score': 0.9,
+            'professional_network_score': 0.7,
+            'online_business_presence': 0.6,
+            'community_involvement_score': 0.5
+        }
+    }
 
 
 @app.route('/')
@@ -91,6 +193,52 @@ def create_user():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@app.route('/api/users/bulk', methods=['POST'])
+def bulk_import_users():
+    """Import many applicants (user plus optional business profile and financial data) at once.
+
+    Accepts a JSON array of flat applicant objects (or {"applicants": [...]}) or a CSV
+    upload, as a multipart "file" field or a text/csv body. Rows are written in chunks
+    of chunk_size; invalid or duplicate rows are reported without aborting the batch.
+    """
+    try:
+        data = None
+        if 'file' in request.files:
+            source = request.files['file']
+        elif request.mimetype == 'text/csv':
+            source = request.stream
+        else:
+            source = None
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({'error': 'Expected a JSON array of applicants or a CSV upload'}), 400
+
+        chunk_size = request.args.get('chunk_size')
+        if isinstance(data, dict):
+            chunk_size = data.get('chunk_size', chunk_size)
+            data = data.get('applicants')
+        try:
+            chunk_size = int(chunk_size or 1000)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'chunk_size must be an integer'}), 400
+        if chunk_size <= 0:
+            return jsonify({'error': 'chunk_size must be positive'}), 400
+
+        importer = BulkImporter(chunk_size=chunk_size)
+        try:
+            frame = importer.frame_from_csv(source) if source is not None else importer.frame_from_records(data)
+            result = importer.import_frame(frame)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify(result), 201 if result['created'] else 200
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error importing users: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @app.route('/api/users/<int:user_id>/business-profile', methods=['POST'])
 def create_business_profile(user_id):
     """Create business profile for a user"""
@@ -115,6 +263,7 @@ def create_business_profile(user_id):
 
         db.session.add(business_profile)
         db.session.commit()
+        score_cache.invalidate(user_id)
 
         return jsonify({
             'business_profile_id': business_profile.id,
@@ -150,6 +299,7 @@ def create_financial_data(user_id):
 
         db.session.add(financial_data)
         db.session.commit()
+        score_cache.invalidate(user_id)
 
         return jsonify({
             'financial_data_id': financial_data.id,
@@ -165,60 +315,25 @@ def create_financial_data(user_id):
 def calculate_yecs_score(user_id):
     """Calculate YECS score for a user"""
     try:
-        # Fixed: Use db.session.get() instead of User.query.get()
-        user = db.session.get(User, user_id)
+        # Load user, business profile and financial data in one query
+        user, business_profile, financial_data = load_scoring_inputs(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        # Get business profile
-        business_profile = BusinessProfile.query.filter_by(user_id=user_id).first()
         if not business_profile:
             return jsonify({'error': 'Business profile not found'}), 404
 
-        # Get financial data
-        financial_data = FinancialData.query.filter_by(user_id=user_id).first()
         if not financial_data:
             return jsonify({'error': 'Financial data not found'}), 404
 
         # Prepare data for scoring
-        user_data = {
-            'business': {
-                'business_plan_quality': business_profile.business_plan_quality,
-                'revenue_projection': business_profile.revenue_projection,
-                'years_of_experience': business_profile.years_of_experience,
-                'market_analysis_score': 0.7,
-                'industry_average_revenue': 100000
-            },
-            'financial': {
-                'monthly_income': financial_data.monthly_income,
-                'monthly_expenses': financial_data.monthly_expenses,
-                'savings_amount': financial_data.savings_amount,
-                'debt_amount': financial_data.debt_amount,
-                'utility_payment_score': financial_data.utility_payment_score,
-                'rent_payment_score': financial_data.rent_payment_score,
-                'student_loan_payment_score': 0.8,
-                'subscription_payment_score': 0.9,
-                'tax_filing_score': 0.9,
-                'overdraft_score': 0.8
-            },
-            'credit': {
-                'traditional_credit_score': 0,
-                'credit_utilization': 0.2,
-                'recent_credit_inquiries': 1
-            },
-            'education': {
-                'education_level': business_profile.education_level,
-                'industry_experience_years': business_profile.years_of_experience,
-                'professional_certifications': 2,
-                'entrepreneurship_courses': 1
-            },
-            'social': {
-                'identity_verification_score': 0.9,
-                'professional_network_score': 0.7,
-                'online_business_presence': 0.6,
-                'community_involvement_score': 0.5
-            }
-        }
+        user_data = build_user_data(business_profile, financial_data)
+
+        # Reuse the stored score if neither the inputs nor the algorithm changed
+        fingerprint = score_cache.fingerprint(user_data, scoring_algorithm)
+        cached_result = score_cache.get(user_id, fingerprint)
+        if cached_result is not None:
+            return jsonify(dict(cached_result, cached=True)), 200
 
         # Calculate YECS score
         final_score, component_scores = scoring_algorithm.calculate_yecs_score(user_data)
@@ -237,47 +352,275 @@ def calculate_yecs_score(user_id):
         )
 
         db.session.add(credit_score)
+        bias_statistics.record_scores([(user_demographics(user), final_score)])
+        score_rows = score_distribution.score_row_values([credit_score])
+        score_distribution.record_scores(score_rows)
         db.session.commit()
+        score_distribution.invalidate()
+        percentile_sketches.record_scores(score_rows)
 
-        return jsonify({
+        result = {
             'user_id': user_id,
             'yecs_score': final_score,
             'risk_level': component_scores['risk_level'],
             'component_scores': component_scores,
             'timestamp': datetime.utcnow().isoformat()
-        }), 200
+        }
+        score_cache.put(user_id, fingerprint, result)
+
+        return jsonify(dict(result, cached=False)), 200
 
     except Exception as e:
         logging.error(f"Error calculating YECS score: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 
+def _first_rows_by_user(model, user_ids):
+    """Load the first row of a per-user table for each user id in one query"""
+    rows = db.session.execute(
+        select(model.__table__).where(model.user_id.in_(user_ids)).order_by(model.id)
+    )
+    first_rows = {}
+    for row in rows:
+        first_rows.setdefault(row.user_id, row)
+    return first_rows
+
+
+def _batch_user_id_chunks(data, chunk_size):
+    """Yield chunks of user ids from an explicit id list or an id-range filter"""
+    if data.get('user_ids') is not None:
+        user_ids = [int(user_id) for user_id in data['user_ids']]
+        for start in range(0, len(user_ids), chunk_size):
+            yield user_ids[start:start + chunk_size]
+        return
+
+    user_filter = data.get('filter', {})
+    last_id = int(user_filter.get('min_user_id', 1)) - 1
+    max_id = user_filter.get('max_user_id')
+
+    while True:
+        query = select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+        if max_id is not None:
+            query = query.where(User.id <= int(max_id))
+        user_ids = db.session.execute(query).scalars().all()
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def _score_user_chunk(user_ids):
+    """Score one chunk of users, bulk insert their CreditScore rows and return the result lines"""
+    users = {user.id: user for user in db.session.execute(select(User.id, User.age).where(User.id.in_(user_ids)))}
+    business_profiles = _first_rows_by_user(BusinessProfile, user_ids)
+    financial_rows = _first_rows_by_user(FinancialData, user_ids)
+
+    results = []
+    scored_ids = []
+    records = []
+    for user_id in user_ids:
+        if user_id not in users:
+            results.append({'user_id': user_id, 'error': 'User not found'})
+        elif user_id not in business_profiles:
+            results.append({'user_id': user_id, 'error': 'Business profile not found'})
+        elif user_id not in financial_rows:
+            results.append({'user_id': user_id, 'error': 'Financial data not found'})
+        else:
+            scored_ids.append(user_id)
+            records.append(build_user_data(business_profiles[user_id], financial_rows[user_id]))
+
+    if not records:
+        return results
+
+    final_scores, component_scores = scoring_algorithm.calculate_yecs_scores_batch(
+        scoring_algorithm.flatten_user_data(records)
+    )
+
+    timestamp = datetime.utcnow()
+    score_rows = []
+    for i, user_id in enumerate(scored_ids):
+        components = {name: float(values[i]) for name, values in component_scores.items() if name != 'risk_level'}
+        risk_level = component_scores['risk_level'][i]
+        score_rows.append({
+            'user_id': user_id,
+            'yecs_score': int(final_scores[i]),
+            'business_viability_score': components['business_viability'],
+            'payment_history_score': components['payment_history'],
+            'financial_management_score': components['financial_management'],
+            'personal_creditworthiness_score': components['personal_creditworthiness'],
+            'education_background_score': components['education_background'],
+            'social_verification_score': components['social_verification'],
+            'risk_level': risk_level,
+            'created_at': timestamp
+        })
+        results.append({
+            'user_id': user_id,
+            'yecs_score': int(final_scores[i]),
+            'risk_level': risk_level,
+            'component_scores': dict(components, risk_level=risk_level),
+            'timestamp': timestamp.isoformat()
+        })
+
+    db.session.execute(insert(CreditScore), score_rows)
+    bias_statistics.record_scores(
+        (user_demographics(users[row['user_id']]), row['yecs_score']) for row in score_rows
+    )
+    score_distribution.record_scores(score_rows)
+    db.session.commit()
+    score_distribution.invalidate()
+    percentile_sketches.record_scores(score_rows)
+
+    return results
+
+
+@app.route('/api/scores/batch', methods=['POST'])
+def calculate_yecs_scores_batch():
+    """Calculate YECS scores for many users, streamed back as NDJSON"""
+    data = request.get_json(silent=True) or {}
+
+    try:
+        chunk_size = int(data.get('chunk_size', 1000))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'chunk_size must be an integer'}), 400
+    if chunk_size <= 0:
+        return jsonify({'error': 'chunk_size must be positive'}), 400
+    if data.get('user_ids') is not None and not isinstance(data['user_ids'], list):
+        return jsonify({'error': 'user_ids must be a list'}), 400
+
+    def generate():
+        try:
+            for user_ids in _batch_user_id_chunks(data, chunk_size):
+                for result in _score_user_chunk(user_ids):
+                    yield json.dumps(result) + '\n'
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Error calculating batch YECS scores: {str(e)}")
+            yield json.dumps({'error': 'Internal server error'}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/users/<int:user_id>/explanation', methods=['GET'])
+def get_score_explanation(user_id):
+    """Explain the user's YECS score, falling back to a template if the LLM is slow or down"""
+    try:
+        try:
+            budget_ms = float(request.args.get('budget_ms', 1500))
+        except ValueError:
+            return jsonify({'error': 'budget_ms must be a number'}), 400
+        if not math.isfinite(budget_ms) or budget_ms <= 0:
+            return jsonify({'error': 'budget_ms must be a positive number'}), 400
+
+        user, business_profile, financial_data = load_scoring_inputs(user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+
+        if not business_profile:
+            return jsonify({'error': 'Business profile not found'}), 404
+
+        if not financial_data:
+            return jsonify({'error': 'Financial data not found'}), 404
+
+        user_data = build_user_data(business_profile, financial_data)
+        final_score, component_scores = scoring_algorithm.calculate_yecs_score(user_data)
+
+        explanation, source = ollama_loop.run(ollama.generate_score_explanation_hedged(
+            user_data, final_score, component_scores, template_explainer, budget_ms=budget_ms
+        ))
+
+        return jsonify({
+            'user_id': user_id,
+            'yecs_score': final_score,
+            'explanation': explanation,
+            'source': source,
+            'timestamp': datetime.utcnow().isoformat()
+        }), 200
+
+    except Exception as e:
+        logging.error(f"Error generating score explanation: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def _sse_event(data, event=None):
+    """Format one Server-Sent Events message"""
+    message = f"event: {event}\n" if event else ''
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
+@app.route('/api/users/<int:user_id>/explanation/stream', methods=['GET'])
+def stream_score_explanation(user_id):
+    """Stream an AI explanation of the user's YECS score as Server-Sent Events"""
+    try:
+        user, business_profile, financial_data = load_scoring_inputs(user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+
+        if not business_profile:
+            return jsonify({'error': 'Business profile not found'}), 404
+
+        if not financial_data:
+            return jsonify({'error': 'Financial data not found'}), 404
+
+        user_data = build_user_data(business_profile, financial_data)
+        final_score, component_scores = scoring_algorithm.calculate_yecs_score(user_data)
+
+    except Exception as e:
+        logging.error(f"Error preparing score explanation: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+    def generate():
+        # Score first so the client can render it before the first token arrives
+        yield _sse_event({'yecs_score': final_score, 'risk_level': component_scores['risk_level']}, 'score')
+        try:
+            tokens = ollama.stream_score_explanation(user_data, final_score, component_scores)
+            for token in ollama_loop.iterate(tokens):
+                yield _sse_event({'token': token})
+            yield _sse_event({}, 'done')
+        except Exception as e:
+            logging.error(f"Error streaming score explanation: {str(e)}")
+            yield _sse_event({'explanation': template_explainer.explain(final_score, component_scores),
+                              'source': 'template'}, 'fallback')
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/users/<int:user_id>/scores', methods=['GET'])
 def get_user_scores(user_id):
-    """Get user's score history"""
+    """Get user's score history, newest first.
+
+    Query parameters: limit (max 1000) and cursor (next_cursor from the previous
+    page) page through the history, 100 scores per page when only cursor is given;
+    without either the whole history is returned. Also fields (comma-separated,
+    e.g. yecs_score,payment_history) and downsample=day for one point per day.
+    """
     try:
-        scores = CreditScore.query.filter_by(user_id=user_id).order_by(CreditScore.created_at.desc()).all()
-
-        score_history = []
-        for score in scores:
-            score_history.append({
-                'score_id': score.id,
-                'yecs_score': score.yecs_score,
-                'risk_level': score.risk_level,
-                'component_scores': {
-                    'business_viability': score.business_viability_score,
-                    'payment_history': score.payment_history_score,
-                    'financial_management': score.financial_management_score,
-                    'personal_creditworthiness': score.personal_creditworthiness_score,
-                    'education_background': score.education_background_score,
-                    'social_verification': score.social_verification_score
-                },
-                'created_at': score.created_at.isoformat()
-            })
+        limit = None
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = int(request.args.get('limit', 100))
+            except ValueError:
+                return jsonify({'error': 'limit must be an integer'}), 400
+            if not 1 <= limit <= 1000:
+                return jsonify({'error': 'limit must be between 1 and 1000'}), 400
+
+        try:
+            fields = parse_fields(request.args.get('fields'))
+            page = load_score_history(
+                user_id, fields, limit,
+                cursor=request.args.get('cursor'),
+                downsample=request.args.get('downsample')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         return jsonify({
             'user_id': user_id,
-            'score_history': score_history
+            'score_history': page['score_history'],
+            'next_cursor': page['next_cursor']
         }), 200
 
     except Exception as e:
@@ -285,54 +628,480 @@ def get_user_scores(user_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 
-@app.route('/api/bias-analysis', methods=['POST'])
-def analyze_bias():
-    """Analyze bias in the scoring system"""
+@app.route('/api/score-distribution', methods=['GET'])
+def get_score_distribution():
+    """Get the distribution of stored scores.
+
+    Served from precomputed histogram buckets maintained on every score write.
+    Pass ?mode=full to recount them from every stored score first.
+    """
     try:
-        # Get all scores and user data
-        scores_query = db.session.query(CreditScore, User).join(User).all()
+        mode = request.args.get('mode', 'incremental')
+        if mode not in ('incremental', 'full'):
+            return jsonify({'error': f'Unknown score distribution mode: {mode}'}), 400
 
-        if not scores_query:
-            return jsonify({'error': 'No data available for bias analysis'}), 404
+        if mode == 'full':
+            score_distribution.rebuild()
+            db.session.commit()
+            score_distribution.invalidate()
 
-        # Prepare data for bias analysis
-        import pandas as pd
+        distribution = score_distribution.snapshot()
+        if distribution['total_scores'] == 0 and mode == 'incremental' and \
+                db.session.execute(select(CreditScore.id).limit(1)).first() is not None:
+            # Buckets emptied since start-up; start-up already rebuilds buckets that miss scores
+            score_distribution.rebuild()
+            db.session.commit()
+            score_distribution.invalidate()
+            distribution = score_distribution.snapshot()
 
-        scores_data = []
-        demographics_data = []
+        return jsonify(dict(distribution, mode=mode)), 200
 
-        for score, user in scores_query:
-            scores_data.append({
-                'user_id': user.id,
-                'yecs_score': score.yecs_score
-            })
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error getting score distribution: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def _percentile_ranks(values, mode='incremental'):
+    """Percentile ranks from the sketches; mode 'full' rebuilds them from every stored score first"""
+    if mode == 'full' or (percentile_sketches.is_empty() and
+                          db.session.execute(select(CreditScore.id).limit(1)).first() is not None):
+        percentile_sketches.rebuild()
+    return percentile_sketches.percentile_ranks(values)
 
-            demographics_data.append({
-                'user_id': user.id,
-                'age': user.age,
-                'gender': 'unknown',
-                'zip_code': 'unknown'
-            })
 
-        scores_df = pd.DataFrame(scores_data)
-        demographics_df = pd.DataFrame(demographics_data)
+def _percentile_mode():
+    mode = request.args.get('mode', 'incremental')
+    if mode not in ('incremental', 'full'):
+        raise ValueError(f'Unknown percentile mode: {mode}')
+    return mode
 
-        # Perform bias analysis
-        bias_results = bias_detector.detect_demographic_bias(scores_df, demographics_df)
 
-        # Generate report
-        bias_report = bias_detector.generate_bias_report(bias_results)
+@app.route('/api/users/<int:user_id>/percentiles', methods=['GET'])
+def get_user_percentiles(user_id):
+    """Percentile ranks of a user's latest score and component scores among all stored scores.
+
+    Pass ?mode=full to rebuild the sketches from every stored score first.
+    """
+    try:
+        try:
+            mode = _percentile_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        latest = db.session.execute(
+            select(*SKETCH_METRICS.values())
+            .where(CreditScore.user_id == user_id)
+            .order_by(CreditScore.created_at.desc(), CreditScore.id.desc())
+            .limit(1)
+        ).first()
+        if latest is None:
+            return jsonify({'error': 'No score found for user'}), 404
 
+        values = {metric: value for metric, value in zip(SKETCH_METRICS, latest) if value is not None}
         return jsonify({
-            'bias_analysis': bias_results,
-            'bias_report': bias_report,
-            'timestamp': datetime.utcnow().isoformat()
+            'user_id': user_id,
+            'scores': values,
+            'percentiles': _percentile_ranks(values, mode)
         }), 200
 
     except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error getting user percentiles: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/score-percentiles', methods=['GET'])
+def get_score_percentiles():
+    """Percentile ranks of arbitrary values, e.g. ?yecs_score=700&payment_history=63.5.
+
+    Pass ?mode=full to rebuild the sketches from every stored score first.
+    """
+    try:
+        try:
+            mode = _percentile_mode()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        values = {}
+        for metric in SKETCH_METRICS:
+            if metric in request.args:
+                try:
+                    values[metric] = float(request.args[metric])
+                except ValueError:
+                    return jsonify({'error': f'{metric} must be a number'}), 400
+        if not values:
+            return jsonify({'error': f'Pass at least one of: {", ".join(SKETCH_METRICS)}'}), 400
+
+        return jsonify({'percentiles': _percentile_ranks(values, mode), 'mode': mode}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error getting score percentiles: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/bias-analysis', methods=['POST'])
+def analyze_bias():
+    """Analyze bias in the scoring system.
+
+    By default reads the incrementally maintained group statistics. Pass
+    {"mode": "full"} (or ?mode=full) to rescan every score and rebuild them, or
+    {"mode": "intersectional"} with optional attributes, max_order and min_support
+    to audit combinations of attributes. With {"async": true} the analysis is
+    queued as a bias_audit job instead; poll /api/jobs/<job_id> for it.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode', request.args.get('mode', 'incremental'))
+        if mode not in ('incremental', 'full', 'intersectional'):
+            return jsonify({'error': f'Unknown bias analysis mode: {mode}'}), 400
+
+        if data.get('async'):
+            params = {key: value for key, value in data.items() if key != 'async'}
+            job = job_queue.submit('bias_audit', dict(params, mode=mode))
+            return jsonify({'job': job_summary(job)}), 202
+
+        try:
+            analysis = _run_bias_analysis(mode, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if analysis is None:
+            return jsonify({'error': 'No data available for bias analysis'}), 404
+
+        return jsonify(dict(analysis, mode=mode, timestamp=datetime.utcnow().isoformat())), 200
+
+    except Exception as e:
+        db.session.rollback()
         logging.error(f"Error analyzing bias: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 
+def _run_bias_analysis(mode, options):
+    """Results and report of one bias analysis mode, or None when there are no scores.
+
+    Raises ValueError for invalid intersectional options.
+    """
+    if mode == 'intersectional':
+        try:
+            max_order = int(options.get('max_order', 3))
+            min_support = int(options.get('min_support', 30))
+        except (TypeError, ValueError):
+            raise ValueError('max_order and min_support must be integers')
+
+        scores_df, demographics_df = _load_bias_frames()
+        if scores_df is None:
+            return None
+
+        intersectional_results = bias_detector.detect_intersectional_bias(
+            scores_df, demographics_df, attributes=options.get('attributes'),
+            max_order=max_order, min_support=min_support
+        )
+        return {
+            'intersectional_analysis': intersectional_results,
+            'bias_report': bias_detector.generate_intersectional_report(intersectional_results)
+        }
+
+    if mode == 'full':
+        bias_results = _full_bias_analysis()
+        if bias_results is None:
+            return None
+    else:
+        aggregates = bias_statistics.load_aggregates()
+        if not aggregates:
+            # Statistics table not populated yet (e.g. scores written before it existed)
+            bias_statistics.rebuild()
+            db.session.commit()
+            aggregates = bias_statistics.load_aggregates()
+
+        if not aggregates:
+            return None
+
+        bias_results = bias_detector.detect_demographic_bias_from_aggregates(aggregates)
+
+    # Generate report
+    bias_report = bias_detector.generate_bias_report(bias_results)
+
+    return {
+        'bias_analysis': bias_results,
+        'bias_report': bias_report
+    }
+
+
+def _load_bias_frames():
+    """Every stored score and one demographics row per scored user, as DataFrames"""
+    # Get all scores and user data
+    scores_query = db.session.query(CreditScore, User).join(User).all()
+
+    if not scores_query:
+        return None, None
+
+    # Prepare data for bias analysis
+    import pandas as pd
+
+    scores_data = []
+    demographics_data = {}
+
+    for score, user in scores_query:
+        scores_data.append({
+            'user_id': user.id,
+            'yecs_score': score.yecs_score
+        })
+
+        # One demographics row per user, so users with several scores aren't multiplied in the merge
+        demographics_data[user.id] = dict(user_demographics(user), user_id=user.id)
+
+    return pd.DataFrame(scores_data), pd.DataFrame(list(demographics_data.values()))
+
+
+def _full_bias_analysis():
+    """Run the bias analysis over every stored score and rebuild the group statistics"""
+    scores_df, demographics_df = _load_bias_frames()
+    if scores_df is None:
+        return None
+
+    # Perform bias analysis
+    bias_results = bias_detector.detect_demographic_bias(scores_df, demographics_df)
+
+    bias_statistics.rebuild()
+    db.session.commit()
+
+    return bias_results
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a background job: {"kind": "bias_audit" | "dataset_processing" | "model_training", "params": {...}}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            job = job_queue.submit(data.get('kind'), data.get('params'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({'job': job_summary(job)}), 202
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error submitting job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Most recent jobs first, optionally filtered by ?status= and ?kind="""
+    try:
+        status = request.args.get('status')
+        if status is not None and status not in JOB_STATUSES:
+            return jsonify({'error': f'Unknown job status: {status}'}), 400
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+
+        jobs = job_queue.list(status=status, kind=request.args.get('kind'), limit=limit)
+        return jsonify({'jobs': [job_summary(job) for job in jobs]}), 200
+
+    except Exception as e:
+        logging.error(f"Error listing jobs: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status and progress of a job"""
+    try:
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        return jsonify({'job': job_summary(job)}), 200
+
+    except Exception as e:
+        logging.error(f"Error getting job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/jobs/<int:job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Result of a succeeded job; 409 while it is queued or running, or when it failed or was cancelled"""
+    try:
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        if job.status != 'succeeded':
+            return jsonify({'error': f'Job is {job.status}', 'job': job_summary(job)}), 409
+
+        # Stored already serialized by the worker
+        return Response(job.result, mimetype='application/json'), 200
+
+    except Exception as e:
+        logging.error(f"Error getting job result: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job, or ask a running one to stop"""
+    try:
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        if job.status in FINISHED_STATUSES:
+            return jsonify({'error': f'Job is already {job.status}', 'job': job_summary(job)}), 409
+
+        job = job_queue.cancel(job_id)
+        return jsonify({'job': job_summary(job)}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Error cancelling job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def _data_path(path):
+    """Resolve a job path inside DATA_DIR, rejecting paths that leave it"""
+    if not isinstance(path, str) or not path:
+        raise ValueError('Dataset paths must be non-empty strings')
+    root = os.path.realpath(DATA_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f'{path} is outside the data directory')
+    return resolved
+
+
+def _bias_audit_job(job):
+    """Job handler: any /api/bias-analysis mode, off the request thread"""
+    mode = job.params.get('mode', 'full')
+    if mode not in ('incremental', 'full', 'intersectional'):
+        raise ValueError(f'Unknown bias analysis mode: {mode}')
+
+    job.progress(0.0, f'Running {mode} bias analysis')
+    analysis = _run_bias_analysis(mode, job.params)
+    if analysis is None:
+        raise ValueError('No data available for bias analysis')
+
+    return dict(analysis, mode=mode, timestamp=datetime.utcnow().isoformat())
+
+
+def _dataset_processing_job(job):
+    """Job handler: DatasetProcessor streaming run writing features/scores files under DATA_DIR"""
+    params = job.params
+    loan_data = _data_path(params.get('loan_data'))
+    student_data = _data_path(params.get('student_data'))
+    output_dir = _data_path(params.get('output_dir', 'processed'))
+
+    job.progress(0.0, 'Scanning datasets')
+    features_path, scores_path = DatasetProcessor().create_training_dataset_streaming(
+        loan_data, student_data, output_dir, chunk_size=int(params.get('chunk_size', 100000)),
+        progress=job.progress
+    )
+
+    return {
+        'features_path': os.path.relpath(features_path, os.path.realpath(DATA_DIR)),
+        'scores_path': os.path.relpath(scores_path, os.path.realpath(DATA_DIR))
+    }
+
+
+def _load_training_frame(batch_size=5000):
+    """Scoring inputs of every scored user and their latest YECS score, as training data"""
+    import pandas as pd
+
+    latest_ids = select(func.max(CreditScore.id)).group_by(CreditScore.user_id)
+    latest_scores = db.session.execute(
+        select(CreditScore.user_id, CreditScore.yecs_score).where(CreditScore.id.in_(latest_ids))
+    ).all()
+
+    records = []
+    targets = []
+    for start in range(0, len(latest_scores), batch_size):
+        chunk = latest_scores[start:start + batch_size]
+        user_ids = [row.user_id for row in chunk]
+        business_profiles = _first_rows_by_user(BusinessProfile, user_ids)
+        financial_rows = _first_rows_by_user(FinancialData, user_ids)
+        for row in chunk:
+            if row.user_id in business_profiles and row.user_id in financial_rows:
+                records.append(build_user_data(business_profiles[row.user_id], financial_rows[row.user_id]))
+                targets.append(row.yecs_score)
+
+    return scoring_algorithm.flatten_user_data(records), pd.Series(targets, dtype=float)
+
+
+def _training_search(params):
+    """TrainingPipeline settings from model_training job params, or None to train with the default parameters.
+
+    {"cv_folds": 5, "max_workers": 4,
+     "search": {"param_grid": {"rf__max_depth": [8, 16]}, "strategy": "grid" | "random", "n_iter": 10}}
+    """
+    search = params.get('search')
+    if 'cv_folds' not in params and search is None:
+        return None
+    search = search or {}
+    if not isinstance(search, dict):
+        raise ValueError('search must be an object')
+
+    param_grid = search.get('param_grid') or {}
+    if not isinstance(param_grid, dict) or not all(isinstance(values, list) for values in param_grid.values()):
+        raise ValueError('search.param_grid must map parameter names to lists of values')
+    strategy = search.get('strategy', 'grid')
+    if strategy not in ('grid', 'random'):
+        raise ValueError(f'Unknown search strategy: {strategy}')
+
+    max_workers = params.get('max_workers')
+    return {
+        'folds': int(params.get('cv_folds', 5)),
+        'max_workers': int(max_workers) if max_workers is not None else None,
+        'param_grid': param_grid,
+        'search': strategy,
+        'n_iter': int(search.get('n_iter', 10))
+    }
+
+
+def _model_training_job(job):
+    """Job handler: train YECSMLModel on the stored applicants, optionally saved as the serving artifact.
+
+    With cv_folds or search in the params, training runs through TrainingPipeline's
+    cross-validated parameter search; otherwise YECSMLModel.train_model fits the defaults.
+    """
+    from models.ml_models import YECSMLModel
+    from models.training_pipeline import TrainingPipeline
+
+    params = job.params
+    backend = params.get('backend', 'sklearn')
+    search = _training_search(params)
+
+    job.progress(0.0, 'Loading training data')
+    training_data, target_scores = _load_training_frame()
+    if len(training_data) < 10:
+        raise ValueError(f'Need at least 10 scored users with profiles to train, found {len(training_data)}')
+
+    if search is None:
+        job.progress(0.2, f'Training on {len(training_data)} users')
+        model = YECSMLModel(backend=backend)
+        result = {'metrics': model.train_model(training_data, target_scores)}
+    else:
+        job.progress(0.2, f"Searching parameters with {search['folds']}-fold cross-validation "
+                          f"on {len(training_data)} users")
+        pipeline = TrainingPipeline(backend=backend, folds=search['folds'], max_workers=search['max_workers'])
+        model, result = pipeline.run(training_data, target_scores, param_grid=search['param_grid'],
+                                     search=search['search'], n_iter=search['n_iter'])
+
+    result['training_rows'] = len(training_data)
+    if params.get('save_artifact'):
+        job.progress(0.9, 'Saving model artifact')
+        # API workers pick the new artifact up when they are reloaded
+        result['artifact_dir'] = model.save_artifact(ml_model.artifact_dir)
+
+    return result
+
+
+job_queue.register('bias_audit', _bias_audit_job)
+job_queue.register('dataset_processing', _dataset_processing_job)
+job_queue.register('model_training', _model_training_job)
+
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,147 @@
+"""Benchmark concurrent score writes against SQLite with and without the tuned pragmas.
+
+Writer processes commit one credit score per transaction, as the
+calculate-score endpoint does, while reader processes poll score history.
+Runs once with SQLite defaults (rollback journal, synchronous=FULL) and once
+with the connection hooks from database.engine (WAL, synchronous=NORMAL,
+mmap, busy timeout), reporting committed writes/s, reads/s and lock errors.
+
+Run from the backend directory:
+    python -m benchmarks.bench_concurrent_writers --writers 4 --readers 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from database.database import db, User, CreditScore, create_missing_indexes
+from database.engine import configure_database, install_engine_hooks
+
+# Matches the SQLite defaults this repo ran with before the engine hooks
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 5000}
+
+
+def create_benchmark_app(db_path, pragmas):
+    app = Flask(__name__)
+    configure_database(app, f'sqlite:///{db_path}')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        install_engine_hooks(db.engine, pragmas)
+    return app
+
+
+def seed(db_path, pragmas, num_users):
+    app = create_benchmark_app(db_path, pragmas)
+    with app.app_context():
+        db.create_all()
+        create_missing_indexes()
+        db.session.execute(insert(User), [
+            {'id': i, 'email': f'user{i}@example.com', 'first_name': 'Bench', 'last_name': 'User', 'age': 30}
+            for i in range(1, num_users + 1)
+        ])
+        db.session.commit()
+
+
+def writer(db_path, pragmas, worker_id, num_writes, num_users, ready, results):
+    app = create_benchmark_app(db_path, pragmas)
+    committed = errors = 0
+    with app.app_context():
+        ready.wait()
+        for i in range(num_writes):
+            try:
+                db.session.add(CreditScore(
+                    user_id=(worker_id * num_writes + i) % num_users + 1,
+                    yecs_score=650, business_viability_score=0.7, payment_history_score=0.8,
+                    financial_management_score=0.6, personal_creditworthiness_score=0.7,
+                    education_background_score=0.5, social_verification_score=0.6, risk_level='Medium',
+                ))
+                db.session.commit()
+                committed += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+    results.put(('write', committed, errors))
+
+
+def reader(db_path, pragmas, worker_id, num_users, ready, stop, results):
+    app = create_benchmark_app(db_path, pragmas)
+    reads = errors = 0
+    with app.app_context():
+        ready.wait()
+        while not stop.is_set():
+            user_id = (worker_id * 7919 + reads) % num_users + 1
+            try:
+                db.session.execute(
+                    select(CreditScore).where(CreditScore.user_id == user_id)
+                    .order_by(CreditScore.created_at.desc()).limit(10)
+                ).all()
+                db.session.rollback()
+                reads += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+    results.put(('read', reads, errors))
+
+
+def run(name, pragmas, args):
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp_dir:
+        db_path = os.path.abspath(os.path.join(tmp_dir, 'bench.db'))
+        seed(db_path, pragmas, args.users)
+
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        stop = context.Event()
+        # Start the clock once every process has imported and connected
+        ready = context.Barrier(args.readers + args.writers + 1)
+        readers = [context.Process(target=reader, args=(db_path, pragmas, i, args.users, ready, stop, results))
+                   for i in range(args.readers)]
+        writers = [context.Process(target=writer, args=(db_path, pragmas, i, args.writes, args.users, ready, results))
+                   for i in range(args.writers)]
+
+        for process in readers + writers:
+            process.start()
+        ready.wait()
+        start = time.perf_counter()
+        for process in writers:
+            process.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for process in readers:
+            process.join()
+
+        totals = {'write': [0, 0], 'read': [0, 0]}
+        for _ in range(len(readers) + len(writers)):
+            kind, count, errors = results.get()
+            totals[kind][0] += count
+            totals[kind][1] += errors
+
+    writes, write_errors = totals['write']
+    reads, read_errors = totals['read']
+    print(f"{name:<10} writes={writes / elapsed:8.0f}/s reads={reads / elapsed:8.0f}/s "
+          f"lock errors={write_errors + read_errors} elapsed={elapsed:.2f}s")
+    return writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=500, help='commits per writer')
+    # A tmpfs /tmp makes fsync free; point this at the disk the real database lives on
+    parser.add_argument('--dir', default=None, help='where to create the scratch database')
+    args = parser.parse_args()
+
+    baseline = run('defaults', DEFAULT_PRAGMAS, args)
+    tuned = run('tuned', None, args)
+    print(f"write throughput: {tuned / baseline:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark BiasDetector fairness metrics on a large merged frame.
+
+Compares the previous per-group loop (groupby iteration with boolean masks per
+group) against the bincount path over categorical codes, on synthetic scores,
+actual outcomes and five protected attributes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_fairness_metrics --rows 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.bias_detector import BiasDetector
+
+
+def synthetic_frame(rows, rng):
+    return pd.DataFrame({
+        'user_id': np.arange(rows, dtype=np.int64),
+        'yecs_score': rng.integers(300, 851, rows, dtype=np.int64),
+        'actual_approval': rng.integers(0, 2, rows, dtype=np.int8),
+        'age': rng.integers(18, 80, rows, dtype=np.int16),
+        'gender': pd.Categorical.from_codes(rng.integers(0, 3, rows), ['female', 'male', 'other']),
+        'race': pd.Categorical.from_codes(rng.integers(0, 6, rows), [f'race_{i}' for i in range(6)]),
+        'ethnicity': pd.Categorical.from_codes(rng.integers(0, 2, rows), ['hispanic', 'non_hispanic']),
+        'zip_code': rng.integers(10000, 11000, rows, dtype=np.int32),
+    })
+
+
+def legacy_group_fairness(data, attribute):
+    """The per-group loop BiasDetector used before, on a copy so the input is left alone"""
+    data = data.assign(predicted_approval=(data['yecs_score'] >= 650).astype(int))
+    group_metrics = {}
+    for group_name, group_data in data.groupby(attribute, observed=True):
+        total = len(group_data)
+        approved = group_data['predicted_approval'].sum()
+        group_metrics[group_name] = {
+            'total_applications': total,
+            'approved_applications': approved,
+            'approval_rate': approved / total if total > 0 else 0,
+            'average_score': group_data['yecs_score'].mean()
+        }
+
+    equalized_odds = {}
+    for group_name, group_data in data.groupby(attribute, observed=True):
+        tp = ((group_data['predicted_approval'] == 1) & (group_data['actual_approval'] == 1)).sum()
+        p = (group_data['actual_approval'] == 1).sum()
+        fp = ((group_data['predicted_approval'] == 1) & (group_data['actual_approval'] == 0)).sum()
+        n = (group_data['actual_approval'] == 0).sum()
+        equalized_odds[group_name] = {
+            'true_positive_rate': tp / p if p > 0 else 0,
+            'false_positive_rate': fp / n if n > 0 else 0
+        }
+    group_metrics['equalized_odds'] = equalized_odds
+    return group_metrics
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000000)
+    args = parser.parse_args()
+
+    detector = BiasDetector()
+    data = synthetic_frame(args.rows, np.random.default_rng(42))
+    attributes = [attribute for attribute in detector.protected_attributes if attribute in data.columns]
+    print(f"{args.rows} rows x {len(attributes)} attributes")
+
+    legacy, legacy_seconds = timed(lambda: {a: legacy_group_fairness(data, a) for a in attributes})
+
+    def vectorized():
+        scores, cells, has_actual = detector._approval_arrays(data)
+        return {attribute: detector._group_fairness(*detector._group_codes(data[attribute]), scores, cells, has_actual)
+                for attribute in attributes}
+
+    current, current_seconds = timed(vectorized)
+
+    for attribute in attributes:
+        for group, metrics in legacy[attribute]['equalized_odds'].items():
+            assert np.isclose(metrics['true_positive_rate'],
+                              current[attribute]['equalized_odds'][group]['true_positive_rate'])
+        for group in legacy[attribute]:
+            if group != 'equalized_odds':
+                assert np.isclose(legacy[attribute][group]['average_score'], current[attribute][group]['average_score'])
+
+    print(f"per-group loop    {legacy_seconds:7.2f}s")
+    print(f"bincount codes    {current_seconds:7.2f}s  ({legacy_seconds / current_seconds:.1f}x)")
+
+    _, agg_seconds = timed(lambda: {a: data.groupby(a, observed=True)['yecs_score'].agg(['mean', 'std', 'count'])
+                                    for a in attributes})
+    _, bias_seconds = timed(lambda: {a: detector._analyze_attribute_bias(data, a, 'yecs_score') for a in attributes})
+    print(f"group mean/std/count: groupby.agg {agg_seconds:.2f}s, bincount codes {bias_seconds:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark YECSMLModel single-row predictions against predict_batch and MicroBatcher.
+
+Run from the backend directory:
+    python -m benchmarks.bench_predict_batching --requests 2000 --clients 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from models.micro_batcher import MicroBatcher
+from models.ml_models import YECSMLModel
+
+EDUCATION_LEVELS = ['High School', 'Associate', 'Bachelor', 'Master', 'MBA', 'PhD']
+
+
+def synthetic_users(count, seed=42):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'business_plan_quality': rng.uniform(0, 1, count),
+        'revenue_projection': rng.uniform(0, 300000, count),
+        'years_of_experience': rng.randint(0, 15, count),
+        'market_analysis_score': rng.uniform(0, 1, count),
+        'monthly_income': rng.uniform(1000, 10000, count),
+        'monthly_expenses': rng.uniform(500, 8000, count),
+        'savings_amount': rng.uniform(0, 50000, count),
+        'debt_amount': rng.uniform(0, 80000, count),
+        'utility_payment_score': rng.uniform(0, 1, count),
+        'rent_payment_score': rng.uniform(0, 1, count),
+        'student_loan_payment_score': rng.uniform(0, 1, count),
+        'education_level': rng.choice(EDUCATION_LEVELS, count),
+        'industry_experience_years': rng.randint(0, 15, count),
+        'professional_certifications': rng.randint(0, 5, count),
+        'identity_verification_score': rng.uniform(0, 1, count),
+        'professional_network_score': rng.uniform(0, 1, count),
+        'online_business_presence': rng.uniform(0, 1, count),
+    })
+
+
+def report(name, count, elapsed, baseline=None):
+    throughput = count / elapsed
+    gain = f" ({throughput / baseline:.1f}x)" if baseline else ''
+    print(f"{name:<34} {throughput:10.0f} predictions/s{gain}")
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    training = synthetic_users(5000)
+    targets = 300 + 550 * training['utility_payment_score'] * training['business_plan_quality']
+    model = YECSMLModel()
+    model.train_model(training, targets)
+
+    records = synthetic_users(args.requests, seed=7).to_dict('records')
+
+    start = time.perf_counter()
+    single = [model.predict_score(record) for record in records]
+    baseline = report('predict_score, sequential', len(records), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batched = model.predict_batch(records)
+    report('predict_batch, one call', len(records), time.perf_counter() - start, baseline)
+    assert np.allclose(single, batched)
+
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        start = time.perf_counter()
+        list(pool.map(model.predict_score, records))
+        report(f'predict_score, {args.clients} threads', len(records), time.perf_counter() - start, baseline)
+
+        batcher = MicroBatcher(model.predict_batch, args.max_batch_size, args.max_wait_ms)
+        try:
+            start = time.perf_counter()
+            coalesced = list(pool.map(batcher.predict, records))
+            report(f'MicroBatcher, {args.clients} threads', len(records), time.perf_counter() - start, baseline)
+        finally:
+            batcher.close()
+        assert np.allclose(single, coalesced)
+
+
+if __name__ == '__main__':
+    main()
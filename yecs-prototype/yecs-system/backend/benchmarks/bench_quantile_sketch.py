@@ -0,0 +1,67 @@
+"""Benchmark KLL percentile-rank accuracy against exact ranks.
+
+Streams synthetic score columns shaped like yecs_score (integers over 300-850)
+and component scores (0-100 with ties) through per-worker sketches, merges
+them as the persisted sketch would be, and compares percentile ranks at probe
+values with the exact ranks from the sorted data.
+
+Run from the backend directory:
+    python -m benchmarks.bench_quantile_sketch --rows 1000000 --workers 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils.quantile_sketch import KLLSketch
+
+
+def synthetic_metrics(rows, rng):
+    yecs = np.clip(np.round(rng.normal(620, 70, rows)), 300, 850)
+    payment = np.round(np.clip(rng.beta(5, 2, rows) * 100, 0, 100), 1)
+    # Bimodal with a large tie at 60, like personal_creditworthiness
+    credit = np.where(rng.random(rows) < 0.4, 60.0, np.clip(rng.normal(75, 12, rows), 0, 100))
+    return {'yecs_score': yecs, 'payment_history': payment, 'personal_creditworthiness': credit}
+
+
+def exact_percentile_ranks(sorted_values, probes):
+    below = np.searchsorted(sorted_values, probes, side='left')
+    at_or_below = np.searchsorted(sorted_values, probes, side='right')
+    return 100.0 * (below + at_or_below) / (2 * len(sorted_values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=8, help='sketches merged into the persisted one')
+    parser.add_argument('--k', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=1000, help='values per write, like a scoring batch')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for metric, values in synthetic_metrics(args.rows, rng).items():
+        sketches = [KLLSketch(k=args.k, seed=worker) for worker in range(args.workers)]
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            sketches[(offset // args.batch) % args.workers].update_many(values[offset:offset + args.batch])
+        update_seconds = time.perf_counter() - start
+
+        merged = KLLSketch(k=args.k, seed=0)
+        for sketch in sketches:
+            merged = KLLSketch.from_json(merged.to_json()).merge(KLLSketch.from_json(sketch.to_json()))
+        view = merged.sorted_view()
+
+        probes = np.quantile(values, np.linspace(0.01, 0.99, 99))
+        exact = exact_percentile_ranks(np.sort(values), probes)
+        start = time.perf_counter()
+        estimated = np.array([view.percentile_rank(probe) for probe in probes])
+        query_us = (time.perf_counter() - start) / len(probes) * 1e6
+        errors = np.abs(estimated - exact)
+
+        print(f"{metric:<26} items={merged.num_items():5d} bytes={len(merged.to_json()):7d} "
+              f"updates={args.rows / update_seconds / 1e6:.2f}M/s query={query_us:.1f}us "
+              f"rank error: mean={errors.mean():.3f} max={errors.max():.3f} percentile points")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark the scoring input lookup used by /api/users/<id>/calculate-score.
+
+Compares the old three-query lookup against load_scoring_inputs on a seeded
+SQLite database, reporting queries per request and latency percentiles.
+
+Run from the backend directory:
+    python -m benchmarks.bench_score_lookup --users 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import event, insert
+
+from database.database import (db, User, BusinessProfile, FinancialData,
+                               create_missing_indexes, load_scoring_inputs)
+
+
+def create_benchmark_app(db_path, with_indexes=True):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        if with_indexes:
+            create_missing_indexes()
+        else:
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(bind=db.engine, checkfirst=True)
+
+    return app
+
+
+def seed(num_users, chunk_size=50000):
+    for start in range(1, num_users + 1, chunk_size):
+        ids = range(start, min(start + chunk_size, num_users + 1))
+        db.session.execute(insert(User), [
+            {'id': i, 'email': f'user{i}@example.com', 'first_name': 'Bench', 'last_name': 'User', 'age': 18 + i % 50}
+            for i in ids
+        ])
+        db.session.execute(insert(BusinessProfile), [
+            {'user_id': i, 'business_name': 'Bench', 'industry': 'tech', 'business_plan_quality': 0.7,
+             'revenue_projection': 80000, 'years_of_experience': i % 10, 'education_level': 'Bachelor'}
+            for i in ids
+        ])
+        db.session.execute(insert(FinancialData), [
+            {'user_id': i, 'monthly_income': 4000, 'monthly_expenses': 2500, 'savings_amount': 6000,
+             'debt_amount': 10000, 'utility_payment_score': 0.9, 'rent_payment_score': 0.85}
+            for i in ids
+        ])
+        db.session.commit()
+
+
+def legacy_lookup(user_id):
+    user = db.session.get(User, user_id)
+    business_profile = BusinessProfile.query.filter_by(user_id=user_id).first()
+    financial_data = FinancialData.query.filter_by(user_id=user_id).first()
+    return user, business_profile, financial_data
+
+
+def measure(name, lookup, user_ids):
+    query_count = [0]
+
+    def count_query(*args):
+        query_count[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    latencies = []
+    try:
+        for user_id in user_ids:
+            start = time.perf_counter()
+            lookup(user_id)
+            latencies.append(time.perf_counter() - start)
+            # Each API request gets a fresh session, so don't let the identity map help
+            db.session.expire_all()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"{name:<28} queries/request={query_count[0] / len(user_ids):.1f} "
+          f"p50={np.percentile(latencies_ms, 50):.3f}ms p99={np.percentile(latencies_ms, 99):.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    user_ids = [rng.randint(1, args.users) for _ in range(args.requests)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.db')
+
+        app = create_benchmark_app(db_path, with_indexes=False)
+        with app.app_context():
+            start = time.perf_counter()
+            seed(args.users)
+            print(f"Seeded {args.users} users in {time.perf_counter() - start:.1f}s")
+            measure('three queries, no indexes', legacy_lookup, user_ids[:max(1, args.requests // 20)])
+
+        app = create_benchmark_app(db_path, with_indexes=True)
+        with app.app_context():
+            measure('three queries, indexed', legacy_lookup, user_ids)
+            measure('load_scoring_inputs', load_scoring_inputs, user_ids)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Load-test the Flask dev server against the gunicorn production config.
+
+Starts each server in turn, fires --requests GET requests from --clients
+concurrent keep-alive sessions and reports throughput and latency.
+
+Run from the backend directory:
+    python -m benchmarks.bench_server_throughput --requests 5000 --clients 32
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEV_SERVER = [sys.executable, '-c', 'from app import app; app.run(host="127.0.0.1", port={port})']
+GUNICORN = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}', 'app:app']
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def load_test(url, total_requests, clients):
+    latencies = []
+    lock = threading.Lock()
+    per_client = total_requests // clients
+
+    def client():
+        session = requests.Session()
+        local = []
+        for _ in range(per_client):
+            start = time.perf_counter()
+            session.get(url).raise_for_status()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+
+def run_server(name, command, port, path, args, env):
+    process = subprocess.Popen([part.format(port=port) for part in command], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        wait_until_up(base_url + '/')
+        throughput, p50, p99 = load_test(base_url + path, args.requests, args.clients)
+        print(f"{name:<12} {throughput:8.0f} req/s  p50={p50:.1f}ms  p99={p99:.1f}ms")
+        return throughput
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--path', default='/api/users/1/scores')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ, YECS_ACCESS_LOG='')
+    if args.workers:
+        env['YECS_WORKERS'] = str(args.workers)
+
+    dev = run_server('dev server', DEV_SERVER, 5901, args.path, args, env)
+    prod = run_server('gunicorn', GUNICORN, 5902, args.path, args, env)
+    print(f"gunicorn / dev server: {prod / dev:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, insert, update, and_
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List
 from datetime import datetime
 import json
 
@@ -20,7 +23,7 @@ class User(db.Model):
 
 class BusinessProfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     business_name = db.Column(db.String(200), nullable=False)
     industry = db.Column(db.String(100), nullable=False)
     business_plan_quality = db.Column(db.Float, default=0.0)
@@ -32,7 +35,7 @@ class BusinessProfile(db.Model):
 
 class FinancialData(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     monthly_income = db.Column(db.Float, default=0.0)
     monthly_expenses = db.Column(db.Float, default=0.0)
     savings_amount = db.Column(db.Float, default=0.0)
@@ -43,6 +46,11 @@ class FinancialData(db.Model):
 
 
 class CreditScore(db.Model):
+    # Serves the per-user score history, which filters on user_id and orders by created_at
+    __table_args__ = (
+        db.Index('ix_credit_score_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     yecs_score = db.Column(db.Integer, nullable=False)
@@ -54,3 +62,143 @@ class CreditScore(db.Model):
     social_verification_score = db.Column(db.Float, default=0.0)
     risk_level = db.Column(db.String(20), default='MEDIUM')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class BiasGroupStatistic(db.Model):
+    """Running count/sum/sum-of-squares of yecs_score for one demographic group"""
+    __table_args__ = (
+        db.UniqueConstraint('attribute', 'group_value', name='uq_bias_group_statistic_group'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    attribute = db.Column(db.String(50), nullable=False)
+    group_value = db.Column(db.String(100), nullable=False)
+    count = db.Column(db.BigInteger, default=0, nullable=False)
+    score_sum = db.Column(db.BigInteger, default=0, nullable=False)
+    score_sum_sq = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ScoreHistogramBin(db.Model):
+    """Running count of scores in one histogram bucket of a score metric"""
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'bucket', name='uq_score_histogram_bin_bucket'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(50), nullable=False)
+    bucket = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ScoreSketch(db.Model):
+    """Serialized quantile sketch of one score metric; version guards concurrent merges"""
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(50), unique=True, nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    count = db.Column(db.BigInteger, default=0, nullable=False)
+    version = db.Column(db.Integer, default=1, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Job(db.Model):
+    """A background job: its parameters, progress and outcome; claimed by a job worker"""
+    __table_args__ = (
+        db.Index('ix_job_status_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), default='queued', nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')
+    progress = db.Column(db.Float, default=0.0, nullable=False)
+    message = db.Column(db.String(200))
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+    worker_id = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+
+
+def create_missing_indexes():
+    """Create indexes declared on the models that an older database does not have yet"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+
+def upsert_add(model, rows: List[Dict], key_columns: List[str], added_columns: List[str], max_attempts: int = 5):
+    """Insert rows, or add their added_columns onto the existing row with the same key_columns.
+
+    The row's other columns overwrite the stored ones. PostgreSQL and SQLite do this
+    with one INSERT ... ON CONFLICT DO UPDATE executemany; other databases update
+    row by row and insert the rows that matched nothing. Runs in the caller's transaction.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        _upsert_add_portable(model, rows, key_columns, added_columns, max_attempts)
+        return
+
+    table = model.__table__
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            column: table.c[column] + statement.excluded[column] if column in added_columns
+            else statement.excluded[column]
+            for column in rows[0] if column not in key_columns
+        }
+    )
+    db.session.execute(statement, rows)
+
+
+def _upsert_add_portable(model, rows: List[Dict], key_columns: List[str], added_columns: List[str],
+                         max_attempts: int = 5):
+    """upsert_add with plain UPDATE and INSERT statements, for databases without ON CONFLICT"""
+    table = model.__table__
+    for row in rows:
+        matches_key = and_(*(table.c[column] == row[column] for column in key_columns))
+        values = {
+            column: table.c[column] + row[column] if column in added_columns else row[column]
+            for column in row if column not in key_columns
+        }
+        for _ in range(max_attempts):
+            if db.session.execute(update(table).where(matches_key).values(values)).rowcount:
+                break
+            try:
+                # A savepoint, so a duplicate key only undoes this INSERT
+                with db.session.begin_nested():
+                    db.session.execute(insert(table).values(row))
+                break
+            except IntegrityError:
+                # Another writer inserted the key after our UPDATE; add onto their row
+                continue
+        else:
+            raise RuntimeError(f"Could not upsert into {table.name} after {max_attempts} attempts")
+
+
+def load_scoring_inputs(user_id):
+    """Load a user with their first business profile and financial data in a single query.
+
+    Returns (user, business_profile, financial_data); missing rows come back as None.
+    """
+    query = (
+        select(User, BusinessProfile, FinancialData)
+        .outerjoin(BusinessProfile, BusinessProfile.user_id == User.id)
+        .outerjoin(FinancialData, FinancialData.user_id == User.id)
+        .where(User.id == user_id)
+        .order_by(BusinessProfile.id, FinancialData.id)
+        .limit(1)
+    )
+    row = db.session.execute(query).first()
+    if row is None:
+        return None, None, None
+    return row[0], row[1], row[2]
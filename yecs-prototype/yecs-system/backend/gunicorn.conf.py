@@ -0,0 +1,56 @@
+# Production server configuration: gunicorn -c gunicorn.conf.py app:app
+#
+# The app (scoring algorithm, lazily loaded model artifact, database tables) is
+# imported once in the master and warmed up before workers are forked, so workers
+# start instantly and share the memory-mapped model pages.
+#
+# Graceful reload: `kill -HUP <master pid>` replaces the workers, letting in-flight
+# requests finish within graceful_timeout. Because the app is preloaded, new code is
+# only picked up by a binary upgrade: `kill -USR2 <master pid>`, then `kill -QUIT`
+# the old master once the new one is serving.
+import multiprocessing
+import os
+
+bind = os.environ.get('YECS_BIND', '0.0.0.0:5000')
+
+# Threaded workers so streaming and LLM-bound requests don't pin a whole process
+worker_class = 'gthread'
+workers = int(os.environ.get('YECS_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('YECS_THREADS', 4))
+
+preload_app = True
+timeout = int(os.environ.get('YECS_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('YECS_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth; jitter avoids simultaneous restarts
+max_requests = int(os.environ.get('YECS_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('YECS_MAX_REQUESTS_JITTER', 1000))
+
+# Set YECS_ACCESS_LOG to an empty string to disable access logging
+accesslog = os.environ.get('YECS_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('YECS_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """Warm up models in the master so forked workers inherit them"""
+    from app import warm_up
+    warm_up()
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master; each worker opens its own"""
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """Flush percentile sketch updates not yet persisted by this worker"""
+    from app import app, percentile_sketches
+    with app.app_context():
+        try:
+            percentile_sketches.persist()
+        except Exception as e:
+            server.log.error(f"Error persisting percentile sketches: {str(e)}")
@@ -0,0 +1,50 @@
+"""Run background job workers for the YECS API.
+
+Each worker process claims queued jobs (bias audits, dataset processing, model
+training) from the jobs table and runs them one at a time, so the API workers
+only submit and poll. Start it next to gunicorn, against the same database:
+
+    python job_worker.py --processes 2
+
+SIGTERM or Ctrl-C stops claiming new jobs; jobs already running are finished first.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+
+
+def run_worker():
+    from app import app, job_queue
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.set())
+    job_queue.work(app, should_stop=stopping.is_set)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=int(os.environ.get('YECS_JOB_WORKERS', 1)))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=run_worker) for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+
+    def stop_workers(signum, frame):
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    # Ctrl-C reaches the workers directly; SIGTERM is passed on to them
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stop_workers)
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+from typing import Dict, List, Tuple
+
+# Display name and improvement advice per component score
+COMPONENTS = {
+    'business_viability': (
+        'Business Viability',
+        'Strengthen the business plan with a market analysis and revenue projections close to the industry average.'
+    ),
+    'payment_history': (
+        'Payment History',
+        'Pay utilities, rent, student loans and subscriptions on time every month and file taxes consistently.'
+    ),
+    'financial_management': (
+        'Financial Management',
+        'Keep debt below 30% of annual income, build savings and keep monthly expenses under income.'
+    ),
+    'personal_creditworthiness': (
+        'Personal Credit',
+        'Keep credit utilization under 10% and avoid new credit inquiries.'
+    ),
+    'education_background': (
+        'Education',
+        'Add professional certifications and entrepreneurship courses relevant to the industry.'
+    ),
+    'social_verification': (
+        'Social Verification',
+        'Complete identity verification and build an online business presence and professional network.'
+    )
+}
+
+RISK_DESCRIPTIONS = {
+    'LOW': 'low credit risk',
+    'MEDIUM': 'moderate credit risk',
+    'HIGH': 'elevated credit risk',
+    'VERY_HIGH': 'very high credit risk'
+}
+
+
+class TemplateExplainer:
+    """Deterministic score explanation built from the component scores and weights.
+
+    Components are ranked by weighted point deficit: how many YECS points (on the
+    300-850 scale) each one is below its maximum. The smallest deficits are the
+    strengths, the largest the areas to improve. Text fragments are fixed, so an
+    explanation costs a sort of six numbers and some string joins.
+    """
+
+    def __init__(self, weights: Dict[str, float], score_range: Tuple[int, int] = (300, 850)):
+        self.weights = dict(weights)
+        self.points_per_unit = (score_range[1] - score_range[0]) / 100
+
+    def rank_components(self, component_scores: Dict) -> List[Tuple[str, float, float]]:
+        """(component, score, deficit in YECS points), largest deficit first"""
+        ranked = [
+            (name, component_scores.get(name, 0), (100 - component_scores.get(name, 0)) * weight * self.points_per_unit)
+            for name, weight in self.weights.items()
+        ]
+        return sorted(ranked, key=lambda item: item[2], reverse=True)
+
+    def explain(self, yecs_score: int, component_scores: Dict) -> str:
+        """Explanation with top 3 strengths, top 3 improvement areas and recommendations"""
+        ranked = self.rank_components(component_scores)
+        weaknesses = ranked[:3]
+        strengths = ranked[::-1][:3]
+        risk = RISK_DESCRIPTIONS.get(component_scores.get('risk_level'), 'unrated credit risk')
+
+        lines = [
+            f"Your YECS score is {yecs_score}/850, which indicates {risk}.",
+            "",
+            "Strengths:"
+        ]
+        lines += [f"- {COMPONENTS[name][0]}: {score:.1f}%" for name, score, _ in strengths]
+        lines += ["", "Areas for improvement:"]
+        lines += [f"- {COMPONENTS[name][0]}: {score:.1f}% ({deficit:.0f} points below maximum)"
+                  for name, score, deficit in weaknesses]
+        lines += ["", "Recommendations:"]
+        lines += [f"- {COMPONENTS[name][1]}" for name, _, _ in weaknesses]
+
+        return "\n".join(lines)
@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+import logging
+import queue
+import threading
+import time
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into batched calls.
+
+    Requests submitted from any thread are queued; a background thread collects up
+    to max_batch_size of them, waiting at most max_wait_ms after the first one
+    arrives, and hands them to batch_fn in one call. batch_fn takes a list of items
+    and returns one result per item, e.g. YECSMLModel.predict_batch.
+    """
+
+    _STOP = object()
+
+    def __init__(self, batch_fn: Callable[[List], Sequence], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        # Makes the closed check and the put atomic, so nothing is queued behind _STOP
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue one item and return a Future for its result; cancelling the Future drops the item"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((item, future))
+        return future
+
+    def predict(self, item, timeout: float = None):
+        """Submit one item and block until its result is ready"""
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        """Stop the worker thread after the already queued items are processed"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is self._STOP:
+                return
+
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is self._STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                # Never let one batch take the worker down; later requests would wait forever
+                logging.error(f"Micro-batch worker error: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stop:
+                return
+
+    def _process(self, batch):
+        # Drop requests cancelled while queued; the rest can no longer be cancelled
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise ValueError(f"batch_fn returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logging.error(f"Micro-batch of {len(items)} failed: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
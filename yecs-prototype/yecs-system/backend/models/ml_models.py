@@ -4,70 +4,53 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from models.features import (prepare_features, encode_education_level, encode_education_levels, RECORD_FEATURES,
+                             STORE_FEATURES)
+from models.tree_ensemble import FlatTreeEnsemble
+from models.model_artifact import save_artifact
 import joblib
 import logging
+import os
+import tempfile
+
+
+def build_gradient_boosting(backend: str = 'sklearn', params: Dict = None):
+    """Gradient boosting regressor for the ensemble; 'xgboost' uses its histogram-based trees"""
+    if backend == 'sklearn':
+        return GradientBoostingRegressor(**{'n_estimators': 100, 'random_state': 42, **(params or {})})
+    elif backend == 'xgboost':
+        from xgboost import XGBRegressor
+        return XGBRegressor(**{'n_estimators': 100, 'random_state': 42, 'tree_method': 'hist', 'n_jobs': -1,
+                               **(params or {})})
+    else:
+        raise ValueError(f"Unknown gradient boosting backend: {backend}")
 
 
 class YECSMLModel:
-    def __init__(self):
-        self.rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.gb_model = GradientBoostingRegressor(n_estimators=100, random_state=42)
+    def __init__(self, rf_params: Dict = None, gb_params: Dict = None, backend: str = 'sklearn'):
+        # The random forest builds its trees on all cores
+        self.rf_model = RandomForestRegressor(**{'n_estimators': 100, 'random_state': 42, 'n_jobs': -1,
+                                                 **(rf_params or {})})
+        self.gb_model = build_gradient_boosting(backend, gb_params)
+        self.backend = backend
         self.scaler = StandardScaler()
         self.is_trained = False
+        # Which features the fitted models expect; see models.features
+        self.feature_layout = RECORD_FEATURES
 
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Prepare features for machine learning"""
-        features = pd.DataFrame()
-
-        # Business features
-        features['business_plan_quality'] = data.get('business_plan_quality', 0)
-        features['revenue_projection'] = data.get('revenue_projection', 0)
-        features['years_of_experience'] = data.get('years_of_experience', 0)
-        features['market_analysis_score'] = data.get('market_analysis_score', 0)
-
-        # Financial features
-        features['monthly_income'] = data.get('monthly_income', 0)
-        features['monthly_expenses'] = data.get('monthly_expenses', 0)
-        features['savings_amount'] = data.get('savings_amount', 0)
-        features['debt_amount'] = data.get('debt_amount', 0)
-
-        # Payment history features
-        features['utility_payment_score'] = data.get('utility_payment_score', 0)
-        features['rent_payment_score'] = data.get('rent_payment_score', 0)
-        features['student_loan_payment_score'] = data.get('student_loan_payment_score', 0)
-
-        # Education features
-        features['education_level_numeric'] = self.encode_education_level(data.get('education_level', ''))
-        features['industry_experience_years'] = data.get('industry_experience_years', 0)
-        features['professional_certifications'] = data.get('professional_certifications', 0)
-
-        # Social features
-        features['identity_verification_score'] = data.get('identity_verification_score', 0)
-        features['professional_network_score'] = data.get('professional_network_score', 0)
-        features['online_business_presence'] = data.get('online_business_presence', 0)
-
-        # Calculate derived features
-        features['debt_to_income_ratio'] = features['debt_amount'] / (features['monthly_income'] * 12 + 1)
-        features['savings_rate'] = features['savings_amount'] / (features['monthly_income'] * 12 + 1)
-        features['expense_ratio'] = features['monthly_expenses'] / (features['monthly_income'] + 1)
-
-        return features
+        return prepare_features(data)
 
     def encode_education_level(self, education_level: str) -> int:
         """Encode education level to numeric value"""
-        education_level = education_level.lower()
-        if 'phd' in education_level or 'doctorate' in education_level:
-            return 6
-        elif 'master' in education_level or 'mba' in education_level:
-            return 5
-        elif 'bachelor' in education_level:
-            return 4
-        elif 'associate' in education_level:
-            return 3
-        elif 'high school' in education_level:
-            return 2
-        else:
-            return 1
+        return encode_education_level(education_level)
+
+    def encode_education_levels(self, education_levels: pd.Series) -> np.ndarray:
+        """Vectorized encode_education_level for a column of education levels"""
+        return encode_education_levels(education_levels)
 
     def train_model(self, training_data: pd.DataFrame, target_scores: pd.Series):
         """Train the ML model with provided data"""
@@ -85,58 +68,182 @@ class YECSMLModel:
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
 
-            # Train models
-            self.rf_model.fit(X_train_scaled, y_train)
-            self.gb_model.fit(X_train_scaled, y_train)
-
-            # Evaluate models
-            rf_pred = self.rf_model.predict(X_test_scaled)
-            gb_pred = self.gb_model.predict(X_test_scaled)
+            self.feature_layout = RECORD_FEATURES
+            return self._fit_and_evaluate(X_train_scaled, X_test_scaled, y_train, y_test)
 
-            rf_r2 = r2_score(y_test, rf_pred)
-            gb_r2 = r2_score(y_test, gb_pred)
-
-            logging.info(f"Random Forest R²: {rf_r2:.4f}")
-            logging.info(f"Gradient Boosting R²: {gb_r2:.4f}")
-
-            self.is_trained = True
+        except Exception as e:
+            logging.error(f"Model training failed: {str(e)}")
+            raise
 
-            return {
-                'rf_r2': rf_r2,
-                'gb_r2': gb_r2,
-                'rf_mse': mean_squared_error(y_test, rf_pred),
-                'gb_mse': mean_squared_error(y_test, gb_pred)
-            }
+    def train_model_from_store(self, store, test_size: float = 0.2, batch_size: int = 100000,
+                               cache_dir: str = None):
+        """Train the ML model from a TrainingDataStore without loading it into RAM.
+
+        The scaler is fitted with partial_fit over batches, then the scaled rows are
+        written as float32 (the dtype the tree models train on) to temporary
+        memory-mapped files in cache_dir, which the models read directly. The model
+        then expects the store's feature layout (STORE_FEATURES) instead of
+        prepare_features: predict with predict_features, not predict_batch, and it
+        cannot be exported as a serving artifact.
+        """
+        try:
+            num_rows = store.num_rows
+            rng = np.random.RandomState(42)
+            is_test = np.zeros(num_rows, dtype=bool)
+            is_test[rng.permutation(num_rows)[:int(np.ceil(num_rows * test_size))]] = True
+            num_test = int(is_test.sum())
+
+            # Fit the scaler on the training rows one batch at a time
+            self.scaler = StandardScaler()
+            offset = 0
+            for X_batch, _ in store.iter_batches(batch_size):
+                train_mask = ~is_test[offset:offset + len(X_batch)]
+                if train_mask.any():
+                    self.scaler.partial_fit(X_batch[train_mask])
+                offset += len(X_batch)
+
+            with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+                X_train = np.lib.format.open_memmap(os.path.join(tmp_dir, 'X_train.npy'), mode='w+',
+                                                    dtype=np.float32, shape=(num_rows - num_test, store.num_features))
+                X_test = np.lib.format.open_memmap(os.path.join(tmp_dir, 'X_test.npy'), mode='w+',
+                                                   dtype=np.float32, shape=(num_test, store.num_features))
+                y_train = np.empty(num_rows - num_test)
+                y_test = np.empty(num_test)
+
+                # Write scaled batches into the train/test arrays
+                offset = train_offset = test_offset = 0
+                for X_batch, y_batch in store.iter_batches(batch_size):
+                    test_mask = is_test[offset:offset + len(X_batch)]
+                    X_scaled = self.scaler.transform(X_batch)
+
+                    train_end = train_offset + int((~test_mask).sum())
+                    X_train[train_offset:train_end] = X_scaled[~test_mask]
+                    y_train[train_offset:train_end] = y_batch[~test_mask]
+                    train_offset = train_end
+
+                    test_end = test_offset + int(test_mask.sum())
+                    X_test[test_offset:test_end] = X_scaled[test_mask]
+                    y_test[test_offset:test_end] = y_batch[test_mask]
+                    test_offset = test_end
+
+                    offset += len(X_batch)
+
+                X_train.flush()
+                X_test.flush()
+                self.feature_layout = STORE_FEATURES
+                metrics = self._fit_and_evaluate(X_train, X_test, y_train, y_test)
+                del X_train, X_test
+
+            return metrics
 
         except Exception as e:
-            logging.error(f"Model training failed: {str(e)}")
+            logging.error(f"Model training from store failed: {str(e)}")
             raise
 
+    def fit_models(self, X_train_scaled, y_train):
+        """Fit the random forest and gradient boosting models concurrently"""
+        # Tree building releases the GIL, so the two fits overlap in threads
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rf_future = executor.submit(self.rf_model.fit, X_train_scaled, y_train)
+            gb_future = executor.submit(self.gb_model.fit, X_train_scaled, y_train)
+            rf_future.result()
+            gb_future.result()
+
+        self.is_trained = True
+
+    def _fit_and_evaluate(self, X_train_scaled, X_test_scaled, y_train, y_test):
+        """Fit both models on scaled features and evaluate them on the held-out rows"""
+        # Train models
+        self.fit_models(X_train_scaled, y_train)
+
+        return self.evaluate(X_test_scaled, y_test)
+
+    def evaluate(self, X_test_scaled, y_test) -> Dict:
+        """R² and MSE of both models on scaled held-out features"""
+        # Evaluate models
+        rf_pred = self.rf_model.predict(X_test_scaled)
+        gb_pred = self.gb_model.predict(X_test_scaled)
+
+        rf_r2 = r2_score(y_test, rf_pred)
+        gb_r2 = r2_score(y_test, gb_pred)
+
+        logging.info(f"Random Forest R²: {rf_r2:.4f}")
+        logging.info(f"Gradient Boosting R²: {gb_r2:.4f}")
+
+        return {
+            'rf_r2': rf_r2,
+            'gb_r2': gb_r2,
+            'rf_mse': mean_squared_error(y_test, rf_pred),
+            'gb_mse': mean_squared_error(y_test, gb_pred)
+        }
+
     def predict_score(self, user_data: dict) -> float:
         """Predict YECS score using trained ML model"""
+        return float(self.predict_batch([user_data])[0])
+
+    def predict_batch(self, records: List[dict]) -> np.ndarray:
+        """Predict YECS scores for many users with one call per model"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
+        self.require_feature_layout(RECORD_FEATURES)
 
         try:
             # Prepare features
-            features_df = pd.DataFrame([user_data])
+            features_df = pd.DataFrame(records)
             X = self.prepare_features(features_df)
-            X_scaled = self.scaler.transform(X)
+            return self._predict_scaled(self.scaler.transform(X))
+
+        except Exception as e:
+            logging.error(f"Prediction failed: {str(e)}")
+            raise
 
-            # Make predictions with both models
-            rf_pred = self.rf_model.predict(X_scaled)[0]
-            gb_pred = self.gb_model.predict(X_scaled)[0]
+    def predict_features(self, X) -> np.ndarray:
+        """Predict YECS scores for rows already in the model's feature layout, e.g. a TrainingDataStore batch"""
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
 
-            # Ensemble prediction (weighted average)
-            ensemble_pred = 0.6 * rf_pred + 0.4 * gb_pred
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.scaler.n_features_in_:
+            raise ValueError(f"Expected rows of {self.scaler.n_features_in_} features ({self.feature_layout}), "
+                             f"got shape {X.shape}")
 
-            # Ensure prediction is within valid range
-            return max(300, min(850, ensemble_pred))
+        try:
+            return self._predict_scaled(self.scaler.transform(X))
 
         except Exception as e:
             logging.error(f"Prediction failed: {str(e)}")
             raise
 
+    def require_feature_layout(self, layout: str):
+        """Raise ValueError unless the model was trained on this feature layout"""
+        if self.feature_layout != layout:
+            raise ValueError(f"Model was trained on the {self.feature_layout} feature layout, not {layout}")
+
+    def _predict_scaled(self, X_scaled) -> np.ndarray:
+        """Blended, clipped prediction of both models for scaled features"""
+        # Make predictions with both models
+        rf_pred = self.rf_model.predict(X_scaled)
+        gb_pred = self.gb_model.predict(X_scaled)
+
+        # Ensemble prediction (weighted average)
+        ensemble_pred = 0.6 * rf_pred + 0.4 * gb_pred
+
+        # Ensure prediction is within valid range
+        return np.clip(ensemble_pred, 300, 850)
+
+    def export_flat_ensemble(self) -> FlatTreeEnsemble:
+        """Flatten the trained scaler and RF+GB blend for sklearn-free serving"""
+        # Served ensembles prepare features from user records
+        self.require_feature_layout(RECORD_FEATURES)
+        return FlatTreeEnsemble.from_model(self)
+
+    def save_artifact(self, directory: str) -> str:
+        """Save the trained model as a versioned, memory-mappable serving artifact"""
+        if not self.is_trained:
+            raise ValueError("Cannot save untrained model")
+
+        return save_artifact(self, directory)
+
     def save_model(self, filepath: str):
         """Save trained model to file"""
         if not self.is_trained:
@@ -146,7 +253,8 @@ class YECSMLModel:
             'rf_model': self.rf_model,
             'gb_model': self.gb_model,
             'scaler': self.scaler,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'feature_layout': self.feature_layout
         }
 
         joblib.dump(model_data, filepath)
@@ -159,3 +267,5 @@ class YECSMLModel:
         self.gb_model = model_data['gb_model']
         self.scaler = model_data['scaler']
         self.is_trained = model_data['is_trained']
+        # Files saved before layouts were recorded hold prepare_features models
+        self.feature_layout = model_data.get('feature_layout', RECORD_FEATURES)
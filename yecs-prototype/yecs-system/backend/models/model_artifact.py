@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, List
+import numpy as np
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+from models.tree_ensemble import FlatTreeEnsemble
+
+ARTIFACT_FORMAT = 'yecs-flat-ensemble'
+ARTIFACT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+
+def save_artifact(model, directory: str, keep_versions: int = 3) -> str:
+    """Write a trained YECSMLModel as a versioned, memory-mappable artifact directory.
+
+    The artifact holds one .npy file per FlatTreeEnsemble array plus a manifest with
+    the format version and scalar fields. Each save writes a new version directory
+    under <directory>.versions and then points the `directory` symlink at it with an
+    atomic os.replace, so readers see either the previous artifact or the new one,
+    never a partial one. The newest keep_versions versions are kept, so readers that
+    resolved an older link can still open it. Returns the new version directory.
+    """
+    ensemble = model.export_flat_ensemble()
+    arrays = ensemble.to_arrays()
+
+    directory = directory.rstrip(os.sep)
+    versions_dir = f"{directory}.versions"
+    os.makedirs(versions_dir, exist_ok=True)
+    version_dir = os.path.join(versions_dir, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}")
+    os.makedirs(version_dir)
+
+    for name in FlatTreeEnsemble.ARRAY_NAMES:
+        np.save(os.path.join(version_dir, f'{name}.npy'), np.ascontiguousarray(arrays[name]))
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'created_at': datetime.utcnow().isoformat(),
+        'arrays': list(FlatTreeEnsemble.ARRAY_NAMES),
+        'bias': ensemble.bias,
+        'max_depth': ensemble.max_depth,
+        'num_features': int(len(ensemble.scaler_mean)),
+        'num_trees': int(len(ensemble.roots))
+    }
+    with open(os.path.join(version_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    # An artifact written before versioning is a plain directory: move it in as the oldest
+    # version (it is briefly missing, once) so the link can replace it
+    if os.path.isdir(directory) and not os.path.islink(directory):
+        os.rename(directory, os.path.join(versions_dir, '00000000T000000000000-unversioned'))
+
+    # Relative, so the artifact tree can be moved or mounted elsewhere as a whole
+    link = f"{directory}.link-{uuid.uuid4().hex[:8]}"
+    os.symlink(os.path.relpath(version_dir, os.path.dirname(os.path.abspath(directory))), link)
+    os.replace(link, directory)
+
+    _remove_old_versions(versions_dir, keep_versions)
+    return version_dir
+
+
+def _remove_old_versions(versions_dir: str, keep_versions: int):
+    """Delete all but the newest keep_versions version directories"""
+    # Version names start with their UTC timestamp, so they sort oldest first
+    versions = sorted(os.listdir(versions_dir))
+    for name in versions[:max(len(versions) - keep_versions, 0)]:
+        shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+
+
+def load_artifact(directory: str, mmap: bool = True) -> FlatTreeEnsemble:
+    """Load an artifact written by save_artifact.
+
+    With mmap=True the arrays are opened read-only with np.load(mmap_mode='r'), so
+    every process serving the same artifact shares its pages through the OS page cache.
+    The artifact symlink is resolved once per attempt, so a concurrent save can't mix
+    versions; if the resolved version is removed mid-load, the load starts over on the
+    current one.
+    """
+    while True:
+        version_dir = os.path.realpath(directory)
+        try:
+            return _load_version(version_dir, mmap)
+        except FileNotFoundError:
+            if os.path.realpath(directory) == version_dir:
+                raise
+
+
+def _load_version(directory: str, mmap: bool) -> FlatTreeEnsemble:
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{directory} is not a {ARTIFACT_FORMAT} artifact")
+    if manifest.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version {manifest.get('version')} "
+                         f"(expected {ARTIFACT_VERSION})")
+
+    mmap_mode = 'r' if mmap else None
+    arrays = {
+        name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+        for name in manifest['arrays']
+    }
+    arrays['bias'] = manifest['bias']
+    arrays['max_depth'] = manifest['max_depth']
+
+    return FlatTreeEnsemble.from_arrays(arrays)
+
+
+class LazyModel:
+    """Model artifact that is only loaded on first use.
+
+    Keeps imports and worker start-up cheap; call warm_up() from a server hook to
+    pay the load cost before the first request instead.
+    """
+
+    def __init__(self, artifact_dir: str, mmap: bool = True):
+        self.artifact_dir = artifact_dir
+        self.mmap = mmap
+        self._ensemble = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._ensemble is not None
+
+    def get(self) -> FlatTreeEnsemble:
+        """Return the loaded ensemble, loading it on the first call"""
+        if self._ensemble is None:
+            with self._lock:
+                if self._ensemble is None:
+                    self._ensemble = load_artifact(self.artifact_dir, mmap=self.mmap)
+                    logging.info(f"Loaded model artifact from {os.path.realpath(self.artifact_dir)}")
+        return self._ensemble
+
+    def predict_batch(self, records: List[Dict]) -> np.ndarray:
+        return self.get().predict_batch(records)
+
+    def predict_score(self, user_data: Dict) -> float:
+        return float(self.predict_batch([user_data])[0])
+
+    def warm_up(self) -> bool:
+        """Load the artifact, fault its pages in and run one prediction.
+
+        Returns False (and logs) when no artifact is available yet.
+        """
+        try:
+            ensemble = self.get()
+        except FileNotFoundError:
+            logging.warning(f"No model artifact found at {self.artifact_dir}, skipping warm-up")
+            return False
+
+        for name in FlatTreeEnsemble.ARRAY_NAMES:
+            np.add.reduce(getattr(ensemble, name), axis=None)
+        ensemble.predict_features(np.zeros((1, len(ensemble.scaler_mean))))
+
+        return True
@@ -0,0 +1,414 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+import httpx
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CircuitBreaker:
+    """Stop calling a failing service for a while.
+
+    After failure_threshold consecutive failures the circuit opens and requests are
+    refused for reset_timeout seconds. Then a single probe is let through: success
+    closes the circuit, failure keeps it open for another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: this caller probes, everyone else waits another period
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class EmptyResponse(Exception):
+    """Ollama answered without any generated content"""
+
+
+class AsyncOllamaIntegration:
+    """Non-blocking Ollama client.
+
+    Uses one pooled keep-alive httpx.AsyncClient, caps concurrent generations with a
+    semaphore, shares a single upstream call between identical in-flight prompts and
+    keeps successful responses in a TTL cache keyed by model and prompt. Calls go
+    through a CircuitBreaker. OllamaIntegration wraps it for synchronous callers.
+    """
+
+    def __init__(self, base_url="http://localhost:11434", model_name="llama3.2", max_concurrency: int = 4,
+                 max_connections: int = 10, timeout: float = 30, cache_ttl: float = 3600,
+                 cache_size: int = 1024):
+        self.base_url = base_url
+        self.model_name = model_name
+        self.api_url = f"{base_url}/api/chat"
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cache = TTLCache(ttl=cache_ttl, max_entries=cache_size)
+        self.circuit_breaker = CircuitBreaker()
+        self.health_ttl = 10.0
+        self._health = None
+        self._client = None
+        self._semaphore = None
+        self._in_flight = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the client and semaphore bind to the loop that uses them
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    @staticmethod
+    def build_explanation_prompt(user_data: Dict, yecs_score: int, component_scores: Dict) -> str:
+        """Prompt asking the LLM to explain a YECS score"""
+        return f"""
+        You are a financial advisor AI specialized in credit scoring for young entrepreneurs. 
+
+        User Profile:
+        - Business Type: {user_data.get('business', {}).get('industry', 'Unknown')}
+        - Monthly Income: ${user_data.get('financial', {}).get('monthly_income', 0):,.2f}
+        - Education: {user_data.get('education', {}).get('education_level', 'Unknown')}
+        - Experience: {user_data.get('business', {}).get('years_of_experience', 0)} years
+
+        YECS Score: {yecs_score}/850
+
+        Component Scores:
+        - Business Viability: {component_scores.get('business_viability', 0):.1f}%
+        - Payment History: {component_scores.get('payment_history', 0):.1f}%
+        - Financial Management: {component_scores.get('financial_management', 0):.1f}%
+        - Personal Credit: {component_scores.get('personal_creditworthiness', 0):.1f}%
+        - Education: {component_scores.get('education_background', 0):.1f}%
+        - Social Verification: {component_scores.get('social_verification', 0):.1f}%
+
+        Please provide:
+        1. A brief explanation of the YECS score
+        2. Top 3 strengths
+        3. Top 3 areas for improvement
+        4. Specific actionable recommendations
+
+        Keep the response under 300 words and professional.
+        """
+
+    @staticmethod
+    def build_improvement_prompt(current_score: int, planned_actions: List[str]) -> str:
+        """Prompt asking the LLM to estimate the effect of planned actions"""
+        actions_text = "\n".join([f"- {action}" for action in planned_actions])
+
+        return f"""
+        Current YECS Score: {current_score}/850
+
+        Planned Actions:
+        {actions_text}
+
+        As a credit scoring expert, analyze these planned actions and provide:
+        1. Estimated score improvement (be realistic)
+        2. Timeline for seeing results
+        3. Priority order of actions
+        4. Additional recommendations
+
+        Keep response under 200 words.
+        """
+
+    async def generate_score_explanation(self, user_data: Dict, yecs_score: int, component_scores: Dict) -> str:
+        """Generate AI explanation for YECS score"""
+        prompt = self.build_explanation_prompt(user_data, yecs_score, component_scores)
+        return await self._chat(prompt, 'Unable to generate explanation', 'explanation')
+
+    async def generate_score_explanation_hedged(self, user_data: Dict, yecs_score: int, component_scores: Dict,
+                                                template_explainer, budget_ms: float = 1500) -> Tuple[str, str]:
+        """Explain a score within a latency budget.
+
+        Asks the LLM, but serves template_explainer's explanation if the LLM has not
+        answered within budget_ms, fails, or its circuit is open, or if every
+        generation slot is taken by a different prompt. Returns (explanation, source)
+        with source 'llm' or 'template'. A generation that runs over budget carries on
+        and fills the cache for the next request.
+        """
+        prompt = self.build_explanation_prompt(user_data, yecs_score, component_scores)
+        key = self.prompt_key(prompt)
+        self._get_client()
+        saturated = self._semaphore.locked() and key not in self._in_flight and self.cache.get(key) is None
+        if saturated:
+            return template_explainer.explain(yecs_score, component_scores), 'template'
+
+        async def ask_llm():
+            # While the circuit is open only the cached health check may probe Ollama
+            if self.circuit_breaker.is_open and self.cache.get(key) is None and not await self.health_check():
+                raise RuntimeError("Ollama circuit breaker is open")
+            return await self._content(prompt, 'explanation')
+
+        try:
+            return await asyncio.wait_for(ask_llm(), budget_ms / 1000.0), 'llm'
+        except Exception:
+            return template_explainer.explain(yecs_score, component_scores), 'template'
+
+    async def stream_score_explanation(self, user_data: Dict, yecs_score: int,
+                                       component_scores: Dict) -> AsyncIterator[str]:
+        """Generate AI explanation for YECS score, yielding content tokens as Ollama produces them.
+
+        Unlike generate_score_explanation, failures raise (httpx exceptions or
+        RuntimeError) so callers can tell an error from generated text.
+        """
+        prompt = self.build_explanation_prompt(user_data, yecs_score, component_scores)
+        client = self._get_client()
+        async with self._semaphore:
+            async with self._stream_chat(client, prompt) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"Error generating explanation: {response.status_code}")
+
+                # Ollama streams one JSON object per line
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+
+                    chunk = json.loads(line)
+                    if 'error' in chunk:
+                        raise RuntimeError(f"Error generating explanation: {chunk['error']}")
+
+                    content = chunk.get('message', {}).get('content', '')
+                    if content:
+                        yield content
+
+                    if chunk.get('done'):
+                        break
+
+    async def predict_score_improvement(self, current_score: int, planned_actions: List[str]) -> str:
+        """Predict score improvement based on planned actions"""
+        prompt = self.build_improvement_prompt(current_score, planned_actions)
+        return await self._chat(prompt, 'Unable to generate prediction', 'prediction')
+
+    async def health_check(self) -> bool:
+        """Check if Ollama is running and accessible.
+
+        The answer is cached for health_ttl seconds, and no probe is sent while the
+        circuit breaker is open.
+        """
+        now = time.monotonic()
+        if self._health is not None and self._health[0] > now:
+            return self._health[1]
+
+        healthy = False
+        if self.circuit_breaker.allow_request():
+            try:
+                response = await self._get_client().get(f"{self.base_url}/api/tags", timeout=5)
+                healthy = response.status_code == 200
+            except Exception:
+                healthy = False
+
+            if healthy:
+                self.circuit_breaker.record_success()
+            else:
+                self.circuit_breaker.record_failure()
+
+        self._health = (now + self.health_ttl, healthy)
+        return healthy
+
+    async def aclose(self):
+        """Close the pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def prompt_key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{prompt}".encode('utf-8')).hexdigest()
+
+    async def _chat(self, prompt: str, empty_message: str, kind: str) -> str:
+        """Generated text for a prompt, or an error message in place of it"""
+        try:
+            return await self._content(prompt, kind)
+        except httpx.HTTPError as e:
+            return f"Error connecting to Ollama: {str(e)}"
+        except EmptyResponse:
+            return empty_message
+        except RuntimeError as e:
+            return str(e)
+
+    async def _content(self, prompt: str, kind: str) -> str:
+        """Generated text for a prompt; raises instead of returning an error message"""
+        key = self.prompt_key(prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Identical prompt already being generated: wait for that call instead
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(key, prompt, kind))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shielded so one cancelled waiter doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _generate(self, key: str, prompt: str, kind: str) -> str:
+        client = self._get_client()
+        async with self._semaphore:
+            if not self.circuit_breaker.allow_request():
+                raise RuntimeError("Ollama circuit breaker is open")
+            try:
+                response = await client.post(
+                    self.api_url,
+                    json={
+                        "model": self.model_name,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "stream": False
+                    }
+                )
+            except Exception:
+                self.circuit_breaker.record_failure()
+                raise
+            self._record_status(response.status_code)
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Error generating {kind}: {response.status_code}")
+
+        content = response.json().get('message', {}).get('content')
+        if not content:
+            raise EmptyResponse()
+
+        self.cache.put(key, content)
+        return content
+
+    @asynccontextmanager
+    async def _stream_chat(self, client: httpx.AsyncClient, prompt: str) -> AsyncIterator[httpx.Response]:
+        """Streaming chat request through the circuit breaker"""
+        if not self.circuit_breaker.allow_request():
+            raise RuntimeError("Ollama circuit breaker is open")
+
+        request = client.build_request(
+            'POST', self.api_url,
+            json={
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True
+            }
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+
+        self._record_status(response.status_code)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def _record_status(self, status_code: int):
+        # Only 2xx counts as healthy; a 4xx is our request's fault and counts as neither
+        if 200 <= status_code < 300:
+            self.circuit_breaker.record_success()
+        elif status_code >= 500:
+            self.circuit_breaker.record_failure()
+
+
+class EventLoopThread:
+    """Event loop on a daemon thread for calling async clients from sync (e.g. Flask) code.
+
+    The loop starts on first use, so an instance created before a fork (gunicorn's
+    preload_app) gets a fresh loop in each worker process.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._pid != os.getpid():
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self.loop.run_forever, name='async-io', daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+            return self.loop
+
+    def run(self, coroutine, timeout: float = None):
+        """Run a coroutine on the loop and block the calling thread until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_started()).result(timeout=timeout)
+
+    def iterate(self, async_iterator: AsyncIterator) -> Iterator:
+        """Drive an async iterator on the loop, yielding its items to the calling thread"""
+        try:
+            while True:
+                try:
+                    yield self.run(async_iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Also runs when the consumer stops early, e.g. a client disconnecting mid-stream
+            self.run(async_iterator.aclose())
+
+    def stop(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self._pid = None
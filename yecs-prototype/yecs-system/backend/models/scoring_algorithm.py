@@ -1,10 +1,54 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple, Union
 import logging
 
+# Flat column layout used by the batch scoring path: section -> {column: default}.
+# The defaults mirror the .get() fallbacks of the scalar calculate_*_score methods.
+BATCH_COLUMNS = {
+    'business': {
+        'business_plan_quality': 0,
+        'revenue_projection': 0,
+        'industry_average_revenue': 100000,
+        'years_of_experience': 0,
+        'market_analysis_score': 0
+    },
+    'financial': {
+        'utility_payment_score': 0,
+        'rent_payment_score': 0,
+        'student_loan_payment_score': 0,
+        'subscription_payment_score': 0,
+        'tax_filing_score': 0,
+        'monthly_income': 1,
+        'debt_amount': 0,
+        'savings_amount': 0,
+        'monthly_expenses': 0,
+        'overdraft_score': 1.0
+    },
+    'credit': {
+        'traditional_credit_score': 0,
+        'credit_utilization': 0,
+        'recent_credit_inquiries': 0
+    },
+    'education': {
+        'education_level': '',
+        'industry_experience_years': 0,
+        'professional_certifications': 0,
+        'entrepreneurship_courses': 0
+    },
+    'social': {
+        'identity_verification_score': 0,
+        'professional_network_score': 0,
+        'online_business_presence': 0,
+        'community_involvement_score': 0
+    }
+}
+
 
 class YECScoringAlgorithm:
+    # Bump whenever the scoring rules change so cached scores are not reused
+    version = '1.0'
+
     def __init__(self):
         self.weights = {
             'business_viability': 0.25,
@@ -233,3 +277,207 @@ class YECScoringAlgorithm:
         }
 
         return final_score, component_scores
+
+    @staticmethod
+    def flatten_user_data(records: List[Dict]) -> pd.DataFrame:
+        """Flatten nested user_data dicts into the columnar layout used by calculate_yecs_scores_batch"""
+        rows = []
+        for user_data in records:
+            row = {}
+            for section in BATCH_COLUMNS:
+                row.update(user_data.get(section, {}))
+            rows.append(row)
+
+        return pd.DataFrame(rows)
+
+    def _batch_frame(self, data: Union[pd.DataFrame, Dict]) -> pd.DataFrame:
+        """Fill missing columns and values with the scalar path defaults"""
+        frame = pd.DataFrame(data)
+        columns = {}
+        for section_columns in BATCH_COLUMNS.values():
+            for column, default in section_columns.items():
+                if column in frame.columns:
+                    values = frame[column]
+                    if column != 'education_level':
+                        values = pd.to_numeric(values)
+                    columns[column] = values.fillna(default)
+                else:
+                    columns[column] = pd.Series(default, index=frame.index)
+
+        return pd.DataFrame(columns, index=frame.index)
+
+    @staticmethod
+    def _column(frame: pd.DataFrame, column: str) -> np.ndarray:
+        return frame[column].to_numpy(dtype=np.float64)
+
+    def calculate_business_viability_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_business_viability_score over a column frame"""
+        plan_quality = self._column(frame, 'business_plan_quality')
+        revenue_proj = self._column(frame, 'revenue_projection')
+        industry_avg = self._column(frame, 'industry_average_revenue')
+        experience = self._column(frame, 'years_of_experience')
+        market_analysis = self._column(frame, 'market_analysis_score')
+
+        score = np.zeros(len(frame))
+        score += np.minimum(plan_quality * 30, 30)
+
+        has_revenue = revenue_proj > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            realism_ratio = np.minimum(revenue_proj / industry_avg, 2.0)
+        score += np.where(has_revenue, (1 - np.abs(realism_ratio - 1)) * 25, 0.0)
+
+        score += np.minimum(experience * 5, 25)
+        score += np.minimum(market_analysis * 20, 20)
+
+        return np.minimum(score, 100)
+
+    def calculate_payment_history_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_payment_history_score over a column frame"""
+        score = np.zeros(len(frame))
+        score += self._column(frame, 'utility_payment_score') * 30
+        score += self._column(frame, 'rent_payment_score') * 25
+        score += self._column(frame, 'student_loan_payment_score') * 20
+        score += self._column(frame, 'subscription_payment_score') * 15
+        score += self._column(frame, 'tax_filing_score') * 10
+
+        return np.minimum(score, 100)
+
+    def calculate_financial_management_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_financial_management_score over a column frame"""
+        monthly_income = self._column(frame, 'monthly_income')
+        debt_amount = self._column(frame, 'debt_amount')
+        savings_amount = self._column(frame, 'savings_amount')
+        monthly_expenses = self._column(frame, 'monthly_expenses')
+        overdraft_score = self._column(frame, 'overdraft_score')
+
+        score = np.zeros(len(frame))
+        has_income = monthly_income > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Debt-to-income ratio (0-30 points)
+            debt_to_income = debt_amount / (monthly_income * 12)
+            score += np.where(has_income, np.select(
+                [debt_to_income <= 0.3, debt_to_income <= 0.5, debt_to_income <= 0.8],
+                [30.0, 20.0, 10.0],
+                0.0
+            ), 0.0)
+
+            # Savings rate (0-25 points)
+            savings_rate = savings_amount / (monthly_income * 12)
+            score += np.where(has_income, np.minimum(savings_rate * 100, 25), 0.0)
+
+            # Cash flow management (0-25 points)
+            cash_flow_ratio = (monthly_income - monthly_expenses) / monthly_income
+            score += np.where(monthly_income > monthly_expenses, cash_flow_ratio * 25, 0.0)
+
+        score += overdraft_score * 20
+
+        return np.minimum(score, 100)
+
+    def calculate_personal_creditworthiness_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_personal_creditworthiness_score over a column frame"""
+        traditional_score = self._column(frame, 'traditional_credit_score')
+        credit_utilization = self._column(frame, 'credit_utilization')
+        recent_inquiries = self._column(frame, 'recent_credit_inquiries')
+
+        score = np.zeros(len(frame))
+
+        normalized = (traditional_score - 300) / (850 - 300)
+        score += np.where(traditional_score > 0, normalized * 50, 25.0)
+
+        score += np.select(
+            [credit_utilization <= 0.1, credit_utilization <= 0.3, credit_utilization <= 0.5],
+            [30.0, 20.0, 10.0],
+            0.0
+        )
+
+        score += np.select(
+            [recent_inquiries == 0, recent_inquiries <= 2, recent_inquiries <= 4],
+            [20.0, 15.0, 10.0],
+            0.0
+        )
+
+        return np.minimum(score, 100)
+
+    def calculate_education_background_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_education_background_score over a column frame"""
+        education_level = frame['education_level'].astype(str).str.lower()
+
+        def contains(token):
+            return education_level.str.contains(token, regex=False).to_numpy()
+
+        score = np.zeros(len(frame))
+        score += np.select(
+            [
+                contains('phd') | contains('doctorate'),
+                contains('master') | contains('mba'),
+                contains('bachelor'),
+                contains('associate'),
+                contains('high school')
+            ],
+            [40.0, 35.0, 30.0, 20.0, 15.0],
+            0.0
+        )
+
+        score += np.minimum(self._column(frame, 'industry_experience_years') * 3, 30)
+        score += np.minimum(self._column(frame, 'professional_certifications') * 5, 20)
+        score += np.minimum(self._column(frame, 'entrepreneurship_courses') * 2, 10)
+
+        return np.minimum(score, 100)
+
+    def calculate_social_verification_scores(self, frame: pd.DataFrame) -> np.ndarray:
+        """Vectorized calculate_social_verification_score over a column frame"""
+        score = np.zeros(len(frame))
+        score += self._column(frame, 'identity_verification_score') * 30
+        score += self._column(frame, 'professional_network_score') * 25
+        score += self._column(frame, 'online_business_presence') * 25
+        score += self._column(frame, 'community_involvement_score') * 20
+
+        return np.minimum(score, 100)
+
+    def calculate_yecs_scores_batch(self, data: Union[pd.DataFrame, Dict]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Calculate YECS scores for many users at once.
+
+        Takes a DataFrame (or dict of arrays) with one flat column per input key, see
+        BATCH_COLUMNS and flatten_user_data. Missing columns and NaN values fall back to
+        the same defaults as the scalar path, and every row produces exactly the same
+        score, component scores and risk level as calculate_yecs_score.
+        """
+        frame = self._batch_frame(data)
+
+        business_score = self.calculate_business_viability_scores(frame)
+        payment_score = self.calculate_payment_history_scores(frame)
+        financial_score = self.calculate_financial_management_scores(frame)
+        credit_score = self.calculate_personal_creditworthiness_scores(frame)
+        education_score = self.calculate_education_background_scores(frame)
+        social_score = self.calculate_social_verification_scores(frame)
+
+        # Same left-to-right summation order as the scalar path
+        weighted_score = (
+                business_score * self.weights['business_viability'] +
+                payment_score * self.weights['payment_history'] +
+                financial_score * self.weights['financial_management'] +
+                credit_score * self.weights['personal_creditworthiness'] +
+                education_score * self.weights['education_background'] +
+                social_score * self.weights['social_verification']
+        )
+
+        final_scores = np.trunc(300 + (weighted_score / 100) * 550).astype(np.int64)
+
+        risk_levels = np.select(
+            [final_scores >= 750, final_scores >= 650, final_scores >= 550],
+            ['LOW', 'MEDIUM', 'HIGH'],
+            'VERY_HIGH'
+        ).astype(object)
+
+        component_scores = {
+            'business_viability': business_score,
+            'payment_history': payment_score,
+            'financial_management': financial_score,
+            'personal_creditworthiness': credit_score,
+            'education_background': education_score,
+            'social_verification': social_score,
+            'risk_level': risk_levels
+        }
+
+        return final_scores, component_scores
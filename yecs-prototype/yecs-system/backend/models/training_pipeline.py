@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler, train_test_split
+from sklearn.metrics import r2_score
+from typing import Dict, List, Tuple
+import pandas as pd
+import numpy as np
+import logging
+import time
+
+from models.ml_models import YECSMLModel
+
+
+def split_params(params: Dict) -> Tuple[Dict, Dict]:
+    """Split 'rf__<name>' / 'gb__<name>' search parameters into per-model dicts"""
+    rf_params, gb_params = {}, {}
+    for name, value in params.items():
+        prefix, _, param = name.partition('__')
+        if prefix == 'rf':
+            rf_params[param] = value
+        elif prefix == 'gb':
+            gb_params[param] = value
+        else:
+            raise ValueError(f"Search parameter {name} must start with 'rf__' or 'gb__'")
+    return rf_params, gb_params
+
+
+# Training rows, folds and backend of the current cross-validation, set once per worker process
+_cv_data = {}
+
+
+def _init_cv_worker(X: np.ndarray, y: np.ndarray, splits: List[Tuple[np.ndarray, np.ndarray]], backend: str):
+    """Process pool initializer: receive the data once instead of with every task"""
+    _cv_data.update(X=X, y=y, splits=splits, backend=backend)
+
+
+def _evaluate_fold(task) -> Tuple[int, float]:
+    """Fit one candidate on one CV fold and return its blended R² (runs in a worker process)"""
+    candidate_index, params, fold_index = task
+    X, y, backend = _cv_data['X'], _cv_data['y'], _cv_data['backend']
+    train_index, test_index = _cv_data['splits'][fold_index]
+    rf_params, gb_params = split_params(params)
+    # One core per task; the process pool provides the parallelism
+    model = YECSMLModel(rf_params={**rf_params, 'n_jobs': 1}, gb_params=gb_params, backend=backend)
+    if backend == 'xgboost':
+        model.gb_model.set_params(n_jobs=1)
+
+    model.rf_model.fit(X[train_index], y[train_index])
+    model.gb_model.fit(X[train_index], y[train_index])
+    prediction = 0.6 * model.rf_model.predict(X[test_index]) + 0.4 * model.gb_model.predict(X[test_index])
+
+    return candidate_index, r2_score(y[test_index], prediction)
+
+
+class TrainingPipeline:
+    """Parallel training for YECSMLModel.
+
+    Stages: prepare (features, hold-out split, scaler), search (k-fold cross-validation
+    of every candidate parameter set, fanned out as candidate x fold tasks over a process
+    pool), fit (best parameters, RF and GB fitted concurrently with the RF on all cores)
+    and evaluate (hold-out metrics). Wall time of each stage is reported.
+    """
+
+    def __init__(self, backend: str = 'sklearn', folds: int = 5, max_workers: int = None,
+                 test_size: float = 0.2, random_state: int = 42):
+        if folds < 2:
+            raise ValueError("Cross-validation needs at least 2 folds")
+
+        self.backend = backend
+        self.folds = folds
+        self.max_workers = max_workers
+        self.test_size = test_size
+        self.random_state = random_state
+
+    def candidates(self, param_grid: Dict = None, search: str = 'grid', n_iter: int = 10) -> List[Dict]:
+        """Parameter sets to evaluate; an empty grid means only the default parameters"""
+        if not param_grid:
+            return [{}]
+        if search == 'grid':
+            return list(ParameterGrid(param_grid))
+        elif search == 'random':
+            return list(ParameterSampler(param_grid, n_iter=n_iter, random_state=self.random_state))
+        else:
+            raise ValueError(f"Unknown search strategy: {search}")
+
+    def run(self, training_data: pd.DataFrame, target_scores: pd.Series, param_grid: Dict = None,
+            search: str = 'grid', n_iter: int = 10) -> Tuple[YECSMLModel, Dict]:
+        """Search, fit and evaluate; returns the trained model and a report"""
+        timings = {}
+
+        start = time.perf_counter()
+        model = YECSMLModel(backend=self.backend)
+        X = model.prepare_features(training_data)
+        y = np.asarray(target_scores, dtype=np.float64)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=self.test_size, random_state=self.random_state
+        )
+        X_train_scaled = model.scaler.fit_transform(X_train)
+        X_test_scaled = model.scaler.transform(X_test)
+        timings['prepare'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        candidates = self.candidates(param_grid, search, n_iter)
+        cv_results = self.cross_validate(candidates, X_train_scaled, y_train)
+        best = max(cv_results, key=lambda result: result['mean_r2'])
+        timings['search'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rf_params, gb_params = split_params(best['params'])
+        final_model = YECSMLModel(rf_params=rf_params, gb_params=gb_params, backend=self.backend)
+        final_model.scaler = model.scaler
+        final_model.fit_models(X_train_scaled, y_train)
+        timings['fit'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics = final_model.evaluate(X_test_scaled, y_test)
+        timings['evaluate'] = time.perf_counter() - start
+
+        for stage, seconds in timings.items():
+            logging.info(f"Training stage {stage}: {seconds:.2f}s")
+
+        return final_model, {
+            'best_params': best['params'],
+            'cv_results': cv_results,
+            'metrics': metrics,
+            'timings': timings
+        }
+
+    def cross_validate(self, candidates: List[Dict], X: np.ndarray, y: np.ndarray) -> List[Dict]:
+        """K-fold R² of every candidate, evaluated in parallel worker processes.
+
+        X, y and the folds reach each worker once through the pool initializer; tasks
+        carry only a candidate's parameters and a fold number.
+        """
+        splits = list(KFold(n_splits=self.folds, shuffle=True, random_state=self.random_state).split(X))
+        tasks = [
+            (candidate_index, params, fold_index)
+            for candidate_index, params in enumerate(candidates)
+            for fold_index in range(len(splits))
+        ]
+
+        fold_scores = [[] for _ in candidates]
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_cv_worker,
+                                 initargs=(X, y, splits, self.backend)) as executor:
+            for candidate_index, score in executor.map(_evaluate_fold, tasks):
+                fold_scores[candidate_index].append(score)
+
+        return [
+            {'params': params, 'mean_r2': float(np.mean(scores)), 'std_r2': float(np.std(scores))}
+            for params, scores in zip(candidates, fold_scores)
+        ]
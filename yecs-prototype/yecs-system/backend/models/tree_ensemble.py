@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from models.features import prepare_features
+
+# Blend weights of YECSMLModel's ensemble prediction
+RF_WEIGHT = 0.6
+GB_WEIGHT = 0.4
+
+
+class FlatTreeEnsemble:
+    """YECSMLModel's scaler and RF+GB blend flattened into contiguous NumPy arrays.
+
+    Every tree node of both ensembles lives in shared feature/threshold/children/value
+    arrays. Leaves point to themselves, so all trees are walked together for a whole
+    batch in max_depth vectorized steps, and each leaf value is multiplied by a
+    per-tree weight that folds in the RF average, the GB learning rate and the
+    0.6/0.4 blend. Prediction needs only NumPy (and pandas for feature preparation).
+    """
+
+    ARRAY_NAMES = ('feature', 'threshold', 'children', 'is_leaf', 'value', 'roots', 'tree_weights',
+                   'scaler_mean', 'scaler_scale')
+
+    def __init__(self, feature, threshold, children, is_leaf, value, roots, tree_weights,
+                 scaler_mean, scaler_scale, bias: float, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        # Children interleaved so one gather picks the branch: children[2 * node + went_right]
+        self.children = children
+        self.is_leaf = is_leaf
+        self.value = value
+        self.roots = roots
+        self.tree_weights = tree_weights
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.bias = float(bias)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_model(cls, model) -> 'FlatTreeEnsemble':
+        """Flatten a trained YECSMLModel"""
+        if not model.is_trained:
+            raise ValueError("Model must be trained before it can be flattened")
+        if not hasattr(model.gb_model, 'estimators_'):
+            raise ValueError("Only sklearn GradientBoostingRegressor ensembles can be flattened")
+
+        rf_trees = [estimator.tree_ for estimator in model.rf_model.estimators_]
+        gb_trees = [estimator.tree_ for estimator in model.gb_model.estimators_[:, 0]]
+        tree_weights = np.concatenate([
+            np.full(len(rf_trees), RF_WEIGHT / len(rf_trees)),
+            np.full(len(gb_trees), GB_WEIGHT * model.gb_model.learning_rate)
+        ])
+
+        # Constant initial prediction of the boosting stages (training mean by default)
+        init = model.gb_model.init_
+        gb_init = 0.0 if init == 'zero' else float(np.ravel(init.predict(np.zeros((1, model.scaler.n_features_in_))))[0])
+
+        features, thresholds, children, leaves, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in rf_trees + gb_trees:
+            node_ids = np.arange(tree.node_count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            children.append(np.column_stack([
+                np.where(is_leaf, node_ids, tree.children_left),
+                np.where(is_leaf, node_ids, tree.children_right)
+            ]).astype(np.int32).ravel() + offset)
+            leaves.append(is_leaf)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            is_leaf=np.concatenate(leaves),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            tree_weights=tree_weights,
+            scaler_mean=np.asarray(model.scaler.mean_, dtype=np.float64),
+            scaler_scale=np.asarray(model.scaler.scale_, dtype=np.float64),
+            bias=GB_WEIGHT * gb_init,
+            max_depth=max_depth
+        )
+
+    def predict_features(self, X, batch_size: int = 4096) -> np.ndarray:
+        """Blended, clipped prediction for rows of prepared (unscaled) features"""
+        X = np.asarray(X, dtype=np.float64)
+        # Trees compare float32 features against float64 thresholds, as sklearn does
+        X_scaled = ((X - self.scaler_mean) / self.scaler_scale).astype(np.float32)
+
+        predictions = np.empty(len(X_scaled))
+        for start in range(0, len(X_scaled), batch_size):
+            batch = X_scaled[start:start + batch_size]
+            predictions[start:start + batch_size] = self._predict_raw(batch)
+
+        return np.clip(predictions, 300, 850)
+
+    def predict_batch(self, records: List[Dict]) -> np.ndarray:
+        """Same contract as YECSMLModel.predict_batch"""
+        return self.predict_features(prepare_features(pd.DataFrame(records)).to_numpy(dtype=np.float64))
+
+    def _predict_raw(self, X: np.ndarray) -> np.ndarray:
+        num_rows, num_features = X.shape
+        num_trees = len(self.roots)
+        X_flat = X.ravel()
+
+        # One entry per (row, tree) pair that hasn't reached a leaf yet
+        row_offsets = np.repeat(np.arange(num_rows) * num_features, num_trees)
+        nodes = np.tile(self.roots, num_rows)
+        final_nodes = nodes.copy()
+        active = np.arange(len(nodes))
+
+        for _ in range(self.max_depth):
+            went_right = X_flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + went_right]
+
+            done = self.is_leaf[nodes]
+            if done.any():
+                final_nodes[active[done]] = nodes[done]
+                keep = ~done
+                nodes, row_offsets, active = nodes[keep], row_offsets[keep], active[keep]
+                if not len(nodes):
+                    break
+
+        final_nodes[active] = nodes
+        return self.value[final_nodes].reshape(num_rows, num_trees) @ self.tree_weights + self.bias
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """All state as named arrays, e.g. for np.savez"""
+        arrays = {name: getattr(self, name) for name in self.ARRAY_NAMES}
+        arrays['bias'] = np.array(self.bias)
+        arrays['max_depth'] = np.array(self.max_depth)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'FlatTreeEnsemble':
+        """Rebuild from the output of to_arrays (or an np.load result)"""
+        return cls(
+            *(arrays[name] for name in cls.ARRAY_NAMES),
+            bias=float(arrays['bias']),
+            max_depth=int(arrays['max_depth'])
+        )
+
+    def validate(self, model, X, rtol: float = 1e-9) -> float:
+        """Check predictions against the sklearn models and return the max absolute difference"""
+        X = np.asarray(X, dtype=np.float64)
+        X_scaled = model.scaler.transform(X)
+        expected = np.clip(RF_WEIGHT * model.rf_model.predict(X_scaled) +
+                           GB_WEIGHT * model.gb_model.predict(X_scaled), 300, 850)
+        actual = self.predict_features(X)
+
+        if not np.allclose(actual, expected, rtol=rtol, atol=0):
+            raise AssertionError(f"Flattened ensemble deviates from sklearn by up to {np.max(np.abs(actual - expected))}")
+        return float(np.max(np.abs(actual - expected)))
@@ -1,13 +1,66 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import combinations
+from statistics import NormalDist
 import logging
+import warnings
+
+
+def _poisson_bootstrap_ratios(small_codes: np.ndarray, small_scores: np.ndarray, counts: np.ndarray,
+                              means: np.ndarray, stds: np.ndarray, exact: np.ndarray,
+                              resamples: int, seed) -> np.ndarray:
+    """Disparate-impact ratio of every group in each of resamples Poisson bootstrap resamples.
+
+    Every row gets a Poisson(1) weight per resample. Rows of groups flagged exact
+    (sorted by group code in small_codes/small_scores) get explicit weight
+    matrices; for the other groups the resampled row count is drawn from
+    Poisson(count) and the resampled score sum from its normal approximation,
+    which is what the explicit weights converge to for large groups. The last
+    bin holds rows with a missing attribute and only enters the overall mean.
+    """
+    rng = np.random.default_rng(seed)
+    bins = len(counts)
+    resampled_counts = rng.poisson(np.where(exact, 0, counts)[:, None], (bins, resamples)).astype(np.float64)
+    resampled_sums = (resampled_counts * means[:, None]
+                      + np.sqrt(resampled_counts) * stds[:, None] * rng.standard_normal((bins, resamples)))
+
+    # About 4M weights per chunk of rows
+    chunk_rows = max(1, (1 << 22) // resamples)
+    for start in range(0, len(small_codes), chunk_rows):
+        chunk_codes = small_codes[start:start + chunk_rows]
+        weights = rng.poisson(1.0, (len(chunk_codes), resamples)).astype(np.float64)
+        runs = np.flatnonzero(np.r_[True, chunk_codes[1:] != chunk_codes[:-1]])
+        resampled_counts[chunk_codes[runs]] += np.add.reduceat(weights, runs, axis=0)
+        weights *= small_scores[start:start + chunk_rows, None]
+        resampled_sums[chunk_codes[runs]] += np.add.reduceat(weights, runs, axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overall_means = resampled_sums.sum(axis=0) / resampled_counts.sum(axis=0)
+        return resampled_sums[:-1] / resampled_counts[:-1] / overall_means
+
+
+def _sample_std(count, std) -> Optional[float]:
+    """Group std as reported in results: None where it is undefined (fewer than two scores)"""
+    return float(std) if count > 1 else None
 
 
 class BiasDetector:
-    def __init__(self):
+    def __init__(self, bootstrap_resamples: int = 1000, bootstrap_workers: int = 1):
         self.protected_attributes = ['age', 'gender', 'race', 'ethnicity', 'zip_code']
         self.bias_threshold = 0.1  # 10% threshold for bias detection
+        # Groups are only flagged when the ratio's confidence interval excludes parity
+        self.confidence_level = 0.95
+        self.min_interval_count = 30  # Smaller groups get no interval, as their bootstrap spread is unreliable
+        self.bootstrap_resamples = bootstrap_resamples
+        self.bootstrap_workers = bootstrap_workers  # Processes sharing the resamples; 1 runs in-process
+        self.bootstrap_exact_max_count = 100  # Larger groups resample their score sum from its normal approximation
+        self.bootstrap_seed = 42
+        self.approval_threshold = 650  # Scores at or above this are approved
+        # Continuous attributes are banded before intersecting them with others
+        self.intersection_bands = {'age': [18, 25, 35, 45, 55, 65]}
 
     def detect_demographic_bias(self, scores: pd.DataFrame, demographics: pd.DataFrame) -> Dict:
         """Detect bias across demographic groups"""
@@ -16,53 +69,226 @@ class BiasDetector:
         # Merge scores with demographics
         merged_data = pd.merge(scores, demographics, on='user_id', how='inner')
 
-        for attribute in self.protected_attributes:
-            if attribute in merged_data.columns:
-                bias_results[attribute] = self._analyze_attribute_bias(
-                    merged_data, attribute, 'yecs_score'
-                )
+        with self._bootstrap_pool() as pool:
+            for attribute in self.protected_attributes:
+                if attribute in merged_data.columns:
+                    bias_results[attribute] = self._analyze_attribute_bias(
+                        merged_data, attribute, 'yecs_score', pool
+                    )
 
         return bias_results
 
-    def _analyze_attribute_bias(self, data: pd.DataFrame, attribute: str, score_column: str) -> Dict:
+    def _bootstrap_pool(self):
+        if self.bootstrap_workers > 1:
+            return ProcessPoolExecutor(max_workers=self.bootstrap_workers)
+        return nullcontext()
+
+    def _analyze_attribute_bias(self, data: pd.DataFrame, attribute: str, score_column: str,
+                                pool: Optional[ProcessPoolExecutor] = None) -> Dict:
         """Analyze bias for a specific attribute"""
         try:
-            # Group by attribute and calculate statistics
-            grouped = data.groupby(attribute)[score_column].agg(['mean', 'std', 'count'])
+            codes, groups = self._group_codes(data[attribute])
+            scores = data[score_column].to_numpy(dtype=np.float64)
+
+            # Group count, mean and sample std (ddof=1, as pandas) from bincounts over the codes
+            counts = self._group_sums(codes, len(groups))
+            means = self._group_sums(codes, len(groups), scores) / np.maximum(counts, 1)
+            squared_deviations = self._group_sums(codes, len(groups), (scores - np.append(means, 0)[codes]) ** 2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                stds = np.sqrt(squared_deviations / (counts - 1))
+
+            group_statistics = {
+                group: {'mean': float(means[i]), 'std': _sample_std(counts[i], stds[i]), 'count': int(counts[i])}
+                for i, group in enumerate(groups)
+            }
 
             # Calculate statistical parity
             overall_mean = data[score_column].mean()
-            group_means = grouped['mean']
-
-            # Calculate disparate impact ratios
-            disparate_impact = {}
-            for group in group_means.index:
-                if overall_mean > 0:
-                    disparate_impact[group] = group_means[group] / overall_mean
-
-            # Identify potential bias
-            biased_groups = []
-            for group, ratio in disparate_impact.items():
-                if abs(ratio - 1.0) > self.bias_threshold:
-                    biased_groups.append({
-                        'group': group,
-                        'ratio': ratio,
-                        'mean_score': group_means[group],
-                        'sample_size': grouped.loc[group, 'count']
-                    })
-
-            return {
-                'overall_mean': overall_mean,
-                'group_statistics': grouped.to_dict('index'),
-                'disparate_impact': disparate_impact,
-                'biased_groups': biased_groups,
-                'bias_detected': len(biased_groups) > 0
-            }
+            ratio_intervals = self._bootstrap_ratio_intervals(codes, groups, scores, pool)
+
+            return self._summarize_group_bias(overall_mean, group_statistics, ratio_intervals)
 
         except Exception as e:
             logging.error(f"Bias analysis failed for {attribute}: {str(e)}")
             return {'error': str(e)}
 
+    @staticmethod
+    def _group_codes(values: pd.Series) -> Tuple[np.ndarray, List]:
+        """Integer group code per row and the sorted group labels, as groupby would group them.
+
+        Rows with a missing attribute get code len(groups), one past the last group,
+        so bincounts can include them in a spare bin that is dropped.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Reuse the categorical codes, keeping only the categories that occur
+            codes = values.cat.codes.to_numpy()
+            categories = values.cat.categories
+            codes = np.where(codes < 0, len(categories), codes)
+            observed = np.bincount(codes, minlength=len(categories) + 1)[:len(categories)] > 0
+            remap = np.append(np.cumsum(observed) - 1, observed.sum())
+            return remap[codes], list(categories[observed])
+
+        codes, uniques = pd.factorize(values, sort=True)
+        groups = list(uniques)
+        return np.where(codes < 0, len(groups), codes), groups
+
+    @staticmethod
+    def _group_sums(codes: np.ndarray, num_groups: int, weights: np.ndarray = None) -> np.ndarray:
+        """Per-group row count, or per-group sum of weights, for codes from _group_codes"""
+        return np.bincount(codes, weights=weights, minlength=num_groups + 1)[:num_groups]
+
+    def _bootstrap_ratio_intervals(self, codes: np.ndarray, groups: List, scores: np.ndarray,
+                                   pool: Optional[ProcessPoolExecutor] = None) -> Dict:
+        """Percentile bootstrap confidence interval of each group's disparate-impact ratio.
+
+        Groups with fewer than min_interval_count rows get no interval. With a pool, the
+        resamples are split into one block per worker, each with its own seed.
+        """
+        bins = len(groups) + 1
+        counts = np.bincount(codes, minlength=bins)
+        means = np.bincount(codes, weights=scores, minlength=bins) / np.maximum(counts, 1)
+        # Population std: the spread of the empirical distribution the resamples draw from
+        stds = np.sqrt(np.bincount(codes, weights=(scores - means[codes]) ** 2, minlength=bins) / np.maximum(counts, 1))
+        exact = counts <= self.bootstrap_exact_max_count
+
+        small_rows = np.flatnonzero(exact[codes])
+        small_rows = small_rows[np.argsort(codes[small_rows], kind='stable')]
+        small_codes, small_scores = codes[small_rows], scores[small_rows]
+
+        blocks = min(max(self.bootstrap_workers, 1) if pool is not None else 1, self.bootstrap_resamples)
+        sizes = [len(block) for block in np.array_split(np.arange(self.bootstrap_resamples), blocks)]
+        seeds = np.random.SeedSequence(self.bootstrap_seed).spawn(blocks)
+        block_args = [(small_codes, small_scores, counts, means, stds, exact, size, seed)
+                      for size, seed in zip(sizes, seeds)]
+        if pool is None:
+            ratios = np.hstack([_poisson_bootstrap_ratios(*args) for args in block_args])
+        else:
+            ratios = np.hstack(list(pool.map(_poisson_bootstrap_ratios, *zip(*block_args))))
+
+        tail = (1 - self.confidence_level) / 2
+        with warnings.catch_warnings():
+            # Groups that no resample drew are all-NaN rows
+            warnings.simplefilter('ignore', RuntimeWarning)
+            lows, highs = np.nanquantile(ratios, [tail, 1 - tail], axis=1)
+
+        has_interval = (counts[:-1] >= self.min_interval_count) & np.isfinite(lows)
+        return {
+            group: [float(lows[i]), float(highs[i])] if has_interval[i] else None
+            for i, group in enumerate(groups)
+        }
+
+    def _analytic_ratio_intervals(self, overall_mean: float, overall_variance: float, total_count: int,
+                                  group_statistics: Dict) -> Dict:
+        """Delta-method confidence interval of each group's ratio of its mean score to the overall mean"""
+        z = NormalDist().inv_cdf(0.5 + self.confidence_level / 2)
+        intervals = {}
+        for group, stats in group_statistics.items():
+            if stats['count'] < self.min_interval_count or stats['std'] is None or overall_mean <= 0:
+                intervals[group] = None
+                continue
+            ratio = stats['mean'] / overall_mean
+            group_variance = stats['std'] ** 2
+            # The group is part of the overall mean: Cov(group mean, overall mean) = group variance / N
+            variance = (group_variance / stats['count']
+                        + ratio ** 2 * overall_variance / total_count
+                        - 2 * ratio * group_variance / total_count) / overall_mean ** 2
+            half_width = z * np.sqrt(max(variance, 0.0))
+            intervals[group] = [ratio - half_width, ratio + half_width]
+        return intervals
+
+    def detect_demographic_bias_from_aggregates(self, aggregates: Dict) -> Dict:
+        """Detect bias from per-group running count/sum/sum_sq score aggregates.
+
+        Produces the same result layout as detect_demographic_bias without needing
+        the individual scores.
+        """
+        bias_results = {}
+
+        for attribute in self.protected_attributes:
+            if attribute in aggregates:
+                bias_results[attribute] = self._analyze_attribute_aggregates(
+                    aggregates[attribute], attribute
+                )
+
+        return bias_results
+
+    def _analyze_attribute_aggregates(self, groups: Dict, attribute: str) -> Dict:
+        """Analyze bias for a specific attribute from its group aggregates"""
+        try:
+            total_count = sum(group['count'] for group in groups.values())
+            total_sum = sum(group['sum'] for group in groups.values())
+            total_sum_sq = sum(group['sum_sq'] for group in groups.values())
+            overall_mean = total_sum / total_count
+            overall_variance = ((total_count * total_sum_sq - total_sum * total_sum) / (total_count * (total_count - 1))
+                                if total_count > 1 else 0.0)
+
+            group_statistics = {}
+            for group_name in sorted(groups):
+                count = groups[group_name]['count']
+                score_sum = groups[group_name]['sum']
+                if count > 1:
+                    # Sample variance (ddof=1, as pandas), kept exact while the sums are integers
+                    variance = (count * groups[group_name]['sum_sq'] - score_sum * score_sum) / (count * (count - 1))
+                    std = float(np.sqrt(max(variance, 0)))
+                else:
+                    std = None
+
+                group_statistics[group_name] = {
+                    'mean': score_sum / count,
+                    'std': std,
+                    'count': count
+                }
+
+            ratio_intervals = self._analytic_ratio_intervals(overall_mean, overall_variance, total_count,
+                                                             group_statistics)
+            return self._summarize_group_bias(overall_mean, group_statistics, ratio_intervals)
+
+        except Exception as e:
+            logging.error(f"Aggregate bias analysis failed for {attribute}: {str(e)}")
+            return {'error': str(e)}
+
+    def _summarize_group_bias(self, overall_mean: float, group_statistics: Dict, ratio_intervals: Dict) -> Dict:
+        """Calculate disparate impact ratios and flag biased groups from group statistics.
+
+        A group beyond the bias threshold is only flagged when its ratio's
+        confidence interval excludes parity; otherwise it is listed as
+        inconclusive, which is where small groups end up.
+        """
+        # Calculate disparate impact ratios
+        disparate_impact = {}
+        for group, stats in group_statistics.items():
+            if overall_mean > 0:
+                disparate_impact[group] = stats['mean'] / overall_mean
+
+        # Identify potential bias
+        biased_groups = []
+        inconclusive_groups = []
+        for group, ratio in disparate_impact.items():
+            if abs(ratio - 1.0) > self.bias_threshold:
+                interval = ratio_intervals.get(group)
+                entry = {
+                    'group': group,
+                    'ratio': ratio,
+                    'ratio_interval': interval,
+                    'mean_score': group_statistics[group]['mean'],
+                    'sample_size': group_statistics[group]['count']
+                }
+                if interval is not None and (interval[0] > 1.0 or interval[1] < 1.0):
+                    biased_groups.append(entry)
+                else:
+                    inconclusive_groups.append(entry)
+
+        return {
+            'overall_mean': overall_mean,
+            'group_statistics': group_statistics,
+            'disparate_impact': disparate_impact,
+            'disparate_impact_intervals': ratio_intervals,
+            'confidence_level': self.confidence_level,
+            'biased_groups': biased_groups,
+            'inconclusive_groups': inconclusive_groups,
+            'bias_detected': len(biased_groups) > 0
+        }
+
     def calculate_fairness_metrics(self, predictions: pd.DataFrame, actual_outcomes: pd.DataFrame,
                                    demographics: pd.DataFrame) -> Dict:
         """Calculate comprehensive fairness metrics"""
@@ -70,80 +296,263 @@ class BiasDetector:
         merged_data = predictions.merge(actual_outcomes, on='user_id') \
             .merge(demographics, on='user_id')
 
+        # Decisions are shared by every attribute, so derive them once
+        scores, cells, has_actual = self._approval_arrays(merged_data)
+
         fairness_metrics = {}
 
         for attribute in self.protected_attributes:
             if attribute in merged_data.columns:
-                fairness_metrics[attribute] = self._calculate_group_fairness(
-                    merged_data, attribute
-                )
+                try:
+                    codes, groups = self._group_codes(merged_data[attribute])
+                    fairness_metrics[attribute] = self._group_fairness(codes, groups, scores, cells, has_actual)
+                except Exception as e:
+                    logging.error(f"Group fairness calculation failed for {attribute}: {str(e)}")
+                    fairness_metrics[attribute] = {'error': str(e)}
 
         return fairness_metrics
 
+    def _approval_arrays(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """Scores and the confusion-matrix cell of each row.
+
+        The cell is predicted * 3 + outcome, where outcome is 0 for an actual denial,
+        1 for an actual approval and 2 when the actual outcome is unknown.
+        """
+        # Assume binary outcome (loan approved/denied)
+        # Convert scores to binary decisions (score >= 650 = approved)
+        scores = data['yecs_score'].to_numpy(dtype=np.float64)
+        if 'predicted_approval' in data.columns:
+            predicted = data['predicted_approval'].to_numpy() == 1
+        else:
+            predicted = scores >= self.approval_threshold
+
+        has_actual = 'actual_approval' in data.columns
+        if has_actual:
+            actual = data['actual_approval'].to_numpy()
+            outcome = np.where(actual == 1, 1, np.where(actual == 0, 0, 2))
+        else:
+            outcome = 2
+        return scores, predicted.astype(np.int64) * 3 + outcome, has_actual
+
+    def _group_confusion(self, codes: np.ndarray, num_groups: int, cells: np.ndarray) -> np.ndarray:
+        """(groups, predicted, outcome) row counts from a single bincount"""
+        counts = np.bincount(codes * 6 + cells, minlength=(num_groups + 1) * 6)
+        return counts.reshape(num_groups + 1, 2, 3)[:num_groups]
+
     def _calculate_group_fairness(self, data: pd.DataFrame, attribute: str) -> Dict:
         """Calculate fairness metrics for a specific group"""
         try:
-            # Assume binary outcome (loan approved/denied)
-            # Convert scores to binary decisions (score >= 650 = approved)
-            data['predicted_approval'] = (data['yecs_score'] >= 650).astype(int)
-
-            groups = data.groupby(attribute)
-
-            # Calculate metrics for each group
-            group_metrics = {}
-            for group_name, group_data in groups:
-                total = len(group_data)
-                approved = group_data['predicted_approval'].sum()
-                approval_rate = approved / total if total > 0 else 0
-
-                group_metrics[group_name] = {
-                    'total_applications': total,
-                    'approved_applications': approved,
-                    'approval_rate': approval_rate,
-                    'average_score': group_data['yecs_score'].mean()
-                }
-
-            # Calculate equalized odds if actual outcomes are available
-            if 'actual_approval' in data.columns:
-                equalized_odds = self._calculate_equalized_odds(data, attribute)
-                group_metrics['equalized_odds'] = equalized_odds
-
-            return group_metrics
+            codes, groups = self._group_codes(data[attribute])
+            return self._group_fairness(codes, groups, *self._approval_arrays(data))
 
         except Exception as e:
             logging.error(f"Group fairness calculation failed for {attribute}: {str(e)}")
             return {'error': str(e)}
 
+    def _group_fairness(self, codes: np.ndarray, groups: List, scores: np.ndarray,
+                        cells: np.ndarray, has_actual: bool) -> Dict:
+        """Approval counts, rates and average scores per group from one confusion bincount"""
+        confusion = self._group_confusion(codes, len(groups), cells)
+        totals = confusion.sum(axis=(1, 2))
+        approved = confusion[:, 1, :].sum(axis=1)
+        score_sums = self._group_sums(codes, len(groups), scores)
+
+        group_metrics = {}
+        for i, group_name in enumerate(groups):
+            total = int(totals[i])
+            group_metrics[group_name] = {
+                'total_applications': total,
+                'approved_applications': int(approved[i]),
+                'approval_rate': approved[i] / total if total > 0 else 0,
+                'average_score': score_sums[i] / total
+            }
+
+        # Calculate equalized odds if actual outcomes are available
+        if has_actual:
+            group_metrics['equalized_odds'] = self._equalized_odds_from_confusion(groups, confusion)
+
+        return group_metrics
+
     def _calculate_equalized_odds(self, data: pd.DataFrame, attribute: str) -> Dict:
         """Calculate equalized odds metric"""
         try:
-            groups = data.groupby(attribute)
-            equalized_odds = {}
-
-            for group_name, group_data in groups:
-                # True positive rate
-                tp = ((group_data['predicted_approval'] == 1) &
-                      (group_data['actual_approval'] == 1)).sum()
-                p = (group_data['actual_approval'] == 1).sum()
-                tpr = tp / p if p > 0 else 0
-
-                # False positive rate
-                fp = ((group_data['predicted_approval'] == 1) &
-                      (group_data['actual_approval'] == 0)).sum()
-                n = (group_data['actual_approval'] == 0).sum()
-                fpr = fp / n if n > 0 else 0
-
-                equalized_odds[group_name] = {
-                    'true_positive_rate': tpr,
-                    'false_positive_rate': fpr
-                }
-
-            return equalized_odds
+            codes, groups = self._group_codes(data[attribute])
+            _, cells, _ = self._approval_arrays(data)
+            return self._equalized_odds_from_confusion(groups, self._group_confusion(codes, len(groups), cells))
 
         except Exception as e:
             logging.error(f"Equalized odds calculation failed: {str(e)}")
             return {'error': str(e)}
 
+    @staticmethod
+    def _equalized_odds_from_confusion(groups: List, confusion: np.ndarray) -> Dict:
+        """True and false positive rates per group"""
+        tp = confusion[:, 1, 1]
+        p = confusion[:, :, 1].sum(axis=1)
+        fp = confusion[:, 1, 0]
+        n = confusion[:, :, 0].sum(axis=1)
+
+        return {
+            group_name: {
+                'true_positive_rate': tp[i] / p[i] if p[i] > 0 else 0,
+                'false_positive_rate': fp[i] / n[i] if n[i] > 0 else 0
+            }
+            for i, group_name in enumerate(groups)
+        }
+
+    def detect_intersectional_bias(self, scores: pd.DataFrame, demographics: pd.DataFrame,
+                                   attributes: Optional[List[str]] = None, max_order: int = 3,
+                                   min_support: int = 30) -> Dict:
+        """Detect bias across intersections of protected attributes (e.g. age band x gender x zip).
+
+        Rows are aggregated once into the sparse base cells of every attribute present.
+        Each attribute subset up to max_order is then rolled up from those cells rather
+        than from the rows. Cells with fewer than min_support scores are pruned, and since
+        a cell can never have more scores than any of its projections, base cells that fall
+        in a pruned lower-order cell are skipped when rolling up the higher orders.
+        """
+        merged_data = pd.merge(scores, demographics, on='user_id', how='inner')
+        attributes = [attribute for attribute in (attributes or self.protected_attributes)
+                      if attribute in merged_data.columns]
+        score_values = merged_data['yecs_score'].to_numpy(dtype=np.float64)
+        overall_mean = float(score_values.mean()) if len(score_values) else float('nan')
+
+        # Base cells: one dense id per distinct combination of all the attributes
+        attribute_codes = {}
+        attribute_groups = {}
+        cell_ids = np.zeros(len(merged_data), dtype=np.int64)
+        for attribute in attributes:
+            codes, groups = self._group_codes(self._banded(attribute, merged_data[attribute]))
+            attribute_codes[attribute], attribute_groups[attribute] = codes, groups
+            cell_ids, _ = pd.factorize(cell_ids * (len(groups) + 1) + codes)
+        num_cells = int(cell_ids.max()) + 1 if len(cell_ids) else 0
+
+        cell_counts = np.bincount(cell_ids, minlength=num_cells)
+        cell_sums = np.bincount(cell_ids, weights=score_values, minlength=num_cells)
+        cell_sums_sq = np.bincount(cell_ids, weights=score_values ** 2, minlength=num_cells)
+        cell_attribute_codes = {}
+        for attribute, codes in attribute_codes.items():
+            cell_attribute_codes[attribute] = np.empty(num_cells, dtype=np.int64)
+            cell_attribute_codes[attribute][cell_ids] = codes
+
+        intersections = {}
+        supported = {}
+        for order in range(1, min(max_order, len(attributes)) + 1):
+            for subset in combinations(attributes, order):
+                # Base cells with a value for every attribute in the subset...
+                active = np.ones(num_cells, dtype=bool)
+                for attribute in subset:
+                    active &= cell_attribute_codes[attribute] < len(attribute_groups[attribute])
+                # ...and not inside a lower-order cell that was already pruned
+                for parent in combinations(subset, order - 1):
+                    if parent in supported:
+                        active &= supported[parent]
+
+                subset_ids = np.zeros(num_cells, dtype=np.int64)
+                for attribute in subset:
+                    subset_ids = subset_ids * (len(attribute_groups[attribute]) + 1) + cell_attribute_codes[attribute]
+                subset_ids, representatives = self._dense_ids(subset_ids, active)
+                num_subset_cells = len(representatives)
+                counts = np.bincount(subset_ids[active], weights=cell_counts[active], minlength=num_subset_cells)
+                sums = np.bincount(subset_ids[active], weights=cell_sums[active], minlength=num_subset_cells)
+                sums_sq = np.bincount(subset_ids[active], weights=cell_sums_sq[active], minlength=num_subset_cells)
+
+                keep = counts >= min_support
+                supported[subset] = active & keep[subset_ids] if len(keep) else active
+                intersections[' x '.join(subset)] = self._intersection_cells(
+                    subset, attribute_groups, cell_attribute_codes, representatives,
+                    counts, sums, sums_sq, keep, overall_mean
+                )
+
+        biased_cells = sorted(
+            (dict(cell, intersection=name) for name, result in intersections.items()
+             for cell in result['cells'] if cell['bias_detected']),
+            key=lambda cell: abs(cell['ratio'] - 1.0), reverse=True
+        )
+
+        return {
+            'attributes': attributes,
+            'overall_mean': overall_mean,
+            'min_support': min_support,
+            'max_order': max_order,
+            'intersections': intersections,
+            'biased_cells': biased_cells,
+            'bias_detected': len(biased_cells) > 0
+        }
+
+    def _banded(self, attribute: str, values: pd.Series) -> pd.Series:
+        """Values of an attribute as intersection groups, banding continuous attributes"""
+        if attribute not in self.intersection_bands:
+            return values
+        edges = self.intersection_bands[attribute]
+        labels = [f'<{edges[0]}'] + [f'{low}-{high - 1}' for low, high in zip(edges, edges[1:])] + [f'{edges[-1]}+']
+        return pd.cut(values, [-np.inf] + edges + [np.inf], right=False, labels=labels)
+
+    @staticmethod
+    def _dense_ids(ids: np.ndarray, active: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Renumber the active ids densely; returns the new ids and a representative cell per id"""
+        dense = np.zeros(len(ids), dtype=np.int64)
+        active_cells = np.flatnonzero(active)
+        inverse, uniques = pd.factorize(ids[active_cells])
+        dense[active_cells] = inverse
+        representatives = np.empty(len(uniques), dtype=np.int64)
+        representatives[inverse] = active_cells
+        return dense, representatives
+
+    def _intersection_cells(self, subset, attribute_groups, cell_attribute_codes, representatives,
+                            counts, sums, sums_sq, keep, overall_mean) -> Dict:
+        kept = np.flatnonzero(keep)
+        counts, sums, sums_sq = counts[kept], sums[kept], sums_sq[kept]
+        means = sums / counts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stds = np.sqrt(np.maximum(sums_sq - sums * means, 0.0) / (counts - 1))
+            ratios = means / overall_mean if overall_mean > 0 else np.full(len(kept), np.nan)
+        flagged = np.abs(ratios - 1.0) > self.bias_threshold
+
+        group_labels = [
+            [attribute_groups[attribute][code] for code in cell_attribute_codes[attribute][representatives[kept]]]
+            for attribute in subset
+        ]
+        cells = [
+            {
+                'groups': dict(zip(subset, labels)),
+                'count': count,
+                'mean': mean,
+                'std': std,
+                'ratio': ratio,
+                'bias_detected': bias_detected
+            }
+            for labels, count, mean, std, ratio, bias_detected in zip(
+                zip(*group_labels), counts.astype(np.int64).tolist(), means.tolist(),
+                [_sample_std(count, std) for count, std in zip(counts, stds)],
+                ratios.tolist(), flagged.tolist()
+            )
+        ]
+
+        return {
+            'cells': cells,
+            'pruned_cells': int(len(keep) - len(kept))
+        }
+
+    def generate_intersectional_report(self, results: Dict) -> str:
+        """Generate a report of the intersections flagged by detect_intersectional_bias"""
+        report = "# YECS Intersectional Bias Report\n\n"
+        report += f"Attributes: {', '.join(results['attributes'])}\n"
+        report += f"Overall Mean Score: {results['overall_mean']:.2f}\n"
+        report += f"Minimum cell size: {results['min_support']}\n\n"
+
+        if not results['bias_detected']:
+            report += "✅ No significant bias detected in any intersection\n"
+            return report
+
+        report += "⚠️ **BIAS DETECTED** ⚠️\n\n"
+        for cell in results['biased_cells']:
+            groups = ', '.join(f"{attribute}={group}" for attribute, group in cell['groups'].items())
+            report += f"- {groups}: Ratio {cell['ratio']:.3f}, Mean Score {cell['mean']:.2f}, "
+            report += f"Sample Size {cell['count']}\n"
+
+        return report
+
     def generate_bias_report(self, bias_results: Dict) -> str:
         """Generate a comprehensive bias report"""
         report = "# YECS Bias Detection Report\n\n"
@@ -161,23 +570,36 @@ class BiasDetector:
                 report += "⚠️ **BIAS DETECTED** ⚠️\n\n"
                 report += "Potentially biased groups:\n"
                 for group in results['biased_groups']:
-                    report += f"- {group['group']}: Ratio {group['ratio']:.3f}, "
+                    low, high = group['ratio_interval']
+                    report += f"- {group['group']}: Ratio {group['ratio']:.3f} "
+                    report += f"({results['confidence_level']:.0%} CI {low:.3f}-{high:.3f}), "
                     report += f"Mean Score {group['mean_score']:.2f}, "
                     report += f"Sample Size {group['sample_size']}\n"
             else:
                 report += "✅ No significant bias detected\n"
 
+            if results.get('inconclusive_groups'):
+                report += f"\n{len(results['inconclusive_groups'])} group(s) beyond the threshold whose "
+                report += "confidence interval includes parity (too few samples to tell)\n"
+
             report += "\n"
 
         return report
 
     def apply_bias_mitigation(self, scores: pd.DataFrame, demographics: pd.DataFrame,
                               method: str = 'equalized_odds') -> pd.DataFrame:
-        """Apply bias mitigation techniques"""
+        """Apply bias mitigation techniques.
+
+        'demographic_parity' boosts groups below the overall approval rate by a fixed
+        20 points; 'demographic_parity_threshold' instead gives each group the offset
+        that brings its approval rate to the overall rate.
+        """
         if method == 'equalized_odds':
             return self._apply_equalized_odds_mitigation(scores, demographics)
         elif method == 'demographic_parity':
             return self._apply_demographic_parity_mitigation(scores, demographics)
+        elif method == 'demographic_parity_threshold':
+            return self._apply_demographic_parity_mitigation(scores, demographics, threshold_search=True)
         else:
             raise ValueError(f"Unknown bias mitigation method: {method}")
 
@@ -186,52 +608,66 @@ class BiasDetector:
         """Apply equalized odds bias mitigation"""
         # Merge data
         merged_data = pd.merge(scores, demographics, on='user_id', how='inner')
+        adjusted = merged_data['yecs_score'].to_numpy(dtype=np.float64, copy=True)
 
         # For each protected attribute, adjust scores to achieve equalized odds
         for attribute in self.protected_attributes:
             if attribute in merged_data.columns:
-                # Calculate group-specific adjustments
-                groups = merged_data.groupby(attribute)
-                overall_mean = merged_data['yecs_score'].mean()
-
-                for group_name, group_data in groups:
-                    group_mean = group_data['yecs_score'].mean()
-                    adjustment = (overall_mean - group_mean) * 0.1  # 10% adjustment
+                codes, groups = self._group_codes(merged_data[attribute])
+                counts = self._group_sums(codes, len(groups))
+                group_means = self._group_sums(codes, len(groups), adjusted) / np.maximum(counts, 1)
 
-                    # Apply adjustment
-                    mask = merged_data[attribute] == group_name
-                    merged_data.loc[mask, 'yecs_score'] += adjustment
+                # Move each group 10% of the way to the overall mean, all groups in one add
+                offsets = (adjusted.mean() - group_means) * 0.1
+                adjusted += np.append(offsets, 0.0)[codes]
 
-        # Ensure scores remain within valid range
-        merged_data['yecs_score'] = merged_data['yecs_score'].clip(300, 850)
-
-        return merged_data[['user_id', 'yecs_score']]
+        return self._mitigated_scores(merged_data, adjusted)
 
-    def _apply_demographic_parity_mitigation(self, scores: pd.DataFrame,
-                                             demographics: pd.DataFrame) -> pd.DataFrame:
+    def _apply_demographic_parity_mitigation(self, scores: pd.DataFrame, demographics: pd.DataFrame,
+                                             threshold_search: bool = False) -> pd.DataFrame:
         """Apply demographic parity bias mitigation"""
-        # Similar implementation to equalized odds but with different adjustment logic
         merged_data = pd.merge(scores, demographics, on='user_id', how='inner')
+        adjusted = merged_data['yecs_score'].to_numpy(dtype=np.float64, copy=True)
 
         # Apply adjustments to achieve demographic parity
         for attribute in self.protected_attributes:
             if attribute in merged_data.columns:
-                # Calculate adjustments to equalize approval rates
-                groups = merged_data.groupby(attribute)
-
-                # Calculate overall approval rate (assuming 650+ is approved)
-                overall_approval_rate = (merged_data['yecs_score'] >= 650).mean()
-
-                for group_name, group_data in groups:
-                    group_approval_rate = (group_data['yecs_score'] >= 650).mean()
-
-                    if group_approval_rate < overall_approval_rate:
-                        # Boost scores for underrepresented groups
-                        adjustment = 20  # Fixed adjustment
-                        mask = merged_data[attribute] == group_name
-                        merged_data.loc[mask, 'yecs_score'] += adjustment
-
+                codes, groups = self._group_codes(merged_data[attribute])
+                approved = adjusted >= self.approval_threshold
+                overall_approval_rate = approved.mean()
+
+                if threshold_search:
+                    offsets = self._parity_offsets(codes, len(groups), adjusted, overall_approval_rate)
+                else:
+                    # Boost scores for groups approved less often than overall by a fixed amount
+                    counts = self._group_sums(codes, len(groups))
+                    approval_rates = self._group_sums(codes, len(groups), approved.astype(np.float64)) / counts
+                    offsets = np.where(approval_rates < overall_approval_rate, 20.0, 0.0)
+
+                adjusted += np.append(offsets, 0.0)[codes]
+
+        return self._mitigated_scores(merged_data, adjusted)
+
+    def _parity_offsets(self, codes: np.ndarray, num_groups: int, scores: np.ndarray,
+                        target_rate: float) -> np.ndarray:
+        """Per-group score offsets that bring each group's approval rate to target_rate.
+
+        Sorts scores within groups once; a group of n needs its k-th highest score,
+        k = round(target_rate * n), to land exactly on the approval threshold. Ties
+        at that score are all approved. Groups with k = 0 are left unchanged.
+        """
+        counts = self._group_sums(codes, num_groups)
+        sorted_scores = scores[np.lexsort((scores, codes))]
+        group_ends = np.cumsum(counts)
+
+        approvals_needed = np.rint(target_rate * counts).astype(np.int64)
+        kth_highest = sorted_scores[group_ends - np.maximum(approvals_needed, 1)]
+        return np.where(approvals_needed > 0, self.approval_threshold - kth_highest, 0.0)
+
+    @staticmethod
+    def _mitigated_scores(merged_data: pd.DataFrame, adjusted: np.ndarray) -> pd.DataFrame:
         # Ensure scores remain within valid range
-        merged_data['yecs_score'] = merged_data['yecs_score'].clip(300, 850)
-
-        return merged_data[['user_id', 'yecs_score']]
+        return pd.DataFrame({
+            'user_id': merged_data['user_id'].to_numpy(),
+            'yecs_score': np.clip(adjusted, 300, 850)
+        }, index=merged_data.index)
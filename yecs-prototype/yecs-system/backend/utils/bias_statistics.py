@@ -0,0 +1,128 @@
+from sqlalchemy import select, delete, insert, func
+from typing import Dict, Iterable, Tuple
+from datetime import datetime
+
+from database.database import db, User, CreditScore, BiasGroupStatistic, upsert_add
+
+# Demographic attributes read from the User table
+DEMOGRAPHIC_COLUMNS = {
+    'age': User.age
+}
+
+# Demographic attributes not collected yet; every user falls in a single group
+CONSTANT_DEMOGRAPHICS = {
+    'gender': 'unknown',
+    'zip_code': 'unknown'
+}
+
+
+def user_demographics(user) -> Dict:
+    """Demographic attributes of a user (or any row with the User columns)"""
+    demographics = {attribute: getattr(user, column.key) for attribute, column in DEMOGRAPHIC_COLUMNS.items()}
+    demographics.update(CONSTANT_DEMOGRAPHICS)
+    return demographics
+
+
+def merge_aggregates(left: Dict, right: Dict) -> Dict:
+    """Merge two count/sum/sum_sq aggregates"""
+    return {
+        'count': left['count'] + right['count'],
+        'sum': left['sum'] + right['sum'],
+        'sum_sq': left['sum_sq'] + right['sum_sq']
+    }
+
+
+class BiasStatisticsStore:
+    """Per-group running yecs_score aggregates backing the incremental bias analysis.
+
+    Each (attribute, group) keeps count, sum and sum of squares of the scores written
+    for users in that group. Aggregates are mergeable, so writers only add deltas and
+    readers never scan CreditScore.
+    """
+
+    def record_scores(self, scored_users: Iterable[Tuple[Dict, int]]):
+        """Add (demographics, yecs_score) pairs to the store.
+
+        Runs in the caller's transaction so the statistics commit together with the
+        CreditScore rows they describe.
+        """
+        deltas = {}
+        for demographics, score in scored_users:
+            score = int(score)
+            delta = {'count': 1, 'sum': score, 'sum_sq': score * score}
+            for attribute, group in demographics.items():
+                key = (attribute, str(group))
+                deltas[key] = merge_aggregates(deltas[key], delta) if key in deltas else delta
+
+        if not deltas:
+            return
+
+        now = datetime.utcnow()
+        # Sorted so concurrent writers lock the rows in the same order
+        rows = [
+            self._row(attribute, group, delta['count'], delta['sum'], delta['sum_sq'], now)
+            for (attribute, group), delta in sorted(deltas.items())
+        ]
+        # An upsert, so two workers adding the first score of a new group both succeed
+        upsert_add(BiasGroupStatistic, rows, key_columns=['attribute', 'group_value'],
+                   added_columns=['count', 'score_sum', 'score_sum_sq'])
+
+    def load_aggregates(self) -> Dict:
+        """Return {attribute: {group: {'count', 'sum', 'sum_sq'}}} for every stored group"""
+        aggregates = {}
+        for row in db.session.execute(select(BiasGroupStatistic.__table__)):
+            aggregates.setdefault(row.attribute, {})[row.group_value] = {
+                'count': row.count,
+                'sum': row.score_sum,
+                'sum_sq': row.score_sum_sq
+            }
+        return aggregates
+
+    def needs_rebuild(self) -> bool:
+        """Whether the aggregates don't cover exactly the stored scores, e.g. scores written before the table existed"""
+        # Every score is counted once per attribute, so one attribute's groups add up to the score count
+        attribute = next(iter(DEMOGRAPHIC_COLUMNS))
+        stored_count = select(func.coalesce(func.sum(BiasGroupStatistic.count), 0)) \
+            .where(BiasGroupStatistic.attribute == attribute).scalar_subquery()
+        score_count = select(func.count(CreditScore.id)).join(User, CreditScore.user_id == User.id).scalar_subquery()
+        # One statement, so both counts come from the same snapshot
+        stored, actual = db.session.execute(select(stored_count, score_count)).one()
+        return stored != actual
+
+    def rebuild(self):
+        """Recompute every aggregate from the CreditScore table with grouped SQL queries"""
+        db.session.execute(delete(BiasGroupStatistic))
+
+        aggregate_columns = (
+            func.count(CreditScore.id),
+            func.sum(CreditScore.yecs_score),
+            func.sum(CreditScore.yecs_score * CreditScore.yecs_score)
+        )
+        now = datetime.utcnow()
+        rows = []
+
+        for attribute, column in DEMOGRAPHIC_COLUMNS.items():
+            query = select(column, *aggregate_columns).join(User, CreditScore.user_id == User.id).group_by(column)
+            for group, count, score_sum, score_sum_sq in db.session.execute(query):
+                rows.append(self._row(attribute, group, count, score_sum, score_sum_sq, now))
+
+        count, score_sum, score_sum_sq = db.session.execute(
+            select(*aggregate_columns).join(User, CreditScore.user_id == User.id)
+        ).one()
+        if count:
+            for attribute, group in CONSTANT_DEMOGRAPHICS.items():
+                rows.append(self._row(attribute, group, count, score_sum, score_sum_sq, now))
+
+        if rows:
+            db.session.execute(insert(BiasGroupStatistic), rows)
+
+    @staticmethod
+    def _row(attribute, group, count, score_sum, score_sum_sq, now):
+        return {
+            'attribute': attribute,
+            'group_value': str(group),
+            'count': count,
+            'score_sum': score_sum,
+            'score_sum_sq': score_sum_sq,
+            'updated_at': now
+        }
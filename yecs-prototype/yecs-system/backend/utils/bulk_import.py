@@ -0,0 +1,184 @@
+from sqlalchemy import select, insert
+from typing import Dict, List
+import pandas as pd
+import logging
+
+from database.database import db, User, BusinessProfile, FinancialData
+
+# Applicant columns and the defaults the single-record endpoints use
+USER_COLUMNS = ['email', 'first_name', 'last_name', 'age']
+
+BUSINESS_PROFILE_COLUMNS = {
+    'business_name': '',
+    'industry': '',
+    'business_plan_quality': 0.0,
+    'revenue_projection': 0.0,
+    'years_of_experience': 0,
+    'education_level': ''
+}
+
+FINANCIAL_DATA_COLUMNS = {
+    'monthly_income': 0.0,
+    'monthly_expenses': 0.0,
+    'savings_amount': 0.0,
+    'debt_amount': 0.0,
+    'utility_payment_score': 0.0,
+    'rent_payment_score': 0.0
+}
+
+INTEGER_COLUMNS = ['age', 'years_of_experience']
+FLOAT_COLUMNS = [column for column, default in {**BUSINESS_PROFILE_COLUMNS, **FINANCIAL_DATA_COLUMNS}.items()
+                 if isinstance(default, float)]
+
+
+def _blank_to_none(value):
+    return None if isinstance(value, str) and not value.strip() else value
+
+
+class BulkImporter:
+    """Import applicant rows (user, business profile and financial data) in chunks.
+
+    Each input row carries the user fields plus, optionally, the business profile
+    and financial data fields as flat columns. Rows are validated as whole columns,
+    existing emails are found with one IN query per chunk and each chunk is written
+    with three executemany inserts and a single commit. Invalid rows are reported
+    per row and never abort the rest of the batch.
+    """
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def frame_from_records(records: List[Dict]) -> pd.DataFrame:
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError('Applicants must be a list of objects')
+        return pd.DataFrame.from_records(records)
+
+    @staticmethod
+    def frame_from_csv(stream) -> pd.DataFrame:
+        return pd.read_csv(stream, dtype=str, keep_default_na=False)
+
+    def validate(self, frame: pd.DataFrame):
+        """Split a frame into valid rows and a list of per-row errors"""
+        missing_columns = [column for column in USER_COLUMNS if column not in frame.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required column: {missing_columns[0]}")
+
+        # Blank strings count as missing, so CSV and JSON input validate the same way
+        frame = frame.astype(object)
+        for column in frame.columns:
+            frame[column] = frame[column].map(_blank_to_none)
+
+        errors = pd.Series(None, index=frame.index, dtype=object)
+
+        def flag(mask, message):
+            errors[mask & errors.isna()] = message
+
+        for column in USER_COLUMNS:
+            flag(frame[column].isna(), f'Missing required field: {column}')
+
+        for column in INTEGER_COLUMNS + FLOAT_COLUMNS:
+            if column not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[column], errors='coerce')
+            invalid = frame[column].notna() & values.isna()
+            if column in INTEGER_COLUMNS:
+                invalid |= values.notna() & (values % 1 != 0)
+            flag(invalid, f'Invalid value for {column}')
+            frame[column] = values
+
+        frame['email'] = frame['email'].map(lambda email: str(email).strip() if pd.notna(email) else None)
+        flag(frame['email'].duplicated(keep='first') & frame['email'].notna(), 'Duplicate email in batch')
+
+        invalid = errors.notna()
+        row_errors = [
+            {'row': int(row), 'email': frame.at[row, 'email'], 'error': errors[row]}
+            for row in frame.index[invalid]
+        ]
+        return frame[~invalid], row_errors
+
+    def import_frame(self, frame: pd.DataFrame) -> Dict:
+        """Validate and insert every row, returning the created users and per-row errors"""
+        valid, errors = self.validate(frame)
+        created = []
+
+        for start in range(0, len(valid), self.chunk_size):
+            chunk = valid.iloc[start:start + self.chunk_size]
+
+            existing = set(db.session.execute(
+                select(User.email).where(User.email.in_(chunk['email'].tolist()))
+            ).scalars())
+            is_duplicate = chunk['email'].isin(existing)
+            errors.extend(
+                {'row': int(row), 'email': email, 'error': 'User with this email already exists'}
+                for row, email in chunk.loc[is_duplicate, 'email'].items()
+            )
+
+            rows = self._applicant_rows(chunk[~is_duplicate])
+            try:
+                created.extend(self._insert_applicants(rows))
+            except Exception as e:
+                # Retry row by row so one bad row only fails itself
+                db.session.rollback()
+                logging.error(f"Bulk import chunk failed, retrying row by row: {str(e)}")
+                for row in rows:
+                    try:
+                        created.extend(self._insert_applicants([row]))
+                    except Exception as row_error:
+                        db.session.rollback()
+                        errors.append({'row': row['row'], 'email': row['user']['email'], 'error': str(row_error)})
+
+        errors.sort(key=lambda error: error['row'])
+        return {
+            'created': len(created),
+            'failed': len(errors),
+            'users': created,
+            'errors': errors
+        }
+
+    @staticmethod
+    def _applicant_rows(chunk: pd.DataFrame) -> List[Dict]:
+        """Insert mappings for each row; profiles only when the row has any of their fields"""
+        def section(record, columns):
+            present = {column: record[column] for column in columns if pd.notna(record.get(column))}
+            if not present:
+                return None
+            return {column: type(default)(present[column]) if column in present else default
+                    for column, default in columns.items()}
+
+        rows = []
+        for row, record in zip(chunk.index, chunk.to_dict('records')):
+            rows.append({
+                'row': int(row),
+                'user': {
+                    'email': record['email'],
+                    'first_name': str(record['first_name']),
+                    'last_name': str(record['last_name']),
+                    'age': int(record['age'])
+                },
+                'business_profile': section(record, BUSINESS_PROFILE_COLUMNS),
+                'financial_data': section(record, FINANCIAL_DATA_COLUMNS)
+            })
+        return rows
+
+    @staticmethod
+    def _insert_applicants(rows: List[Dict]) -> List[Dict]:
+        if not rows:
+            return []
+
+        db.session.execute(insert(User), [row['user'] for row in rows])
+        emails = [row['user']['email'] for row in rows]
+        user_ids = dict(db.session.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+
+        business_profiles = [dict(row['business_profile'], user_id=user_ids[row['user']['email']])
+                             for row in rows if row['business_profile'] is not None]
+        financial_rows = [dict(row['financial_data'], user_id=user_ids[row['user']['email']])
+                          for row in rows if row['financial_data'] is not None]
+        if business_profiles:
+            db.session.execute(insert(BusinessProfile), business_profiles)
+        if financial_rows:
+            db.session.execute(insert(FinancialData), financial_rows)
+        db.session.commit()
+
+        return [{'row': row['row'], 'user_id': user_ids[row['user']['email']], 'email': row['user']['email']}
+                for row in rows]
@@ -5,6 +5,9 @@ from sklearn.model_selection import train_test_split
 import joblib
 import os
 
+LOAN_CATEGORICAL_COLUMNS = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
+STUDENT_CATEGORICAL_COLUMNS = ['gender', 'year_in_school', 'major', 'preferred_payment_method']
+
 
 class DatasetProcessor:
     def __init__(self):
@@ -13,50 +16,116 @@ class DatasetProcessor:
 
     def process_loan_data(self, file_path):
         """Process the loan approval dataset"""
-        df = pd.read_csv(file_path)
+        df = self._clean_loan_chunk(pd.read_csv(file_path))
+
+        # Encode categorical variables
+        self._fit_label_encoders(
+            {col: df[col].astype(str).unique() for col in LOAN_CATEGORICAL_COLUMNS if col in df.columns}
+        )
+
+        return self._encode_loan_chunk(df)
+
+    def process_student_data(self, file_path):
+        """Process the student spending dataset"""
+        df = self._derive_student_columns(pd.read_csv(file_path))
 
+        # Encode categorical variables
+        self._fit_label_encoders(
+            {col: df[col].astype(str).unique() for col in STUDENT_CATEGORICAL_COLUMNS if col in df.columns}
+        )
+
+        return self._encode_categoricals(df, STUDENT_CATEGORICAL_COLUMNS)
+
+    def _clean_loan_chunk(self, df):
+        """Clean column names and fill missing numeric values of a loan data frame"""
         # Clean column names
         df.columns = df.columns.str.strip()
 
         # Handle missing values
-        df = df.fillna(df.median() if df.select_dtypes(include=[np.number]).columns.tolist() else df.mode().iloc[0])
+        return df.fillna(df.median(numeric_only=True))
 
-        # Encode categorical variables
-        categorical_cols = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
-        for col in categorical_cols:
-            if col in df.columns:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
-                self.label_encoders[col] = le
+    def _encode_loan_chunk(self, df):
+        """Encode categoricals and the target of a cleaned loan data frame"""
+        df = self._encode_categoricals(df, LOAN_CATEGORICAL_COLUMNS)
 
         # Convert target variable
         if 'Loan_Status' in df.columns:
-            df['Loan_Status'] = df['Loan_Status'].map({'Y': 1, 'N': 0})
+            df['Loan_Status'] = df['Loan_Status'].astype(str).str.strip().map({'Y': 1, 'N': 0})
         elif 'loan_status' in df.columns:
-            df['loan_status'] = df['loan_status'].map({'Approved': 1, 'Rejected': 0})
+            df['loan_status'] = df['loan_status'].astype(str).str.strip().map({'Approved': 1, 'Rejected': 0})
 
         return df
 
-    def process_student_data(self, file_path):
-        """Process the student spending dataset"""
-        df = pd.read_csv(file_path)
-
-        # Create financial responsibility score
+    def _derive_student_columns(self, df):
+        """Create financial responsibility columns for a student spending data frame"""
         df['savings_rate'] = (df['monthly_income'] - df['food'] - df['housing'] - df['transportation']) / df[
             'monthly_income']
         df['debt_to_income'] = df['tuition'] / (df['monthly_income'] * 12)
         df['financial_score'] = np.where(df['savings_rate'] > 0.1, 1, 0)
 
-        # Encode categorical variables
-        categorical_cols = ['gender', 'year_in_school', 'major', 'preferred_payment_method']
+        return df
+
+    def _fit_label_encoders(self, column_values):
+        """Fit one LabelEncoder per column from its distinct values"""
+        for col, values in column_values.items():
+            le = LabelEncoder()
+            le.fit(np.asarray(values, dtype=str))
+            self.label_encoders[col] = le
+
+    def _encode_categoricals(self, df, categorical_cols):
+        """Encode categorical columns with the already fitted label encoders"""
         for col in categorical_cols:
             if col in df.columns:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
-                self.label_encoders[col] = le
+                df[col] = self.label_encoders[col].transform(df[col].astype(str))
 
         return df
 
+    @staticmethod
+    def _column(df, col):
+        """Column as float array, or zeros when the dataset doesn't have it"""
+        if col in df.columns:
+            return df[col].to_numpy(dtype=np.float64)
+        return np.zeros(len(df))
+
+    def _loan_training_rows(self, loan_df):
+        """Vectorized feature vectors and synthetic YECS scores for processed loan rows"""
+        features = np.column_stack([
+            self._column(loan_df, 'ApplicantIncome') / 10000,  # Income (normalized)
+            self._column(loan_df, 'LoanAmount') / 1000,  # Loan amount (normalized)
+            self._column(loan_df, 'Education'),  # Education level
+            self._column(loan_df, 'Self_Employed'),  # Self employment
+            self._column(loan_df, 'Credit_History'),  # Credit history
+            self._column(loan_df, 'Property_Area'),  # Property area
+        ])
+
+        # Calculate synthetic YECS score (300-850 range); approved loans score higher
+        approved = self._column(loan_df, 'Loan_Status') == 1
+        base_score = 300
+        scores = base_score + np.random.normal(np.where(approved, 400, 250), np.where(approved, 100, 80))
+        scores = np.clip(scores, 300, 850)
+
+        return features, scores
+
+    def _student_training_rows(self, student_df):
+        """Vectorized feature vectors and synthetic YECS scores for processed student rows"""
+        features = np.column_stack([
+            self._column(student_df, 'monthly_income') / 100,  # Income (normalized)
+            self._column(student_df, 'tuition') / 1000,  # Education cost
+            self._column(student_df, 'major'),  # Major
+            self._column(student_df, 'year_in_school'),  # Year in school
+            self._column(student_df, 'financial_score'),  # Financial responsibility
+            self._column(student_df, 'savings_rate'),  # Savings rate
+        ])
+
+        # Calculate synthetic YECS score based on financial behavior
+        base_score = 300
+        financial_factor = self._column(student_df, 'savings_rate') * 200 + \
+            self._column(student_df, 'financial_score') * 100
+        scores = base_score + financial_factor + np.random.normal(0, 50, size=len(student_df))
+        scores = np.clip(scores, 300, 850)
+
+        return features, scores
+
     def create_training_dataset(self, loan_data, student_data):
         """Combine datasets for YECS training"""
         # Process loan data
@@ -66,53 +135,76 @@ class DatasetProcessor:
         student_df = self.process_student_data(student_data)
 
         # Create synthetic YECS scores for training
-        features = []
-        scores = []
-
-        # Extract features from loan data
-        for _, row in loan_df.iterrows():
-            feature_vector = [
-                row.get('ApplicantIncome', 0) / 10000,  # Income (normalized)
-                row.get('LoanAmount', 0) / 1000,  # Loan amount (normalized)
-                row.get('Education', 0),  # Education level
-                row.get('Self_Employed', 0),  # Self employment
-                row.get('Credit_History', 0),  # Credit history
-                row.get('Property_Area', 0),  # Property area
-            ]
-
-            # Calculate synthetic YECS score (300-850 range)
-            base_score = 300
-            if row.get('Loan_Status', 0) == 1:  # Approved
-                score = base_score + np.random.normal(400, 100)
-            else:  # Rejected
-                score = base_score + np.random.normal(250, 80)
-
-            score = np.clip(score, 300, 850)
-
-            features.append(feature_vector)
-            scores.append(score)
-
-        # Add student data features
-        for _, row in student_df.iterrows():
-            feature_vector = [
-                row.get('monthly_income', 0) / 100,  # Income (normalized)
-                row.get('tuition', 0) / 1000,  # Education cost
-                row.get('major', 0),  # Major
-                row.get('year_in_school', 0),  # Year in school
-                row.get('financial_score', 0),  # Financial responsibility
-                row.get('savings_rate', 0),  # Savings rate
-            ]
-
-            # Calculate synthetic YECS score based on financial behavior
-            base_score = 300
-            financial_factor = row.get('savings_rate', 0) * 200 + row.get('financial_score', 0) * 100
-            score = base_score + financial_factor + np.random.normal(0, 50)
-            score = np.clip(score, 300, 850)
-
-            features.append(feature_vector)
-            scores.append(score)
-
-        return np.array(features), np.array(scores)
+        loan_features, loan_scores = self._loan_training_rows(loan_df)
+        student_features, student_scores = self._student_training_rows(student_df)
+
+        return np.vstack([loan_features, student_features]), np.concatenate([loan_scores, student_scores])
+
+    def create_training_dataset_streaming(self, loan_data, student_data, output_dir, chunk_size=100000,
+                                          progress=None):
+        """Build the training dataset chunk by chunk straight into features.npy/scores.npy.
+
+        A first pass collects row counts and categorical values so the label encoders
+        match the in-memory path; the second pass processes one chunk at a time and
+        writes it into memory-mapped output arrays. Peak memory depends on chunk_size,
+        not on the input size. Missing numeric values are filled with the chunk median.
+        progress, if given, is called with the fraction of rows written after each chunk.
+        Returns the paths of the features and scores files.
+        """
+        loan_rows, loan_values = self._scan_csv(loan_data, LOAN_CATEGORICAL_COLUMNS, chunk_size)
+        student_rows, student_values = self._scan_csv(student_data, STUDENT_CATEGORICAL_COLUMNS, chunk_size)
+        self._fit_label_encoders(loan_values)
+        self._fit_label_encoders(student_values)
+
+        os.makedirs(output_dir, exist_ok=True)
+        features_path = os.path.join(output_dir, 'features.npy')
+        scores_path = os.path.join(output_dir, 'scores.npy')
+
+        total_rows = loan_rows + student_rows
+        features = np.lib.format.open_memmap(features_path, mode='w+', dtype=np.float64, shape=(total_rows, 6))
+        scores = np.lib.format.open_memmap(scores_path, mode='w+', dtype=np.float64, shape=(total_rows,))
+
+        offset = 0
+        for chunk in pd.read_csv(loan_data, chunksize=chunk_size):
+            chunk = self._encode_loan_chunk(self._clean_loan_chunk(chunk))
+            offset = self._write_rows(features, scores, offset, *self._loan_training_rows(chunk))
+            if progress:
+                progress(offset / total_rows)
+
+        for chunk in pd.read_csv(student_data, chunksize=chunk_size):
+            chunk = self._encode_categoricals(self._derive_student_columns(chunk), STUDENT_CATEGORICAL_COLUMNS)
+            offset = self._write_rows(features, scores, offset, *self._student_training_rows(chunk))
+            if progress:
+                progress(offset / total_rows)
+
+        features.flush()
+        scores.flush()
+        del features, scores
+
+        joblib.dump(self.label_encoders, os.path.join(output_dir, 'label_encoders.pkl'))
+
+        return features_path, scores_path
+
+    @staticmethod
+    def _scan_csv(file_path, categorical_cols, chunk_size):
+        """Count rows and collect distinct categorical values of a CSV without loading it whole"""
+        row_count = 0
+        column_values = {}
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            chunk.columns = chunk.columns.str.strip()
+            row_count += len(chunk)
+            for col in categorical_cols:
+                if col in chunk.columns:
+                    column_values.setdefault(col, set()).update(chunk[col].astype(str).unique())
+
+        return row_count, {col: sorted(values) for col, values in column_values.items()}
+
+    @staticmethod
+    def _write_rows(features, scores, offset, chunk_features, chunk_scores):
+        end = offset + len(chunk_scores)
+        features[offset:end] = chunk_features
+        scores[offset:end] = chunk_scores
+        return end
 
     def save_processed_data(self, features, scores, output_dir):
         """Save processed data for training"""
@@ -0,0 +1,248 @@
+from sqlalchemy import select, update
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import multiprocessing
+import logging
+import signal
+import socket
+import json
+import time
+import os
+
+from database.database import db, Job
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed', 'cancelled')
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised from JobContext.progress when the job has been cancelled"""
+
+
+class JobContext:
+    """What a job handler gets: its parameters, and progress reporting that notices cancellation"""
+
+    def __init__(self, job_id: int, params: Dict, min_interval: float = 1.0):
+        self.job_id = job_id
+        self.params = params
+        self.min_interval = min_interval
+        self._last_update = 0.0
+
+    def progress(self, fraction: float, message: Optional[str] = None):
+        """Record progress between 0 and 1; raises JobCancelled once cancellation is requested.
+
+        Updates closer together than min_interval are skipped unless they carry a message.
+        """
+        now = time.monotonic()
+        if message is None and now - self._last_update < self.min_interval:
+            return
+        self._last_update = now
+
+        values = {'progress': min(max(float(fraction), 0.0), 1.0), 'heartbeat_at': datetime.utcnow()}
+        if message is not None:
+            values['message'] = message[:200]
+        db.session.execute(update(Job).where(Job.id == self.job_id).values(**values))
+        cancel_requested = db.session.execute(select(Job.cancel_requested).where(Job.id == self.job_id)).scalar()
+        db.session.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+def job_summary(job: Job) -> Dict:
+    """JSON-ready status of a job, without its result"""
+    return {
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'params': json.loads(job.params or '{}'),
+        'progress': job.progress,
+        'message': job.message,
+        'error': job.error,
+        'cancel_requested': job.cancel_requested,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+class JobQueue:
+    """Database-backed queue of background jobs, run by worker processes.
+
+    API processes submit, poll and cancel jobs; `python job_worker.py` runs the
+    workers. A worker claims the oldest queued job with a conditional UPDATE, so
+    any number of workers can share the table, and runs it in a forked child
+    process while it keeps the job's heartbeat and watches for cancellation.
+    Handlers report progress through their JobContext, which also stops them at
+    the next report after a cancel; a child that doesn't stop within
+    cancel_grace seconds is terminated. Running jobs whose heartbeat is older
+    than stale_after seconds (their worker died) are marked failed.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, stale_after: float = 60.0, cancel_grace: float = 10.0):
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.cancel_grace = cancel_grace
+        self.handlers: Dict[str, Callable[[JobContext], Dict]] = {}
+        # Children inherit the loaded app and handlers; the worker is Unix-only, like gunicorn
+        self._process_context = multiprocessing.get_context('fork')
+
+    def register(self, kind: str, handler: Callable[[JobContext], Dict]):
+        """Run handler(context) for jobs of this kind; its return value is stored as the result"""
+        self.handlers[kind] = handler
+
+    def submit(self, kind: str, params: Optional[Dict] = None) -> Job:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if params is not None and not isinstance(params, dict):
+            raise ValueError("Job params must be an object")
+
+        job = Job(kind=kind, status='queued', params=json.dumps(params or {}), progress=0.0,
+                  cancel_requested=False, created_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return db.session.get(Job, job_id)
+
+    def list(self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """Most recent jobs first"""
+        query = select(Job).order_by(Job.id.desc()).limit(limit)
+        if status is not None:
+            query = query.where(Job.status == status)
+        if kind is not None:
+            query = query.where(Job.kind == kind)
+        return list(db.session.execute(query).scalars())
+
+    def cancel(self, job_id: int) -> Optional[Job]:
+        """Cancel a queued job at once, or ask its worker to stop a running one"""
+        now = datetime.utcnow()
+        db.session.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'queued')
+            .values(status='cancelled', cancel_requested=True, finished_at=now)
+        )
+        db.session.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'running').values(cancel_requested=True)
+        )
+        db.session.commit()
+        return self.get(job_id)
+
+    def claim(self, worker_id: str) -> Optional[int]:
+        """Mark the oldest queued job as running for this worker and return its id"""
+        while True:
+            job_id = db.session.execute(
+                select(Job.id).where(Job.status == 'queued').order_by(Job.id).limit(1)
+            ).scalar()
+            if job_id is None:
+                db.session.commit()
+                return None
+
+            now = datetime.utcnow()
+            result = db.session.execute(
+                update(Job).where(Job.id == job_id, Job.status == 'queued')
+                .values(status='running', worker_id=worker_id, started_at=now, heartbeat_at=now)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return job_id
+            # Another worker claimed it first; try the next one
+
+    def fail_stale_jobs(self) -> int:
+        """Mark running jobs whose worker stopped sending heartbeats as failed"""
+        now = datetime.utcnow()
+        result = db.session.execute(
+            update(Job).where(Job.status == 'running', Job.heartbeat_at < now - timedelta(seconds=self.stale_after))
+            .values(status='failed', error='Job worker stopped responding', finished_at=now)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def work(self, app, worker_id: Optional[str] = None, should_stop: Callable[[], bool] = lambda: False,
+             max_jobs: Optional[int] = None):
+        """Claim and run jobs one at a time until should_stop() returns True or max_jobs have run"""
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        jobs_run = 0
+        while not should_stop() and (max_jobs is None or jobs_run < max_jobs):
+            try:
+                with app.app_context():
+                    self.fail_stale_jobs()
+                    job_id = self.claim(worker_id)
+            except Exception as e:
+                logging.error(f"Error claiming a job: {str(e)}")
+                job_id = None
+
+            if job_id is None:
+                time.sleep(self.poll_interval)
+                continue
+
+            self._supervise(app, job_id)
+            jobs_run += 1
+
+    def _supervise(self, app, job_id: int):
+        """Run a claimed job in a child process, keeping its heartbeat until the child exits"""
+        process = self._process_context.Process(target=self._execute, args=(app, job_id))
+        process.start()
+
+        cancel_deadline = None
+        while True:
+            process.join(self.poll_interval)
+            if not process.is_alive():
+                break
+            try:
+                with app.app_context():
+                    cancel_requested = self._heartbeat(job_id)
+            except Exception as e:
+                logging.error(f"Error updating heartbeat of job {job_id}: {str(e)}")
+                continue
+
+            if cancel_requested:
+                if cancel_deadline is None:
+                    cancel_deadline = time.monotonic() + self.cancel_grace
+                elif time.monotonic() >= cancel_deadline:
+                    process.terminate()
+                    process.join()
+                    break
+
+        # The child records its own outcome; a job still running here was killed or crashed
+        with app.app_context():
+            job = self.get(job_id)
+            if job is not None and job.status == 'running':
+                if job.cancel_requested:
+                    self._finish(job_id, 'cancelled')
+                else:
+                    self._finish(job_id, 'failed', error=f'Job process exited with code {process.exitcode}')
+
+    def _heartbeat(self, job_id: int) -> bool:
+        """Refresh the job's heartbeat; returns whether it has been asked to cancel"""
+        db.session.execute(update(Job).where(Job.id == job_id).values(heartbeat_at=datetime.utcnow()))
+        cancel_requested = db.session.execute(select(Job.cancel_requested).where(Job.id == job_id)).scalar()
+        db.session.commit()
+        return bool(cancel_requested)
+
+    def _execute(self, app, job_id: int):
+        """Child process body: run the job's handler and store its result"""
+        # Stop only when the worker terminates the job, not on the worker's own shutdown signals
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        with app.app_context():
+            # Connections inherited from the worker belong to it; open new ones
+            db.engine.dispose(close=False)
+            job = self.get(job_id)
+            context = JobContext(job_id, json.loads(job.params or '{}'))
+            try:
+                result = self.handlers[job.kind](context)
+                self._finish(job_id, 'succeeded', result=app.json.dumps(result if result is not None else {}))
+            except JobCancelled:
+                db.session.rollback()
+                self._finish(job_id, 'cancelled')
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Job {job_id} ({job.kind}) failed: {str(e)}")
+                self._finish(job_id, 'failed', error=str(e))
+
+    def _finish(self, job_id: int, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        values = {'status': status, 'finished_at': datetime.utcnow(), 'result': result, 'error': error}
+        if status == 'succeeded':
+            values['progress'] = 1.0
+        db.session.execute(update(Job).where(Job.id == job_id, Job.status == 'running').values(**values))
+        db.session.commit()
@@ -0,0 +1,280 @@
+from sqlalchemy import select, update, insert, delete, func
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Iterable, Optional
+from datetime import datetime
+import threading
+import logging
+import random
+import json
+import time
+import numpy as np
+
+from database.database import db, CreditScore, ScoreSketch
+from utils.score_distribution import HISTOGRAM_METRICS
+
+# Metrics with a percentile sketch: yecs_score and the six component scores
+SKETCH_METRICS = HISTOGRAM_METRICS
+
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch.
+
+    Level h holds items of weight 2**h and has room for about k * (2/3)**depth
+    items. When the sketch is full, the lowest over-full level is sorted and every
+    other item moves up a level, so it keeps O(k) items however long the stream;
+    at k=200 percentile ranks are within about half a percentile point.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return int(np.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def num_items(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def update(self, value: float):
+        self.update_many([value])
+
+    def update_many(self, values: Iterable[float]):
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.float64).ravel()
+        start = 0
+        while start < len(values):
+            # Fill level 0 until the sketch is full, then compact, as one-at-a-time updates would
+            room = max(self._max_size() - self.num_items(), 1)
+            chunk = values[start:start + room]
+            self.levels[0].extend(chunk.tolist())
+            self.count += len(chunk)
+            start += len(chunk)
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Add another sketch's items into this one and return it"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        while self.num_items() >= self._max_size():
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                    items = sorted(self.levels[level])
+                    # An odd item out stays behind so total weight is preserved exactly
+                    keep = [items.pop(0)] if len(items) % 2 else []
+                    self.levels[level + 1].extend(items[self._random.randint(0, 1)::2])
+                    self.levels[level] = keep
+                    break
+
+    def sorted_view(self) -> 'SketchView':
+        items = np.concatenate([np.asarray(level, dtype=np.float64) for level in self.levels])
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.int64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return SketchView(items[order], np.cumsum(weights[order]))
+
+    def to_json(self) -> str:
+        return json.dumps({'k': self.k, 'count': self.count, 'levels': self.levels})
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'KLLSketch':
+        data = json.loads(payload)
+        sketch = cls(k=data['k'])
+        sketch.count = data['count']
+        sketch.levels = data['levels'] or [[]]
+        return sketch
+
+
+class SketchView:
+    """Sorted items and cumulative weights of a sketch; rank queries are binary searches"""
+
+    def __init__(self, items: np.ndarray, cumulative_weights: np.ndarray):
+        self.items = items
+        self.cumulative_weights = cumulative_weights
+        self.count = int(cumulative_weights[-1]) if len(cumulative_weights) else 0
+
+    def _weight_below(self, value: float, side: str) -> int:
+        index = int(np.searchsorted(self.items, value, side=side))
+        return int(self.cumulative_weights[index - 1]) if index else 0
+
+    def percentile_rank(self, value: float) -> Optional[float]:
+        """Percentage of values below value, counting ties as half"""
+        if not self.count:
+            return None
+        below = self._weight_below(value, 'left')
+        at_or_below = self._weight_below(value, 'right')
+        return 100.0 * (below + at_or_below) / (2 * self.count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        index = int(np.searchsorted(self.cumulative_weights, q * self.count, side='left'))
+        return float(self.items[min(index, len(self.items) - 1)])
+
+
+class PercentileSketchStore:
+    """Per-metric KLL sketches of every stored score, for percentile-rank lookups.
+
+    Scores are added to an in-process pending sketch after their transaction
+    commits. Every persist_interval seconds the pending sketch is merged into the
+    persisted one with an optimistic version check, so any number of workers can
+    flush without losing each other's updates. Readers use the persisted sketch
+    plus local pending items, refreshed every refresh_interval seconds.
+    """
+
+    def __init__(self, k: int = 200, persist_interval: float = 30.0, refresh_interval: float = 10.0):
+        self.k = k
+        self.persist_interval = persist_interval
+        self.refresh_interval = refresh_interval
+        self._pending = self._empty_sketches()
+        self._last_persist = time.monotonic()
+        self._views = None
+        self._views_time = 0.0
+        self._lock = threading.Lock()
+
+    def _empty_sketches(self) -> Dict[str, KLLSketch]:
+        return {metric: KLLSketch(k=self.k) for metric in SKETCH_METRICS}
+
+    def record_scores(self, score_rows: Iterable[Dict]):
+        """Add committed CreditScore insert mappings; persists when the interval has passed"""
+        score_rows = list(score_rows)
+        with self._lock:
+            for metric, column in SKETCH_METRICS.items():
+                self._pending[metric].update_many(
+                    row[column.key] for row in score_rows if row[column.key] is not None
+                )
+            persist_due = time.monotonic() - self._last_persist >= self.persist_interval
+
+        if persist_due:
+            try:
+                self.persist()
+            except Exception as e:
+                logging.error(f"Error persisting percentile sketches: {str(e)}")
+
+    def persist(self, max_attempts: int = 5):
+        """Merge the pending sketches into the stored ones, committing one metric at a time"""
+        with self._lock:
+            unsaved, self._pending = self._pending, self._empty_sketches()
+            self._last_persist = time.monotonic()
+
+        try:
+            for metric in list(unsaved):
+                if unsaved[metric].count:
+                    self._merge_into_stored(metric, unsaved[metric], max_attempts)
+                del unsaved[metric]
+        except Exception:
+            db.session.rollback()
+            # Put the unsaved items back so the next flush retries them
+            with self._lock:
+                for metric, sketch in unsaved.items():
+                    self._pending[metric].merge(sketch)
+            raise
+
+    def _merge_into_stored(self, metric: str, sketch: KLLSketch, max_attempts: int):
+        for _ in range(max_attempts):
+            row = db.session.execute(
+                select(ScoreSketch.payload, ScoreSketch.version).where(ScoreSketch.metric == metric)
+            ).first()
+            now = datetime.utcnow()
+
+            if row is None:
+                try:
+                    db.session.execute(insert(ScoreSketch).values(
+                        metric=metric, payload=sketch.to_json(), count=sketch.count, version=1, updated_at=now
+                    ))
+                    db.session.commit()
+                    return
+                except IntegrityError:
+                    # Another worker created the row first; merge into theirs
+                    db.session.rollback()
+                    continue
+
+            merged = KLLSketch.from_json(row.payload).merge(sketch)
+            result = db.session.execute(
+                update(ScoreSketch)
+                .where(ScoreSketch.metric == metric, ScoreSketch.version == row.version)
+                .values(payload=merged.to_json(), count=merged.count, version=row.version + 1, updated_at=now)
+            )
+            if result.rowcount == 1:
+                db.session.commit()
+                return
+            db.session.rollback()
+        raise RuntimeError(f'Could not persist the {metric} sketch after {max_attempts} attempts')
+
+    def views(self) -> Dict[str, SketchView]:
+        """Sorted sketch views per metric, rebuilt at most every refresh_interval seconds"""
+        with self._lock:
+            if self._views is not None and time.monotonic() - self._views_time < self.refresh_interval:
+                return self._views
+
+        sketches = {metric: KLLSketch.from_json(payload) for metric, payload in
+                    db.session.execute(select(ScoreSketch.metric, ScoreSketch.payload))
+                    if metric in SKETCH_METRICS}
+        with self._lock:
+            views = {}
+            for metric in SKETCH_METRICS:
+                sketch = sketches.get(metric, KLLSketch(k=self.k))
+                views[metric] = sketch.merge(self._pending[metric]).sorted_view()
+            self._views = views
+            self._views_time = time.monotonic()
+        return views
+
+    def percentile_ranks(self, values: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """Percentile rank (0-100) of each given metric value among all stored scores"""
+        views = self.views()
+        return {
+            metric: round(views[metric].percentile_rank(value), 2) if views[metric].count else None
+            for metric, value in values.items()
+        }
+
+    def is_empty(self) -> bool:
+        return all(view.count == 0 for view in self.views().values())
+
+    def needs_rebuild(self) -> bool:
+        """Whether the stored yecs_score sketch doesn't count exactly the stored scores.
+
+        Scores still pending in running workers count as missing, so call this when
+        they have flushed, e.g. at start-up.
+        """
+        stored_count = select(func.coalesce(func.sum(ScoreSketch.count), 0)) \
+            .where(ScoreSketch.metric == 'yecs_score').scalar_subquery()
+        score_count = select(func.count(CreditScore.id)).scalar_subquery()
+        # One statement, so both counts come from the same snapshot
+        stored, actual = db.session.execute(select(stored_count, score_count)).one()
+        return stored != actual
+
+    def rebuild(self, batch_size: int = 50000):
+        """Recreate every sketch from the CreditScore table and store it"""
+        columns = list(SKETCH_METRICS.values())
+        sketches = self._empty_sketches()
+        result = db.session.execute(select(*columns).execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            values = np.array(partition, dtype=np.float64)
+            for i, metric in enumerate(SKETCH_METRICS):
+                column_values = values[:, i]
+                sketches[metric].update_many(column_values[~np.isnan(column_values)])
+
+        now = datetime.utcnow()
+        db.session.execute(delete(ScoreSketch))
+        db.session.execute(insert(ScoreSketch), [
+            {'metric': metric, 'payload': sketch.to_json(), 'count': sketch.count, 'version': 1, 'updated_at': now}
+            for metric, sketch in sketches.items()
+        ])
+        db.session.commit()
+
+        with self._lock:
+            self._pending = self._empty_sketches()
+            self._views = None
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+import hashlib
+import json
+import threading
+
+
+class ScoreCache:
+    """LRU cache of calculated scores keyed by user and input fingerprint.
+
+    The fingerprint hashes the assembled user_data together with the algorithm
+    version and weights, so a changed input or algorithm never hits a stale entry.
+    Entries for a user are also dropped explicitly when their profile or financial
+    data is written. Each worker process has its own cache.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(user_data: Dict, scoring_algorithm) -> str:
+        """Stable hash of the scoring inputs and the algorithm configuration"""
+        payload = json.dumps({
+            'user_data': user_data,
+            'algorithm_version': scoring_algorithm.version,
+            'weights': scoring_algorithm.weights,
+            'score_range': scoring_algorithm.score_range
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, user_id: int, fingerprint: str) -> Optional[Dict]:
+        with self._lock:
+            key = (user_id, fingerprint)
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, user_id: int, fingerprint: str, result: Dict):
+        with self._lock:
+            key = (user_id, fingerprint)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget_key(evicted)
+
+    def invalidate(self, user_id: int):
+        """Drop every cached score of a user"""
+        with self._lock:
+            for key in self._user_keys.pop(user_id, ()):
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def _forget_key(self, key):
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+
+    def __len__(self):
+        return len(self._entries)
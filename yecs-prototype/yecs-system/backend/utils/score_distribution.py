@@ -0,0 +1,187 @@
+from sqlalchemy import select, delete, insert, func
+from typing import Dict, Iterable, List
+from datetime import datetime
+import threading
+import time
+import numpy as np
+
+from database.database import db, CreditScore, ScoreHistogramBin, upsert_add
+from utils.score_history import COMPONENT_FIELDS
+
+# yecs_score histogram: fixed-width bins over the score range
+SCORE_RANGE = (300, 850)
+SCORE_BIN_WIDTH = 10
+
+# Component scores are 0-100; one-point bins give quantiles to within a point
+COMPONENT_RANGE = (0, 100)
+COMPONENT_BIN_WIDTH = 1
+
+RISK_LEVELS = ['LOW', 'MEDIUM', 'HIGH', 'VERY_HIGH']
+
+COMPONENT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Histogram metrics and the CreditScore column each one counts
+HISTOGRAM_METRICS = {'yecs_score': CreditScore.yecs_score}
+HISTOGRAM_METRICS.update(COMPONENT_FIELDS)
+
+
+def bin_edges(metric: str) -> np.ndarray:
+    low, high = SCORE_RANGE if metric == 'yecs_score' else COMPONENT_RANGE
+    width = SCORE_BIN_WIDTH if metric == 'yecs_score' else COMPONENT_BIN_WIDTH
+    return np.arange(low, high + width, width, dtype=np.float64)
+
+
+def bin_indexes(metric: str, values) -> np.ndarray:
+    """Histogram bin of each value; out-of-range values go to the first or last bin"""
+    edges = bin_edges(metric)
+    indexes = np.floor((np.asarray(values, dtype=np.float64) - edges[0]) / (edges[1] - edges[0]))
+    return np.clip(indexes, 0, len(edges) - 2).astype(np.int64)
+
+
+def histogram_quantile(counts: np.ndarray, edges: np.ndarray, q: float) -> float:
+    """Quantile of a histogram, interpolating linearly inside the bin that contains it"""
+    cumulative = np.cumsum(counts)
+    target = q * cumulative[-1]
+    index = int(np.searchsorted(cumulative, target, side='left'))
+    below = cumulative[index - 1] if index > 0 else 0
+    fraction = (target - below) / counts[index] if counts[index] else 0.0
+    return float(edges[index] + fraction * (edges[index + 1] - edges[index]))
+
+
+class ScoreDistributionStore:
+    """Precomputed score distribution behind /api/score-distribution.
+
+    Keeps per-bucket counts for the yecs_score histogram, each risk level and each
+    component-score histogram. Writers add deltas in their own transaction and call
+    invalidate() once it commits; readers get a snapshot built from O(bins) rows and
+    cached for snapshot_ttl seconds.
+    """
+
+    def __init__(self, snapshot_ttl: float = 5.0):
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_scores(self, score_rows: Iterable[Dict]):
+        """Add CreditScore insert mappings to the histograms, in the caller's transaction"""
+        deltas = self._bucket_counts(list(score_rows))
+        if not deltas:
+            return
+
+        now = datetime.utcnow()
+        # Sorted so concurrent writers lock the rows in the same order
+        rows = [
+            {'metric': metric, 'bucket': bucket, 'count': count, 'updated_at': now}
+            for (metric, bucket), count in sorted(deltas.items())
+        ]
+        # An upsert, so two workers adding the first score of a new bucket both succeed
+        upsert_add(ScoreHistogramBin, rows, key_columns=['metric', 'bucket'], added_columns=['count'])
+
+    @staticmethod
+    def _bucket_counts(score_rows: List[Dict], counts: Dict = None) -> Dict:
+        """Count rows per (metric, bucket), adding to counts when given"""
+        counts = {} if counts is None else counts
+        if not score_rows:
+            return counts
+
+        for metric, column in HISTOGRAM_METRICS.items():
+            values = np.array([row[column.key] for row in score_rows], dtype=np.float64)
+            values = values[~np.isnan(values)]
+            for index, count in zip(*np.unique(bin_indexes(metric, values), return_counts=True)):
+                key = (metric, str(index))
+                counts[key] = counts.get(key, 0) + int(count)
+        for row in score_rows:
+            key = ('risk_level', row['risk_level'])
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def invalidate(self):
+        """Drop the cached snapshot; call after committing bucket changes so it isn't re-cached stale"""
+        with self._lock:
+            self._snapshot = None
+
+    def load_counts(self) -> Dict:
+        """Return {metric: {bucket: count}} for every stored bucket"""
+        counts = {}
+        for row in db.session.execute(select(ScoreHistogramBin.__table__)):
+            counts.setdefault(row.metric, {})[row.bucket] = row.count
+        return counts
+
+    def snapshot(self) -> Dict:
+        """The current distribution, rebuilt from the bucket rows at most every snapshot_ttl seconds"""
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._snapshot_time < self.snapshot_ttl:
+                return self._snapshot
+
+        snapshot = self.build_snapshot(self.load_counts())
+        with self._lock:
+            self._snapshot = snapshot
+            self._snapshot_time = time.monotonic()
+        return snapshot
+
+    @staticmethod
+    def build_snapshot(counts: Dict) -> Dict:
+        histograms = {}
+        for metric in HISTOGRAM_METRICS:
+            edges = bin_edges(metric)
+            histogram = np.zeros(len(edges) - 1, dtype=np.int64)
+            for bucket, count in counts.get(metric, {}).items():
+                histogram[int(bucket)] = count
+            histograms[metric] = (edges, histogram)
+
+        edges, score_histogram = histograms['yecs_score']
+        total = int(score_histogram.sum())
+
+        component_quantiles = {}
+        for name in COMPONENT_FIELDS:
+            component_edges, histogram = histograms[name]
+            component_quantiles[name] = {
+                f'p{int(q * 100)}': round(histogram_quantile(histogram, component_edges, q), 2) if total else None
+                for q in COMPONENT_QUANTILES
+            }
+
+        risk_counts = counts.get('risk_level', {})
+        return {
+            'total_scores': total,
+            'histogram': [
+                {'min': int(edges[i]), 'max': int(edges[i + 1]), 'count': int(score_histogram[i])}
+                for i in range(len(score_histogram))
+            ],
+            'risk_levels': {level: int(risk_counts.get(level, 0)) for level in RISK_LEVELS},
+            'component_quantiles': component_quantiles,
+            'generated_at': datetime.utcnow().isoformat()
+        }
+
+    def rebuild(self, batch_size: int = 50000):
+        """Recount every bucket from the CreditScore table, in the caller's transaction"""
+        columns = list(HISTOGRAM_METRICS.values()) + [CreditScore.risk_level]
+        keys = [column.key for column in columns]
+
+        counts = {}
+        result = db.session.execute(select(*columns).execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            self._bucket_counts([dict(zip(keys, row)) for row in partition], counts)
+
+        db.session.execute(delete(ScoreHistogramBin))
+        now = datetime.utcnow()
+        if counts:
+            db.session.execute(insert(ScoreHistogramBin), [
+                {'metric': metric, 'bucket': bucket, 'count': count, 'updated_at': now}
+                for (metric, bucket), count in counts.items()
+            ])
+
+    def needs_rebuild(self) -> bool:
+        """Whether the yecs_score buckets don't count exactly the stored scores"""
+        stored_count = select(func.coalesce(func.sum(ScoreHistogramBin.count), 0)) \
+            .where(ScoreHistogramBin.metric == 'yecs_score').scalar_subquery()
+        score_count = select(func.count(CreditScore.id)).scalar_subquery()
+        # One statement, so both counts come from the same snapshot
+        stored, actual = db.session.execute(select(stored_count, score_count)).one()
+        return stored != actual
+
+    @staticmethod
+    def score_row_values(rows: List) -> List[Dict]:
+        """CreditScore objects as the insert mappings record_scores takes"""
+        keys = [column.key for column in HISTOGRAM_METRICS.values()] + ['risk_level']
+        return [{key: getattr(row, key) for key in keys} for row in rows]
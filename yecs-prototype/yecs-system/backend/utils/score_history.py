@@ -0,0 +1,104 @@
+from sqlalchemy import select, func, and_, or_
+from typing import Dict, List, Optional
+from datetime import datetime
+import base64
+
+from database.database import db, CreditScore
+
+# Selectable fields; component scores are returned nested under component_scores
+SCORE_FIELDS = {
+    'yecs_score': CreditScore.yecs_score,
+    'risk_level': CreditScore.risk_level
+}
+
+COMPONENT_FIELDS = {
+    'business_viability': CreditScore.business_viability_score,
+    'payment_history': CreditScore.payment_history_score,
+    'financial_management': CreditScore.financial_management_score,
+    'personal_creditworthiness': CreditScore.personal_creditworthiness_score,
+    'education_background': CreditScore.education_background_score,
+    'social_verification': CreditScore.social_verification_score
+}
+
+DOWNSAMPLE_PERIODS = ('day',)
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Field names from a comma-separated fields= parameter; all fields when omitted"""
+    if not fields:
+        return list(SCORE_FIELDS) + list(COMPONENT_FIELDS)
+
+    names = []
+    for name in (field.strip() for field in fields.split(',')):
+        if name == 'component_scores':
+            names.extend(COMPONENT_FIELDS)
+        elif name in SCORE_FIELDS or name in COMPONENT_FIELDS:
+            names.append(name)
+        elif name and name not in ('score_id', 'created_at'):
+            raise ValueError(f'Unknown field: {name}')
+    return list(dict.fromkeys(names))
+
+
+def encode_cursor(created_at: datetime, score_id: int) -> str:
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{score_id}'.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, score_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(score_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def load_score_history(user_id: int, fields: List[str], limit: Optional[int],
+                       cursor: Optional[str] = None, downsample: Optional[str] = None) -> Dict:
+    """One page of a user's scores, newest first, keyset-paginated on (created_at, id).
+
+    limit=None returns all remaining scores as one page. Selects only the requested
+    columns. With downsample='day' only the latest (highest id) score of each day is
+    returned, for charting long histories.
+    """
+    if downsample is not None and downsample not in DOWNSAMPLE_PERIODS:
+        raise ValueError(f'downsample must be one of: {", ".join(DOWNSAMPLE_PERIODS)}')
+
+    columns = [CreditScore.id, CreditScore.created_at]
+    columns += [SCORE_FIELDS[name] for name in fields if name in SCORE_FIELDS]
+    columns += [COMPONENT_FIELDS[name].label(name) for name in fields if name in COMPONENT_FIELDS]
+
+    query = select(*columns).where(CreditScore.user_id == user_id)
+    if downsample == 'day':
+        latest_per_day = (
+            select(func.max(CreditScore.id))
+            .where(CreditScore.user_id == user_id)
+            .group_by(func.date(CreditScore.created_at))
+        )
+        query = query.where(CreditScore.id.in_(latest_per_day))
+    if cursor is not None:
+        created_at, score_id = decode_cursor(cursor)
+        query = query.where(or_(
+            CreditScore.created_at < created_at,
+            and_(CreditScore.created_at == created_at, CreditScore.id < score_id)
+        ))
+    query = query.order_by(CreditScore.created_at.desc(), CreditScore.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    rows = db.session.execute(query).all()
+    has_more = limit is not None and len(rows) > limit
+    rows = rows[:limit]
+
+    score_history = []
+    for row in rows:
+        entry = {'score_id': row.id}
+        entry.update((name, getattr(row, name)) for name in fields if name in SCORE_FIELDS)
+        components = {name: getattr(row, name) for name in fields if name in COMPONENT_FIELDS}
+        if components:
+            entry['component_scores'] = components
+        entry['created_at'] = row.created_at.isoformat()
+        score_history.append(entry)
+
+    return {
+        'score_history': score_history,
+        'next_cursor': encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    }
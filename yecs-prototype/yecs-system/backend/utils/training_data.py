@@ -0,0 +1,68 @@
+import numpy as np
+import glob
+import os
+from typing import Iterator, List, Optional, Tuple
+
+
+class TrainingDataStore:
+    """Read-only view over processed training arrays on disk.
+
+    Opens the features/scores files written by DatasetProcessor with
+    np.load(mmap_mode='r'), so nothing is read until it is used. Data may be a
+    single features.npy/scores.npy pair or shards named features-<part>.npy and
+    scores-<part>.npy. `columns` selects a subset of feature columns.
+    """
+
+    def __init__(self, data_dir: str, columns: Optional[List[int]] = None):
+        self.data_dir = data_dir
+        self.columns = list(columns) if columns is not None else None
+        self.shards = self._open_shards(data_dir)
+
+        widths = {features.shape[1] for features, _ in self.shards}
+        if len(widths) != 1:
+            raise ValueError(f"Feature shards in {data_dir} have different widths: {sorted(widths)}")
+        self.total_features = widths.pop()
+
+        if self.columns is not None:
+            invalid = [col for col in self.columns if not 0 <= col < self.total_features]
+            if invalid:
+                raise ValueError(f"Invalid feature columns {invalid} for {self.total_features} features")
+
+    @staticmethod
+    def _open_shards(data_dir: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Open every features/scores pair in data_dir as memory maps"""
+        feature_paths = sorted(glob.glob(os.path.join(data_dir, 'features-*.npy')))
+        if not feature_paths and os.path.exists(os.path.join(data_dir, 'features.npy')):
+            feature_paths = [os.path.join(data_dir, 'features.npy')]
+        if not feature_paths:
+            raise FileNotFoundError(f"No features.npy or features-*.npy files found in {data_dir}")
+
+        shards = []
+        for features_path in feature_paths:
+            scores_path = os.path.join(os.path.dirname(features_path),
+                                       'scores' + os.path.basename(features_path)[len('features'):])
+            features = np.load(features_path, mmap_mode='r')
+            scores = np.load(scores_path, mmap_mode='r')
+            if features.ndim != 2 or len(features) != len(scores):
+                raise ValueError(f"{features_path} and {scores_path} do not describe the same rows")
+            shards.append((features, scores))
+
+        return shards
+
+    @property
+    def num_rows(self) -> int:
+        return sum(len(scores) for _, scores in self.shards)
+
+    @property
+    def num_features(self) -> int:
+        return len(self.columns) if self.columns is not None else self.total_features
+
+    def iter_batches(self, batch_size: int = 100000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (features, scores) batches in row order; only one batch is in memory at a time"""
+        for features, scores in self.shards:
+            for start in range(0, len(scores), batch_size):
+                end = min(start + batch_size, len(scores))
+                batch = features[start:end]
+                if self.columns is not None:
+                    batch = batch[:, self.columns]
+                yield np.asarray(batch), np.asarray(scores[start:end])
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+
+# Backend modules import each other as top-level packages (database, models, utils)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+
+class StubOllama(ThreadingMixIn, HTTPServer):
+    """Local stand-in for Ollama's /api/chat and /api/tags that counts chat calls"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubOllamaHandler)
+        self.delay = 0.0
+        self.status = 200
+        self.tokens = ['Strong ', 'cash ', 'flow.']
+        self.chat_calls = 0
+        self.tags_calls = 0
+        self.max_active = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def enter(self):
+        with self._lock:
+            self.chat_calls += 1
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.tags_calls += 1
+        self._send_json({'models': []}, self.server.status)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server = self.server
+        server.enter()
+        try:
+            time.sleep(server.delay)
+            if server.status != 200:
+                self._send_json({'error': 'stub failure'}, server.status)
+            elif body.get('stream'):
+                lines = [json.dumps({'message': {'content': token}, 'done': False}) for token in server.tokens]
+                lines.append(json.dumps({'message': {'content': ''}, 'done': True}))
+                self._send(('\n'.join(lines) + '\n').encode(), 'application/x-ndjson')
+            else:
+                self._send_json({'message': {'content': ''.join(server.tokens)}, 'done': True})
+        finally:
+            server.leave()
+
+    def _send_json(self, data, status=200):
+        self._send(json.dumps(data).encode(), 'application/json', status)
+
+    def _send(self, payload, content_type, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The app module, imported once against a scratch SQLite database"""
+    data_dir = tmp_path_factory.mktemp('yecs')
+    os.environ['YECS_DATABASE_URL'] = f"sqlite:///{data_dir / 'yecs.db'}"
+    os.environ['YECS_DATA_DIR'] = str(data_dir / 'data')
+    os.environ['YECS_MODEL_ARTIFACT'] = str(data_dir / 'artifacts' / 'yecs_model')
+    # Nothing listens here, so explanations fall back to templates unless a test swaps in a stub
+    os.environ['OLLAMA_BASE_URL'] = 'http://127.0.0.1:9'
+
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def create_applicant(client):
+    """Create a user with a business profile and financial data; returns the user id"""
+
+    def create(age=30, monthly_income=5000.0, score=True):
+        response = client.post('/api/users', json={'email': f'{uuid.uuid4().hex}@example.com',
+                                                   'first_name': 'Test', 'last_name': 'Applicant', 'age': age})
+        assert response.status_code == 201
+        user_id = response.get_json()['user_id']
+
+        assert client.post(f'/api/users/{user_id}/business-profile', json={
+            'business_name': 'Corner Shop', 'industry': 'Retail', 'business_plan_quality': 0.8,
+            'revenue_projection': 90000, 'years_of_experience': 3, 'education_level': "Bachelor's"
+        }).status_code == 201
+        assert client.post(f'/api/users/{user_id}/financial-data', json={
+            'monthly_income': monthly_income, 'monthly_expenses': 3000.0, 'savings_amount': 12000.0,
+            'debt_amount': 8000.0, 'utility_payment_score': 0.9, 'rent_payment_score': 0.85
+        }).status_code == 201
+
+        if score:
+            assert client.post(f'/api/users/{user_id}/calculate-score').status_code == 200
+        return user_id
+
+    return create
+
+
+@pytest.fixture
+def stub_ollama():
+    server = StubOllama()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
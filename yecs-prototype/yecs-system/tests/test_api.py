@@ -0,0 +1,2 @@
+def test_health_check(client):
+    assert client.get('/').get_json()['status'] == 'healthy'
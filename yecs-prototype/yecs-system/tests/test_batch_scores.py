@@ -0,0 +1,24 @@
+import json
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+
+def test_batch_scores_stream_ndjson_matching_single_scores(client, create_applicant):
+    user_ids = [create_applicant(age=age, monthly_income=income, score=False)
+                for age, income in ((25, 2500.0), (40, 9000.0))]
+
+    response = client.post('/api/scores/batch', json={'user_ids': user_ids + [10 ** 9], 'chunk_size': 1})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = ndjson(response)
+    assert [line['user_id'] for line in lines] == user_ids + [10 ** 9]
+    assert lines[-1]['error'] == 'User not found'
+
+    for line in lines[:-1]:
+        single = client.post(f"/api/users/{line['user_id']}/calculate-score").get_json()
+        assert single['yecs_score'] == line['yecs_score']
+        assert single['risk_level'] == line['risk_level']
+
+    assert client.post('/api/scores/batch', json={'user_ids': 5}).status_code == 400
+    assert client.post('/api/scores/batch', json={'chunk_size': 0}).status_code == 400
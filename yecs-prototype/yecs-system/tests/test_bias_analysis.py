@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from database.database import db
+from utils.bias_statistics import BiasStatisticsStore
+
+
+def test_bias_analysis_modes(client, create_applicant):
+    for age in (22, 35, 52):
+        create_applicant(age=age)
+
+    incremental = client.post('/api/bias-analysis').get_json()
+    full = client.post('/api/bias-analysis', json={'mode': 'full'}).get_json()
+    assert incremental['mode'] == 'incremental'
+    assert set(incremental['bias_analysis']) == set(full['bias_analysis'])
+
+    assert client.post('/api/bias-analysis', json={'mode': 'bogus'}).status_code == 400
+
+
+def test_incremental_group_statistics_match_a_full_scan(client, create_applicant):
+    for age in (22, 35, 35, 52):
+        create_applicant(age=age)
+
+    incremental = client.post('/api/bias-analysis').get_json()['bias_analysis']['age']
+    full = client.post('/api/bias-analysis', json={'mode': 'full'}).get_json()['bias_analysis']['age']
+    incremental, full = incremental['group_statistics'], full['group_statistics']
+    assert set(incremental) == set(full)
+    for group, stats in full.items():
+        assert incremental[group]['count'] == stats['count']
+        assert incremental[group]['mean'] == pytest.approx(stats['mean'])
+        assert incremental[group]['std'] == pytest.approx(stats['std'])
+
+
+def test_rebuild_recomputes_the_recorded_aggregates(app_module, create_applicant):
+    for age in (22, 35):
+        create_applicant(age=age)
+    store = BiasStatisticsStore()
+
+    with app_module.app.app_context():
+        recorded = store.load_aggregates()
+        assert not store.needs_rebuild()
+        store.rebuild()
+        assert store.load_aggregates() == recorded
+        db.session.rollback()
+
+
+def test_intersectional_bias_analysis(client, create_applicant):
+    for age in (23, 36, 53):
+        create_applicant(age=age)
+
+    response = client.post('/api/bias-analysis', json={'mode': 'intersectional', 'min_support': 1})
+    assert response.status_code == 200
+    assert 'intersectional_analysis' in response.get_json()
+
+    response = client.post('/api/bias-analysis', json={'mode': 'intersectional', 'max_order': 'two'})
+    assert response.status_code == 400
+
+
+def test_single_score_groups_report_the_same_undefined_std_in_every_mode(client, create_applicant):
+    # Nobody else in the suite is 99, so this group holds a single score
+    create_applicant(age=99)
+    create_applicant(age=98)
+    create_applicant(age=98)
+
+    bodies = {}
+    for mode in ('incremental', 'full', 'intersectional'):
+        response = client.post('/api/bias-analysis', json={'mode': mode, 'min_support': 1})
+        assert response.status_code == 200
+        # Strict JSON: a NaN std would come out as a bare NaN token
+        bodies[mode] = json.loads(response.get_data(as_text=True),
+                                  parse_constant=lambda token: pytest.fail(f'{mode} returned {token}'))
+
+    incremental = bodies['incremental']['bias_analysis']['age']['group_statistics']
+    full = bodies['full']['bias_analysis']['age']['group_statistics']
+    assert incremental['99']['std'] is None
+    assert full['99']['std'] is None
+    assert incremental['98']['std'] == full['98']['std'] == 0.0
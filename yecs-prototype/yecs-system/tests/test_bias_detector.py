@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.bias_detector import BiasDetector
+
+
+def applicant_frame(size=400, seed=0):
+    """Scores, decisions and outcomes for groups of uneven size, some rows missing their group"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'user_id': np.arange(size),
+        'yecs_score': rng.integers(300, 851, size),
+        'gender': rng.choice(['f', 'm', 'x', None], size, p=[0.45, 0.45, 0.05, 0.05]),
+        'zip_code': pd.Categorical(rng.choice(['10001', '60601', '94105'], size),
+                                   categories=['02139', '10001', '60601', '94105'])
+    })
+    frame['actual_approval'] = rng.choice([0, 1, np.nan], size, p=[0.45, 0.45, 0.1])
+    return frame
+
+
+@pytest.mark.parametrize('attribute', ['gender', 'zip_code'])
+def test_group_sums_match_pandas_groupby(attribute):
+    frame = applicant_frame()
+    codes, groups = BiasDetector._group_codes(frame[attribute])
+
+    expected = frame.groupby(attribute, observed=True)['yecs_score'].agg(['count', 'sum'])
+    assert groups == list(expected.index)
+    np.testing.assert_array_equal(BiasDetector._group_sums(codes, len(groups)), expected['count'])
+    np.testing.assert_allclose(BiasDetector._group_sums(codes, len(groups), frame['yecs_score'].to_numpy(float)),
+                               expected['sum'])
+
+
+def test_fairness_metrics_match_pandas_groupby():
+    frame = applicant_frame()
+    detector = BiasDetector()
+
+    metrics = detector.calculate_fairness_metrics(frame[['user_id', 'yecs_score']],
+                                                  frame[['user_id', 'actual_approval']],
+                                                  frame[['user_id', 'gender', 'zip_code']])
+
+    frame['approved'] = frame['yecs_score'] >= detector.approval_threshold
+    for attribute in ('gender', 'zip_code'):
+        grouped = frame.groupby(attribute, observed=True)
+        expected = grouped.agg(total=('approved', 'size'), approved=('approved', 'sum'), score=('yecs_score', 'mean'))
+        for group, row in expected.iterrows():
+            result = metrics[attribute][group]
+            assert result['total_applications'] == row['total']
+            assert result['approved_applications'] == row['approved']
+            assert result['approval_rate'] == pytest.approx(row['approved'] / row['total'])
+            assert result['average_score'] == pytest.approx(row['score'])
+
+            group_rows = grouped.get_group(group)
+            positives = group_rows[group_rows['actual_approval'] == 1]
+            negatives = group_rows[group_rows['actual_approval'] == 0]
+            odds = metrics[attribute]['equalized_odds'][group]
+            assert odds['true_positive_rate'] == pytest.approx(positives['approved'].mean())
+            assert odds['false_positive_rate'] == pytest.approx(negatives['approved'].mean())
+        assert set(metrics[attribute]) - {'equalized_odds'} == set(expected.index)
+
+
+def test_parity_offsets_match_hand_computed_thresholds():
+    scores = np.array([700, 620, 660, 640, 610, 600], dtype=np.float64)
+    codes = np.array([0, 1, 0, 0, 1, 0])
+    detector = BiasDetector()
+
+    # Group 0 needs 2 of 4 approved: its 2nd highest score, 660, moves to 650; group 1 needs 1 of 2: 620 moves up
+    np.testing.assert_array_equal(detector._parity_offsets(codes, 2, scores, 0.5), [-10.0, 30.0])
+    # Group 0 needs round(0.3 * 4) = 1 approval, group 1 needs round(0.3 * 2) = 1
+    np.testing.assert_array_equal(detector._parity_offsets(codes, 2, scores, 0.3), [-50.0, 30.0])
+    np.testing.assert_array_equal(detector._parity_offsets(codes, 2, scores, 0.0), [0.0, 0.0])
+
+
+def test_threshold_search_brings_every_group_to_the_overall_approval_rate():
+    frame = applicant_frame(size=1000, seed=1).dropna(subset=['gender'])
+    # Fractional scores, so no ties at a group's cut-off approve extra applicants
+    frame['yecs_score'] = frame['yecs_score'] + np.random.default_rng(1).uniform(0, 0.5, len(frame))
+    detector = BiasDetector()
+
+    mitigated = detector.apply_bias_mitigation(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']],
+                                               method='demographic_parity_threshold')
+
+    overall_rate = (frame['yecs_score'] >= detector.approval_threshold).mean()
+    mitigated = mitigated.merge(frame[['user_id', 'gender']], on='user_id')
+    rates = (mitigated['yecs_score'] >= detector.approval_threshold).groupby(mitigated['gender']).mean()
+    sizes = mitigated.groupby('gender').size()
+    # Each group lands within rounding (one applicant) of the overall rate
+    assert ((rates - overall_rate).abs() <= 1 / sizes).all()
+
+
+def test_mitigation_offsets_match_pandas_groupby():
+    frame = applicant_frame(seed=2)
+    demographics = frame[['user_id', 'gender']]
+    detector = BiasDetector()
+    scores = frame['yecs_score'].astype(float)
+    group_means = scores.groupby(frame['gender']).transform('mean')
+
+    equalized = detector.apply_bias_mitigation(frame[['user_id', 'yecs_score']], demographics)
+    expected = scores + ((scores.mean() - group_means) * 0.1).fillna(0.0)
+    np.testing.assert_allclose(equalized['yecs_score'], expected.clip(300, 850))
+
+    parity = detector.apply_bias_mitigation(frame[['user_id', 'yecs_score']], demographics,
+                                            method='demographic_parity')
+    approved = scores >= detector.approval_threshold
+    below_overall = approved.groupby(frame['gender']).transform('mean') < approved.mean()
+    np.testing.assert_allclose(parity['yecs_score'], (scores + np.where(below_overall, 20.0, 0.0)).clip(300, 850))
+
+    with pytest.raises(ValueError, match='Unknown bias mitigation method'):
+        detector.apply_bias_mitigation(frame[['user_id', 'yecs_score']], demographics, method='reweighing')
+
+
+def reference_bootstrap_intervals(frame, attribute, resamples=4000, seed=7):
+    """Percentile intervals of each group's ratio from explicit Poisson(1) weights on every row"""
+    rng = np.random.default_rng(seed)
+    scores = frame['yecs_score'].to_numpy(dtype=np.float64)
+    weights = rng.poisson(1.0, (len(frame), resamples))
+    overall = (weights * scores[:, None]).sum(axis=0) / weights.sum(axis=0)
+    intervals = {}
+    for group, rows in frame.groupby(attribute).indices.items():
+        ratios = (weights[rows] * scores[rows, None]).sum(axis=0) / weights[rows].sum(axis=0) / overall
+        intervals[group] = np.quantile(ratios, [0.025, 0.975])
+    return intervals
+
+
+def bootstrap_frame(group_sizes, seed=3):
+    rng = np.random.default_rng(seed)
+    groups = np.repeat(list(group_sizes), list(group_sizes.values()))
+    means = {'a': 560, 'b': 620, 'c': 680, 'd': 600}
+    return pd.DataFrame({'user_id': np.arange(len(groups)), 'gender': groups,
+                         'yecs_score': [rng.normal(means[group], 70) for group in groups]})
+
+
+@pytest.mark.parametrize('group_sizes', [
+    {'a': 60, 'b': 80, 'c': 90},
+    # Groups over bootstrap_exact_max_count draw their sums from the normal approximation
+    {'a': 400, 'b': 1500, 'c': 90}
+])
+def test_bootstrap_intervals_match_an_explicit_poisson_bootstrap(group_sizes):
+    frame = bootstrap_frame(group_sizes)
+    detector = BiasDetector(bootstrap_resamples=4000)
+
+    result = detector.detect_demographic_bias(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+
+    intervals = result['gender']['disparate_impact_intervals']
+    for group, expected in reference_bootstrap_intervals(frame, 'gender').items():
+        np.testing.assert_allclose(intervals[group], expected, atol=0.01)
+        assert intervals[group][0] < result['gender']['disparate_impact'][group] < intervals[group][1]
+
+
+def test_bootstrap_intervals_agree_with_the_analytic_aggregate_intervals():
+    frame = bootstrap_frame({'a': 300, 'b': 500, 'c': 200})
+    detector = BiasDetector(bootstrap_resamples=4000)
+
+    bootstrap = detector.detect_demographic_bias(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+    frame['yecs_score'] = frame['yecs_score'].round().astype(int)
+    analytic = detector.detect_demographic_bias_from_aggregates({'gender': aggregates_of(frame, 'gender')})
+
+    for group in ('a', 'b', 'c'):
+        np.testing.assert_allclose(bootstrap['gender']['disparate_impact_intervals'][group],
+                                   analytic['gender']['disparate_impact_intervals'][group], atol=0.01)
+
+
+def test_bootstrap_intervals_are_seeded_and_skip_small_groups():
+    frame = bootstrap_frame({'a': 60, 'b': 80, 'd': 10})
+    detector = BiasDetector(bootstrap_resamples=500)
+
+    first = detector.detect_demographic_bias(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+    second = detector.detect_demographic_bias(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+
+    assert first['gender']['disparate_impact_intervals'] == second['gender']['disparate_impact_intervals']
+    assert first['gender']['disparate_impact_intervals']['d'] is None
+
+
+def test_parallel_bootstrap_matches_in_process_intervals():
+    frame = bootstrap_frame({'a': 60, 'b': 500, 'c': 90})
+    arguments = (frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+
+    serial = BiasDetector(bootstrap_resamples=4000).detect_demographic_bias(*arguments)
+    parallel = BiasDetector(bootstrap_resamples=4000, bootstrap_workers=2).detect_demographic_bias(*arguments)
+
+    for group in ('a', 'b', 'c'):
+        np.testing.assert_allclose(parallel['gender']['disparate_impact_intervals'][group],
+                                   serial['gender']['disparate_impact_intervals'][group], atol=0.01)
+
+
+def aggregates_of(frame, attribute):
+    return {group: {'count': len(scores), 'sum': int(scores.sum()), 'sum_sq': int((scores ** 2).sum())}
+            for group, scores in frame.groupby(attribute)['yecs_score']}
+
+
+def test_full_and_aggregate_modes_report_the_pandas_group_std():
+    frame = pd.DataFrame({'user_id': range(6), 'yecs_score': [600, 640, 700, 720, 580, 810],
+                          'gender': ['f', 'f', 'm', 'm', 'm', 'x']})
+    detector = BiasDetector(bootstrap_resamples=50)
+
+    full = detector.detect_demographic_bias(frame[['user_id', 'yecs_score']], frame[['user_id', 'gender']])
+    incremental = detector.detect_demographic_bias_from_aggregates({'gender': aggregates_of(frame, 'gender')})
+
+    expected = frame.groupby('gender')['yecs_score'].std()
+    for results in (full, incremental):
+        stats = results['gender']['group_statistics']
+        assert np.isclose(stats['f']['std'], expected['f'])
+        assert np.isclose(stats['m']['std'], expected['m'])
+        # pandas gives NaN for a single score; results report None so they stay valid JSON
+        assert stats['x']['std'] is None
+
+
+def test_intersectional_cells_report_undefined_std_as_none():
+    frame = pd.DataFrame({'user_id': range(4), 'yecs_score': [600, 640, 700, 720],
+                          'gender': ['f', 'f', 'm', 'x'], 'zip_code': ['1', '1', '2', '2']})
+
+    result = BiasDetector().detect_intersectional_bias(frame[['user_id', 'yecs_score']],
+                                                       frame[['user_id', 'gender', 'zip_code']],
+                                                       attributes=['gender', 'zip_code'], min_support=1)
+
+    cells = {tuple(sorted(cell['groups'].items())): cell
+             for intersection in result['intersections'].values() for cell in intersection['cells']}
+    assert np.isclose(cells[(('zip_code', '2'),)]['std'], np.std([700, 720], ddof=1))
+    assert cells[(('gender', 'm'),)]['std'] is None
+    assert cells[(('gender', 'x'), ('zip_code', '2'))]['std'] is None
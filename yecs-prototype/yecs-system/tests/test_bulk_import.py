@@ -0,0 +1,80 @@
+import io
+import uuid
+
+import pandas as pd
+import pytest
+
+from utils.bulk_import import BulkImporter
+
+
+def test_validation_flags_each_bad_row_once():
+    frame = pd.DataFrame([
+        {'email': 'a@example.com', 'first_name': 'A', 'last_name': 'Row', 'age': '31', 'monthly_income': '2500'},
+        {'email': ' a@example.com ', 'first_name': 'A', 'last_name': 'Again', 'age': 31},
+        {'email': 'b@example.com', 'first_name': '', 'last_name': 'Blank', 'age': 'old'},
+        {'email': 'c@example.com', 'first_name': 'C', 'last_name': 'Row', 'age': 40.5},
+        {'email': 'd@example.com', 'first_name': 'D', 'last_name': 'Row', 'age': 22, 'monthly_income': 'lots'}
+    ])
+
+    valid, errors = BulkImporter().validate(frame)
+
+    assert valid['email'].tolist() == ['a@example.com']
+    assert valid['monthly_income'].tolist() == [2500]
+    assert [(error['row'], error['error']) for error in errors] == [
+        (1, 'Duplicate email in batch'),
+        (2, 'Missing required field: first_name'),
+        (3, 'Invalid value for age'),
+        (4, 'Invalid value for monthly_income')
+    ]
+    with pytest.raises(ValueError, match='Missing required column: age'):
+        BulkImporter().validate(frame.drop(columns='age'))
+
+
+def test_profiles_are_only_created_for_rows_that_have_their_fields():
+    frame = pd.DataFrame([
+        {'email': 'e@example.com', 'first_name': 'E', 'last_name': 'Row', 'age': 25, 'industry': 'Retail'},
+        {'email': 'f@example.com', 'first_name': 'F', 'last_name': 'Row', 'age': 26, 'industry': None}
+    ])
+    valid, _ = BulkImporter().validate(frame)
+
+    rows = BulkImporter._applicant_rows(valid)
+    assert rows[0]['business_profile']['industry'] == 'Retail'
+    assert rows[0]['business_profile']['years_of_experience'] == 0
+    assert rows[0]['financial_data'] is None
+    assert rows[1]['business_profile'] is None
+
+
+def test_bulk_import_json_and_csv(client):
+    email = f'{uuid.uuid4().hex}@example.com'
+    response = client.post('/api/users/bulk', json=[
+        {'email': email, 'first_name': 'Bulk', 'last_name': 'One', 'age': 28, 'industry': 'Retail',
+         'monthly_income': 4000},
+        {'email': email, 'first_name': 'Bulk', 'last_name': 'Duplicate', 'age': 28},
+        {'first_name': 'Missing', 'last_name': 'Email', 'age': 30}
+    ])
+    assert response.status_code == 201
+    result = response.get_json()
+    assert (result['created'], result['failed']) == (1, 2)
+    assert [error['row'] for error in result['errors']] == [1, 2]
+
+    csv_body = f"email,first_name,last_name,age\n{uuid.uuid4().hex}@example.com,Csv,Row,33\n"
+    response = client.post('/api/users/bulk', data={'file': (io.BytesIO(csv_body.encode()), 'applicants.csv')})
+    assert response.status_code == 201
+    assert response.get_json()['created'] == 1
+
+    assert client.post('/api/users/bulk', data='not json', content_type='text/plain').status_code == 400
+
+
+def test_import_reports_existing_emails_across_chunks(app_module):
+    emails = [f'{uuid.uuid4().hex}@example.com' for _ in range(3)]
+    frame = pd.DataFrame({'email': emails, 'first_name': 'Chunk', 'last_name': 'Row', 'age': 30,
+                          'monthly_income': 3000.0})
+
+    with app_module.app.app_context():
+        first = BulkImporter(chunk_size=2).import_frame(frame.iloc[[1]])
+        result = BulkImporter(chunk_size=2).import_frame(frame)
+
+    assert first['created'] == 1
+    assert (result['created'], result['failed']) == (2, 1)
+    assert result['errors'] == [{'row': 1, 'email': emails[1], 'error': 'User with this email already exists'}]
+    assert [user['email'] for user in result['users']] == [emails[0], emails[2]]
@@ -0,0 +1,52 @@
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from database.engine import DEFAULT_DATABASE_URL, configure_database, database_url, engine_options, \
+    install_engine_hooks
+
+
+def test_database_url_prefers_the_yecs_setting(monkeypatch):
+    monkeypatch.delenv('YECS_DATABASE_URL', raising=False)
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    assert database_url() == DEFAULT_DATABASE_URL
+
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://db/platform')
+    assert database_url() == 'postgresql://db/platform'
+    monkeypatch.setenv('YECS_DATABASE_URL', 'postgresql://db/yecs')
+    assert database_url() == 'postgresql://db/yecs'
+
+
+def test_engine_options_size_the_pool_per_backend(monkeypatch):
+    monkeypatch.setenv('YECS_DB_POOL_SIZE', '4')
+
+    assert engine_options('sqlite://') == {}
+    assert engine_options('sqlite:///:memory:') == {}
+    sqlite_options = engine_options('sqlite:///yecs.db')
+    assert sqlite_options['pool_size'] == 4
+    assert 'pool_recycle' not in sqlite_options
+    assert engine_options('postgresql://db/yecs')['pool_recycle'] == 1800
+
+
+def test_configure_database_sets_the_flask_config():
+    app = Flask(__name__)
+    url = configure_database(app, 'sqlite:///scratch.db')
+
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == url == 'sqlite:///scratch.db'
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_pre_ping'] is True
+
+
+def test_sqlite_connections_get_the_tuned_pragmas(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    install_engine_hooks(engine, {'journal_mode': 'WAL', 'busy_timeout': 1234, 'synchronous': 'NORMAL'})
+
+    with engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+        # NORMAL is level 1
+        assert connection.execute(text('PRAGMA synchronous')).scalar() == 1
+    engine.dispose()
+
+
+def test_app_engine_runs_in_wal_mode(app_module):
+    with app_module.app.app_context():
+        assert app_module.db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
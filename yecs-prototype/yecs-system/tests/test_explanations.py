@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from models.ollama_async import AsyncOllamaIntegration
+
+
+def test_explanation_falls_back_to_template(client, create_applicant):
+    user_id = create_applicant(score=False)
+
+    explanation = client.get(f'/api/users/{user_id}/explanation?budget_ms=200').get_json()
+    assert explanation['source'] == 'template'
+    assert explanation['explanation']
+
+    assert client.get(f'/api/users/{10 ** 9}/explanation').status_code == 404
+
+
+def test_explanation_from_llm(client, app_module, stub_ollama, monkeypatch, create_applicant):
+    monkeypatch.setattr(app_module, 'ollama', AsyncOllamaIntegration(base_url=stub_ollama.base_url))
+    user_id = create_applicant(score=False)
+
+    explanation = client.get(f'/api/users/{user_id}/explanation').get_json()
+    assert (explanation['explanation'], explanation['source']) == ('Strong cash flow.', 'llm')
+
+
+@pytest.mark.parametrize('budget_ms', ['soon', 'nan', 'inf', '-5', '0'])
+def test_explanation_rejects_invalid_budgets(client, create_applicant, budget_ms):
+    user_id = create_applicant(score=False)
+    assert client.get(f'/api/users/{user_id}/explanation?budget_ms={budget_ms}').status_code == 400
+
+
+def test_explanation_reports_scoring_errors_as_server_errors(client, app_module, monkeypatch, create_applicant):
+    user_id = create_applicant(score=False)
+
+    def broken(user_data):
+        raise ValueError('bad input')
+
+    monkeypatch.setattr(app_module.scoring_algorithm, 'calculate_yecs_score', broken)
+    response = client.get(f'/api/users/{user_id}/explanation')
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Internal server error'}
+
+
+def test_explanation_stream_falls_back_to_template(client, create_applicant):
+    user_id = create_applicant(score=False)
+
+    stream = client.get(f'/api/users/{user_id}/explanation/stream')
+    assert stream.mimetype == 'text/event-stream'
+    body = stream.get_data(as_text=True)
+    assert body.startswith('event: score\n')
+    assert 'event: fallback\n' in body
+
+    assert client.get(f'/api/users/{10 ** 9}/explanation/stream').status_code == 404
+
+
+def test_explanation_stream_from_llm(client, app_module, stub_ollama, monkeypatch, create_applicant):
+    monkeypatch.setattr(app_module, 'ollama', AsyncOllamaIntegration(base_url=stub_ollama.base_url))
+    user_id = create_applicant(score=False)
+
+    body = client.get(f'/api/users/{user_id}/explanation/stream').get_data(as_text=True)
+    tokens = [json.loads(line[len('data: '):])['token'] for line in body.splitlines() if '"token"' in line]
+    assert ''.join(tokens) == 'Strong cash flow.'
+    assert body.rstrip().endswith('data: {}')
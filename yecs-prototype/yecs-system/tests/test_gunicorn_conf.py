@@ -0,0 +1,61 @@
+import importlib.util
+import logging
+import os
+
+from gunicorn.config import Config
+
+CONF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'gunicorn.conf.py')
+
+
+def load_conf():
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', CONF_PATH)
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+    return conf
+
+
+class FakeServer:
+    log = logging.getLogger('gunicorn.error')
+
+
+def test_settings_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv('YECS_BIND', '127.0.0.1:8000')
+    monkeypatch.setenv('YECS_WORKERS', '3')
+    monkeypatch.setenv('YECS_THREADS', '2')
+    monkeypatch.setenv('YECS_ACCESS_LOG', '')
+    conf = load_conf()
+
+    assert (conf.bind, conf.workers, conf.threads) == ('127.0.0.1:8000', 3, 2)
+    assert conf.accesslog is None
+    assert conf.preload_app is True
+    assert conf.worker_class == 'gthread'
+
+
+def test_every_setting_is_one_gunicorn_knows():
+    config = Config()
+    conf = load_conf()
+
+    for name, value in vars(conf).items():
+        if name.startswith('_') or name in ('multiprocessing', 'os'):
+            continue
+        assert name in config.settings, name
+        config.set(name, value)
+    assert config.preload_app
+
+
+def test_post_fork_leaves_the_engine_usable(app_module):
+    from sqlalchemy import text
+
+    load_conf().post_fork(FakeServer(), worker=None)
+    with app_module.app.app_context():
+        assert app_module.db.session.execute(text('SELECT 1')).scalar() == 1
+
+
+def test_worker_exit_logs_persist_failures(app_module, monkeypatch, caplog):
+    def broken():
+        raise RuntimeError('database is gone')
+
+    monkeypatch.setattr(app_module.percentile_sketches, 'persist', broken)
+    with caplog.at_level(logging.ERROR, logger='gunicorn.error'):
+        load_conf().worker_exit(FakeServer(), worker=None)
+    assert 'database is gone' in caplog.text
@@ -0,0 +1,112 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.database import db, Job
+from utils.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(app_module):
+    """A fast-polling queue with test handlers, sharing the app's jobs table"""
+    queue = JobQueue(poll_interval=0.05, stale_after=60.0, cancel_grace=0.2)
+
+    def cancels_itself(job):
+        queue.cancel(job.job_id)
+        job.progress(0.5, 'Still going')
+        return {'reached': 'the end'}
+
+    def ignores_cancellation(job):
+        queue.cancel(job.job_id)
+        time.sleep(30)
+
+    queue.register('echo', lambda job: {'echo': job.params})
+    queue.register('cancels_itself', cancels_itself)
+    queue.register('ignores_cancellation', ignores_cancellation)
+    queue.register('crashes', lambda job: os._exit(3))
+    return queue
+
+
+def run_one(app_module, queue, kind, params=None):
+    with app_module.app.app_context():
+        job_id = queue.submit(kind, params).id
+    queue.work(app_module.app, worker_id='test-worker', max_jobs=1)
+    with app_module.app.app_context():
+        db.session.expire_all()
+        return queue.get(job_id)
+
+
+def test_handler_result_is_stored(app_module, queue):
+    job = run_one(app_module, queue, 'echo', {'n': 1})
+    assert (job.status, job.progress, job.worker_id) == ('succeeded', 1.0, 'test-worker')
+    assert json.loads(job.result) == {'echo': {'n': 1}}
+
+
+def test_progress_stops_a_cancelled_job(app_module, queue):
+    job = run_one(app_module, queue, 'cancels_itself')
+    assert job.status == 'cancelled'
+    assert job.result is None
+
+
+def test_job_ignoring_cancellation_is_terminated(app_module, queue):
+    start = time.monotonic()
+    job = run_one(app_module, queue, 'ignores_cancellation')
+    assert job.status == 'cancelled'
+    assert time.monotonic() - start < 10
+
+
+def test_crashed_job_fails_with_its_exit_code(app_module, queue):
+    job = run_one(app_module, queue, 'crashes')
+    assert job.status == 'failed'
+    assert job.error == 'Job process exited with code 3'
+
+
+def test_stale_running_jobs_fail_and_are_not_claimed_twice(app_module, queue):
+    with app_module.app.app_context():
+        stale = queue.submit('echo')
+        assert queue.claim('worker-a') == stale.id
+        assert queue.claim('worker-b') is None
+        stale.heartbeat_at = datetime.utcnow() - timedelta(seconds=120)
+        db.session.commit()
+
+        assert queue.fail_stale_jobs() == 1
+        db.session.expire_all()
+        assert (stale.status, stale.error) == ('failed', 'Job worker stopped responding')
+        with pytest.raises(ValueError, match='Unknown job kind'):
+            queue.submit('mining')
+        with pytest.raises(ValueError, match='params must be an object'):
+            queue.submit('echo', ['n'])
+
+
+def test_jobs_submit_list_cancel(client, app_module):
+    response = client.post('/api/jobs', json={'kind': 'bias_audit', 'params': {'mode': 'full'}})
+    assert response.status_code == 202
+    job_id = response.get_json()['job']['job_id']
+
+    assert client.get(f'/api/jobs/{job_id}').get_json()['job']['status'] == 'queued'
+    assert job_id in [job['job_id'] for job in client.get('/api/jobs?status=queued').get_json()['jobs']]
+    assert client.get(f'/api/jobs/{job_id}/result').status_code == 409
+
+    cancelled = client.post(f'/api/jobs/{job_id}/cancel').get_json()['job']
+    assert cancelled['status'] == 'cancelled'
+    assert client.post(f'/api/jobs/{job_id}/cancel').status_code == 409
+
+    assert client.post('/api/jobs', json={'kind': 'mining'}).status_code == 400
+    assert client.get('/api/jobs?status=bogus').status_code == 400
+    assert client.get(f'/api/jobs/{10 ** 9}').status_code == 404
+
+
+def test_async_bias_analysis_runs_in_a_worker(client, app_module, create_applicant):
+    create_applicant()
+    job_id = client.post('/api/bias-analysis', json={'async': True, 'mode': 'full'}).get_json()['job']['job_id']
+
+    # One job, in a forked child of this process, like `python job_worker.py`
+    app_module.job_queue.work(app_module.app, worker_id='test-worker', max_jobs=1)
+
+    assert client.get(f'/api/jobs/{job_id}').get_json()['job']['status'] == 'succeeded'
+    result = client.get(f'/api/jobs/{job_id}/result').get_json()
+    assert result['mode'] == 'full'
+    assert 'bias_analysis' in result
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from models.micro_batcher import MicroBatcher
+
+
+class RecordingBatchFn:
+    """batch_fn doubling its items, recording each batch; blocks while `gate` is cleared"""
+
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, items):
+        self.gate.wait()
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+def test_concurrent_requests_are_coalesced():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=200)
+
+    futures = [batcher.submit(item) for item in range(11)]
+
+    assert [future.result(timeout=5) for future in futures] == [item * 2 for item in range(11)]
+    assert [len(batch) for batch in batch_fn.batches] == [8, 3]
+    batcher.close()
+
+
+def test_batch_fn_errors_reach_every_caller_and_the_worker_survives():
+    def failing(items):
+        raise RuntimeError('model exploded')
+
+    batcher = MicroBatcher(failing, max_wait_ms=20)
+    futures = [batcher.submit(item) for item in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match='model exploded'):
+            future.result(timeout=5)
+
+    batcher.batch_fn = lambda items: items
+    assert batcher.predict('still alive', timeout=5) == 'still alive'
+    batcher.close()
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: [1], max_wait_ms=50)
+    futures = [batcher.submit(item) for item in range(2)]
+    for future in futures:
+        with pytest.raises(ValueError, match='1 results for'):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_cancelled_requests_are_skipped():
+    batch_fn = RecordingBatchFn()
+    batch_fn.gate.clear()
+    batcher = MicroBatcher(batch_fn, max_wait_ms=50)
+
+    held = batcher.submit(0)
+    cancelled = batcher.submit(1)
+    kept = batcher.submit(2)
+    assert cancelled.cancel()
+    batch_fn.gate.set()
+
+    assert held.result(timeout=5) == 0
+    assert kept.result(timeout=5) == 4
+    with pytest.raises(CancelledError):
+        cancelled.result()
+    assert 1 not in [item for batch in batch_fn.batches for item in batch]
+
+    # A batch made only of cancelled requests doesn't stop the worker either
+    lone = batcher.submit(3)
+    lone.cancel()
+    assert batcher.predict(5, timeout=5) == 10
+    batcher.close()
+
+
+def test_submit_after_close_raises_and_queued_items_finish():
+    batcher = MicroBatcher(RecordingBatchFn(), max_wait_ms=50)
+    future = batcher.submit(21)
+    batcher.close()
+
+    assert future.result(timeout=0) == 42
+    with pytest.raises(RuntimeError, match='closed'):
+        batcher.submit(1)
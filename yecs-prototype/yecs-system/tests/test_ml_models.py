@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.features import RECORD_FEATURES, STORE_FEATURES
+from models.ml_models import YECSMLModel
+from utils.training_data import TrainingDataStore
+
+SMALL = {'rf_params': {'n_estimators': 5}, 'gb_params': {'n_estimators': 5}}
+
+
+def test_store_trained_model_keeps_its_own_feature_layout(tmp_path):
+    rng = np.random.default_rng(0)
+    np.save(os.path.join(tmp_path, 'features.npy'), rng.normal(size=(400, 6)))
+    np.save(os.path.join(tmp_path, 'scores.npy'), rng.uniform(300, 850, 400))
+
+    model = YECSMLModel(**SMALL)
+    model.train_model_from_store(TrainingDataStore(str(tmp_path)))
+    assert model.feature_layout == STORE_FEATURES
+    assert model.predict_features(rng.normal(size=(3, 6))).shape == (3,)
+
+    with pytest.raises(ValueError, match='training_store feature layout'):
+        model.predict_batch([{'monthly_income': 3000}])
+    with pytest.raises(ValueError, match='training_store feature layout'):
+        model.save_artifact(str(tmp_path / 'artifact'))
+    with pytest.raises(ValueError, match='Expected rows of 6 features'):
+        model.predict_features(np.zeros((2, 20)))
+
+    model.save_model(str(tmp_path / 'model.pkl'))
+    loaded = YECSMLModel()
+    loaded.load_model(str(tmp_path / 'model.pkl'))
+    assert loaded.feature_layout == STORE_FEATURES
+
+
+def test_record_trained_model_predicts_and_exports():
+    rng = np.random.default_rng(1)
+    records = pd.DataFrame({'monthly_income': rng.uniform(1000, 9000, 300), 'education_level': 'Bachelor'})
+    model = YECSMLModel(**SMALL)
+    model.train_model(records, pd.Series(rng.uniform(300, 850, 300)))
+    assert model.feature_layout == RECORD_FEATURES
+
+    applicant = [{'monthly_income': 3000, 'education_level': 'PhD'}]
+    np.testing.assert_allclose(model.export_flat_ensemble().predict_batch(applicant), model.predict_batch(applicant))
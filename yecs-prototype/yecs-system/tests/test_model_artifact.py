@@ -0,0 +1,64 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.ml_models import YECSMLModel
+from models.model_artifact import LazyModel, load_artifact, save_artifact
+
+
+@pytest.fixture(scope='module')
+def model():
+    rng = np.random.default_rng(0)
+    records = pd.DataFrame({'monthly_income': rng.uniform(1000, 9000, 300), 'education_level': 'Bachelor'})
+    model = YECSMLModel(rf_params={'n_estimators': 5}, gb_params={'n_estimators': 5})
+    model.train_model(records, pd.Series(rng.uniform(300, 850, 300)))
+    return model
+
+
+def test_save_replaces_a_legacy_directory_with_a_versioned_link(model, tmp_path):
+    target = str(tmp_path / 'artifact')
+    os.makedirs(target)
+
+    version_dir = save_artifact(model, target)
+    assert os.path.islink(target)
+    assert os.path.realpath(target) == os.path.realpath(version_dir)
+    assert len(os.listdir(f"{target}.versions")) == 2
+
+    applicant = {'monthly_income': 3000, 'education_level': 'PhD'}
+    assert LazyModel(target).predict_score(applicant) == pytest.approx(model.predict_score(applicant))
+
+
+def test_readers_never_see_a_partial_artifact(model, tmp_path):
+    target = str(tmp_path / 'artifact')
+    save_artifact(model, target)
+
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                load_artifact(target).predict_batch([{'monthly_income': 3000}])
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for _ in range(20):
+        save_artifact(model, target, keep_versions=2)
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert len(os.listdir(f"{target}.versions")) == 2
+    assert sorted(os.listdir(tmp_path)) == ['artifact', 'artifact.versions']
+
+
+def test_missing_artifact_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_artifact(str(tmp_path / 'missing'))
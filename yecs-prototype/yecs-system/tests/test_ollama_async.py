@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from models.explanation_templates import TemplateExplainer
+from models.ollama_async import AsyncOllamaIntegration, EventLoopThread
+from models.scoring_algorithm import YECScoringAlgorithm
+
+USER_DATA = {'business': {'industry': 'Retail', 'years_of_experience': 3},
+             'financial': {'monthly_income': 4200}, 'education': {'education_level': 'Bachelor'}}
+COMPONENTS = {'business_viability': 70.0, 'payment_history': 80.0, 'financial_management': 65.0,
+              'personal_creditworthiness': 60.0, 'education_background': 75.0, 'social_verification': 50.0,
+              'risk_level': 'Medium'}
+
+
+@pytest.fixture
+def loop_thread():
+    loop_thread = EventLoopThread()
+    yield loop_thread
+    loop_thread.stop()
+
+
+@pytest.fixture
+def template_explainer():
+    algorithm = YECScoringAlgorithm()
+    return TemplateExplainer(algorithm.weights, algorithm.score_range)
+
+
+def test_identical_prompts_share_one_call_and_repeat_from_cache(stub_ollama, loop_thread):
+    stub_ollama.delay = 0.2
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+
+    async def ask_many():
+        return await asyncio.gather(*[client.generate_score_explanation(USER_DATA, 650, COMPONENTS)
+                                      for _ in range(10)])
+
+    assert loop_thread.run(ask_many()) == ['Strong cash flow.'] * 10
+    assert loop_thread.run(client.generate_score_explanation(USER_DATA, 650, COMPONENTS)) == 'Strong cash flow.'
+    assert stub_ollama.chat_calls == 1
+    loop_thread.run(client.aclose())
+
+
+def test_concurrency_is_capped(stub_ollama, loop_thread):
+    stub_ollama.delay = 0.1
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url, max_concurrency=2)
+
+    async def ask_distinct():
+        return await asyncio.gather(*[client.generate_score_explanation(USER_DATA, score, COMPONENTS)
+                                      for score in (600, 610, 620, 630)])
+
+    loop_thread.run(ask_distinct())
+    assert stub_ollama.chat_calls == 4
+    assert stub_ollama.max_active == 2
+    loop_thread.run(client.aclose())
+
+
+def test_hedge_serves_template_over_budget_then_cached_llm(stub_ollama, loop_thread, template_explainer):
+    stub_ollama.delay = 0.3
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    hedged = lambda: loop_thread.run(client.generate_score_explanation_hedged(
+        USER_DATA, 650, COMPONENTS, template_explainer, budget_ms=50))
+
+    explanation, source = hedged()
+    assert source == 'template'
+    assert explanation == template_explainer.explain(650, COMPONENTS)
+
+    # The over-budget call kept running and filled the cache
+    loop_thread.run(asyncio.sleep(0.4))
+    assert hedged() == ('Strong cash flow.', 'llm')
+    assert stub_ollama.chat_calls == 1
+    loop_thread.run(client.aclose())
+
+
+def test_server_errors_open_the_circuit(stub_ollama, loop_thread, template_explainer):
+    stub_ollama.status = 500
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+
+    for score in (600, 610, 620):
+        assert loop_thread.run(client.generate_score_explanation_hedged(
+            USER_DATA, score, COMPONENTS, template_explainer))[1] == 'template'
+    assert client.circuit_breaker.is_open
+
+    assert loop_thread.run(client.generate_score_explanation(USER_DATA, 630, COMPONENTS)) == \
+        'Ollama circuit breaker is open'
+    assert stub_ollama.chat_calls == 3
+    loop_thread.run(client.aclose())
+
+
+def test_client_errors_do_not_count_as_success_or_failure(stub_ollama, loop_thread):
+    stub_ollama.status = 404
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    client.circuit_breaker.record_failure()
+
+    assert loop_thread.run(client.generate_score_explanation(USER_DATA, 650, COMPONENTS)) == \
+        'Error generating explanation: 404'
+    assert client.circuit_breaker._failures == 1
+    loop_thread.run(client.aclose())
+
+
+def test_stream_yields_tokens_through_the_loop_thread(stub_ollama, loop_thread):
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    tokens = loop_thread.iterate(client.stream_score_explanation(USER_DATA, 650, COMPONENTS))
+    assert list(tokens) == ['Strong ', 'cash ', 'flow.']
+    loop_thread.run(client.aclose())
+
+
+def test_stream_raises_on_error_status(stub_ollama, loop_thread):
+    stub_ollama.status = 503
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    with pytest.raises(RuntimeError, match='503'):
+        list(loop_thread.iterate(client.stream_score_explanation(USER_DATA, 650, COMPONENTS)))
+    loop_thread.run(client.aclose())
+
+
+def test_health_check_is_cached_and_skipped_while_the_circuit_is_open(stub_ollama, loop_thread):
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    assert loop_thread.run(client.health_check()) is True
+    assert loop_thread.run(client.health_check()) is True
+    assert stub_ollama.tags_calls == 1
+
+    stub_ollama.status = 500
+    client.health_ttl = 0
+    client._health = None
+    for _ in range(3):
+        assert loop_thread.run(client.health_check()) is False
+    assert client.circuit_breaker.is_open
+    assert stub_ollama.tags_calls == 4
+
+    # Open circuit: answered without probing until reset_timeout has passed
+    assert loop_thread.run(client.health_check()) is False
+    assert stub_ollama.tags_calls == 4
+    loop_thread.run(client.aclose())
+
+
+def test_hedge_probes_health_to_close_an_open_circuit(stub_ollama, loop_thread, template_explainer):
+    client = AsyncOllamaIntegration(base_url=stub_ollama.base_url)
+    client.circuit_breaker.reset_timeout = 0
+    for _ in range(client.circuit_breaker.failure_threshold):
+        client.circuit_breaker.record_failure()
+    assert client.circuit_breaker.is_open
+
+    assert loop_thread.run(client.generate_score_explanation_hedged(
+        USER_DATA, 650, COMPONENTS, template_explainer)) == ('Strong cash flow.', 'llm')
+    assert stub_ollama.tags_calls == 1
+    assert not client.circuit_breaker.is_open
+    loop_thread.run(client.aclose())
+
+
+def test_sync_facade_runs_the_async_client(stub_ollama):
+    from models.ollama_integration import OllamaIntegration
+
+    ollama = OllamaIntegration(base_url=stub_ollama.base_url)
+    assert ollama.health_check() is True
+    assert ollama.generate_score_explanation(USER_DATA, 650, COMPONENTS) == 'Strong cash flow.'
+    assert ollama.generate_score_explanation(USER_DATA, 650, COMPONENTS) == 'Strong cash flow.'
+    assert stub_ollama.chat_calls == 1
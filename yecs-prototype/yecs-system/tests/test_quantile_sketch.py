@@ -0,0 +1,126 @@
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import select, update
+
+from database.database import db, ScoreSketch
+from utils.quantile_sketch import KLLSketch, PercentileSketchStore
+
+
+def total_weight(sketch):
+    return sum(len(items) * 2 ** level for level, items in enumerate(sketch.levels))
+
+
+def exact_rank(values, value):
+    return 100.0 * (np.sum(values < value) + np.sum(values <= value)) / (2 * len(values))
+
+
+def test_compression_conserves_weight_and_bounds_size():
+    sketch = KLLSketch(k=50, seed=0)
+    values = np.random.default_rng(0).normal(600, 80, 20000)
+    for start in range(0, len(values), 997):
+        sketch.update_many(values[start:start + 997])
+        assert total_weight(sketch) == sketch.count == min(start + 997, len(values))
+
+    assert len(sketch.levels) > 1
+    assert sketch.num_items() < sketch._max_size()
+    assert sketch.sorted_view().count == len(values)
+
+
+def test_merged_sketch_ranks_match_exact_ranks():
+    rng = np.random.default_rng(1)
+    left_values, right_values = rng.uniform(300, 600, 30000), rng.normal(700, 40, 10000)
+    left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+    left.update_many(left_values)
+    right.update_many(right_values)
+
+    merged = left.merge(right)
+    values = np.concatenate([left_values, right_values])
+    view = merged.sorted_view()
+
+    assert total_weight(merged) == merged.count == len(values)
+    for value in (350, 500, 650, 700, 760):
+        assert view.percentile_rank(value) == pytest.approx(exact_rank(values, value), abs=1.0)
+    assert view.quantile(0.5) == pytest.approx(np.quantile(values, 0.5), abs=10)
+
+
+def test_json_round_trip_keeps_every_item():
+    sketch = KLLSketch(k=30, seed=3)
+    sketch.update_many(np.arange(1000))
+
+    restored = KLLSketch.from_json(sketch.to_json())
+
+    assert (restored.k, restored.count, restored.levels) == (sketch.k, sketch.count, sketch.levels)
+    np.testing.assert_array_equal(restored.sorted_view().items, sketch.sorted_view().items)
+    assert KLLSketch.from_json(KLLSketch().to_json()).sorted_view().count == 0
+
+
+def test_stored_merge_retries_after_a_concurrent_writer(app_module, monkeypatch):
+    metric = f'test_{uuid.uuid4().hex}'
+    store = PercentileSketchStore(k=50)
+    first, ours, theirs = KLLSketch(k=50), KLLSketch(k=50), KLLSketch(k=50)
+    first.update_many(range(100))
+    ours.update_many(range(100, 150))
+    theirs.update_many(range(150, 170))
+    from_json = KLLSketch.from_json
+    reads = []
+
+    def from_json_racing_another_worker(payload):
+        # Another worker commits its merge after we read the row and before we write it
+        reads.append(payload)
+        if len(reads) == 1:
+            with db.engine.begin() as connection:
+                stored = from_json(payload).merge(theirs)
+                connection.execute(update(ScoreSketch).where(ScoreSketch.metric == metric).values(
+                    payload=stored.to_json(), count=stored.count, version=ScoreSketch.version + 1))
+        return from_json(payload)
+
+    with app_module.app.app_context():
+        store._merge_into_stored(metric, first, max_attempts=1)
+        monkeypatch.setattr(KLLSketch, 'from_json', staticmethod(from_json_racing_another_worker))
+        store._merge_into_stored(metric, ours, max_attempts=2)
+        monkeypatch.undo()
+        count, version, payload = db.session.execute(
+            select(ScoreSketch.count, ScoreSketch.version, ScoreSketch.payload).where(ScoreSketch.metric == metric)
+        ).one()
+
+    assert len(reads) == 2
+    assert (count, version) == (170, 3)
+    assert total_weight(KLLSketch.from_json(payload)) == 170
+
+
+def test_stored_merge_gives_up_after_max_attempts(app_module, monkeypatch):
+    metric = f'test_{uuid.uuid4().hex}'
+    store = PercentileSketchStore(k=50)
+    sketch = KLLSketch(k=50)
+    sketch.update_many(range(10))
+    from_json = KLLSketch.from_json
+
+    def from_json_always_racing(payload):
+        with db.engine.begin() as connection:
+            connection.execute(update(ScoreSketch).where(ScoreSketch.metric == metric)
+                               .values(version=ScoreSketch.version + 1))
+        return from_json(payload)
+
+    with app_module.app.app_context():
+        store._merge_into_stored(metric, sketch, max_attempts=1)
+        monkeypatch.setattr(KLLSketch, 'from_json', staticmethod(from_json_always_racing))
+        with pytest.raises(RuntimeError, match='after 3 attempts'):
+            store._merge_into_stored(metric, sketch, max_attempts=3)
+
+
+def test_percentiles(client, create_applicant):
+    user_id = create_applicant()
+
+    user_percentiles = client.get(f'/api/users/{user_id}/percentiles').get_json()
+    assert 0 <= user_percentiles['percentiles']['yecs_score'] <= 100
+
+    response = client.get('/api/score-percentiles?yecs_score=850&mode=full')
+    assert response.status_code == 200
+    assert response.get_json()['percentiles']['yecs_score'] == pytest.approx(100, abs=1)
+
+    assert client.get('/api/score-percentiles').status_code == 400
+    assert client.get('/api/score-percentiles?yecs_score=high').status_code == 400
+    assert client.get('/api/score-percentiles?yecs_score=700&mode=bogus').status_code == 400
+    assert client.get(f'/api/users/{10 ** 9}/percentiles').status_code == 404
@@ -0,0 +1,43 @@
+from models.scoring_algorithm import YECScoringAlgorithm
+from utils.score_cache import ScoreCache
+
+USER_DATA = {'monthly_income': 5000.0, 'industry': 'Retail'}
+
+
+def test_fingerprint_changes_with_inputs_and_algorithm():
+    algorithm = YECScoringAlgorithm()
+    fingerprint = ScoreCache.fingerprint(USER_DATA, algorithm)
+
+    assert ScoreCache.fingerprint(dict(reversed(list(USER_DATA.items()))), algorithm) == fingerprint
+    assert ScoreCache.fingerprint(dict(USER_DATA, monthly_income=5001.0), algorithm) != fingerprint
+    algorithm.version = f'{algorithm.version}-next'
+    assert ScoreCache.fingerprint(USER_DATA, algorithm) != fingerprint
+
+
+def test_cache_evicts_least_recently_used_and_invalidates_per_user():
+    cache = ScoreCache(max_entries=2)
+    cache.put(1, 'a', {'yecs_score': 600})
+    cache.put(2, 'b', {'yecs_score': 700})
+    assert cache.get(1, 'a') == {'yecs_score': 600}
+
+    cache.put(3, 'c', {'yecs_score': 800})
+    assert cache.get(2, 'b') is None
+    assert len(cache) == 2
+
+    cache.put(1, 'd', {'yecs_score': 650})
+    cache.invalidate(1)
+    assert cache.get(1, 'd') is None
+    assert cache.get(3, 'c') == {'yecs_score': 800}
+    assert len(cache) == 1
+
+
+def test_calculate_score_is_cached_until_inputs_change(client, create_applicant):
+    user_id = create_applicant(score=False)
+
+    first = client.post(f'/api/users/{user_id}/calculate-score').get_json()
+    assert 300 <= first['yecs_score'] <= 850
+    assert first['cached'] is False
+    assert client.post(f'/api/users/{user_id}/calculate-score').get_json()['cached'] is True
+
+    client.post(f'/api/users/{user_id}/financial-data', json={'monthly_income': 1.0})
+    assert client.post(f'/api/users/{user_id}/calculate-score').get_json()['cached'] is False
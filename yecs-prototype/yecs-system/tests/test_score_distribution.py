@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from utils.score_distribution import ScoreDistributionStore, bin_edges, bin_indexes, histogram_quantile
+from utils.score_history import COMPONENT_FIELDS
+
+
+def test_bin_indexes_clip_out_of_range_scores():
+    assert bin_indexes('yecs_score', [250, 300, 309.9, 310, 849, 850, 900]).tolist() == [0, 0, 0, 1, 54, 54, 54]
+    assert bin_indexes('payment_history', [-1, 0.5, 99.5, 100]).tolist() == [0, 0, 99, 99]
+
+
+def test_histogram_quantiles_are_within_a_bin_of_the_exact_quantiles():
+    values = np.random.default_rng(0).uniform(0, 100, 5000)
+    edges = bin_edges('payment_history')
+    counts = np.bincount(bin_indexes('payment_history', values), minlength=len(edges) - 1)
+
+    for q in (0.1, 0.5, 0.9):
+        assert histogram_quantile(counts, edges, q) == pytest.approx(np.quantile(values, q), abs=1)
+
+
+def test_snapshot_from_recorded_rows():
+    rows = [
+        {'yecs_score': 305, 'risk_level': 'HIGH', 'payment_history_score': 50.0},
+        {'yecs_score': 712, 'risk_level': 'LOW', 'payment_history_score': np.nan},
+        {'yecs_score': 716, 'risk_level': 'LOW', 'payment_history_score': 70.0}
+    ]
+    rows = [dict({column.key: 0.0 for column in COMPONENT_FIELDS.values()}, **row) for row in rows]
+    counts = {}
+    for (metric, bucket), count in ScoreDistributionStore._bucket_counts(rows).items():
+        counts.setdefault(metric, {})[bucket] = count
+
+    snapshot = ScoreDistributionStore.build_snapshot(counts)
+
+    assert snapshot['total_scores'] == 3
+    assert {(bin_['min'], bin_['count']) for bin_ in snapshot['histogram'] if bin_['count']} == {(300, 1), (710, 2)}
+    assert snapshot['risk_levels'] == {'LOW': 2, 'MEDIUM': 0, 'HIGH': 1, 'VERY_HIGH': 0}
+    # The NaN payment history score is left out of its histogram
+    assert sum(counts['payment_history'].values()) == 2
+
+
+def test_score_distribution_counts_every_score(client, create_applicant):
+    create_applicant()
+    incremental = client.get('/api/score-distribution').get_json()
+    full = client.get('/api/score-distribution?mode=full').get_json()
+
+    assert incremental['total_scores'] == full['total_scores'] > 0
+    assert client.get('/api/score-distribution?mode=bogus').status_code == 400
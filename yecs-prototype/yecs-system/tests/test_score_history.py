@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from database.database import db, CreditScore
+from utils.score_history import COMPONENT_FIELDS, decode_cursor, encode_cursor, load_score_history, parse_fields
+
+
+def test_parse_fields_expands_component_scores():
+    assert parse_fields('yecs_score, component_scores,yecs_score') == ['yecs_score'] + list(COMPONENT_FIELDS)
+    assert parse_fields('score_id,created_at') == []
+    with pytest.raises(ValueError, match='Unknown field: password'):
+        parse_fields('password')
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 250)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor('bm90IGEgY3Vyc29y')
+
+
+def test_keyset_pages_break_timestamp_ties_by_id_and_downsample_by_day(app_module, create_applicant):
+    user_id = create_applicant(score=False)
+    timestamps = [datetime(2026, 1, 1, 9), datetime(2026, 1, 1, 9), datetime(2026, 1, 1, 17), datetime(2026, 1, 2, 8)]
+
+    with app_module.app.app_context():
+        db.session.execute(insert(CreditScore), [
+            {'user_id': user_id, 'yecs_score': 600 + i, 'created_at': created_at}
+            for i, created_at in enumerate(timestamps)
+        ])
+        db.session.commit()
+
+        pages, cursor = [], None
+        while True:
+            page = load_score_history(user_id, ['yecs_score'], limit=1, cursor=cursor)
+            pages.append([entry['yecs_score'] for entry in page['score_history']])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        daily = load_score_history(user_id, ['yecs_score'], limit=None, downsample='day')
+
+        with pytest.raises(ValueError, match='downsample must be one of'):
+            load_score_history(user_id, ['yecs_score'], limit=None, downsample='hour')
+
+    assert pages == [[603], [602], [601], [600]]
+    assert [entry['yecs_score'] for entry in daily['score_history']] == [603, 602]
+
+
+def test_score_history_pages_with_a_keyset_cursor(client, create_applicant):
+    user_id = create_applicant(score=False)
+    for income in (2000.0, 4000.0, 6000.0):
+        client.post(f'/api/users/{user_id}/financial-data', json={'monthly_income': income})
+        client.post(f'/api/users/{user_id}/calculate-score')
+
+    history = client.get(f'/api/users/{user_id}/scores').get_json()
+    assert len(history['score_history']) == 3
+    assert history['next_cursor'] is None
+
+    page = client.get(f'/api/users/{user_id}/scores?limit=2&fields=yecs_score').get_json()
+    assert [set(entry) for entry in page['score_history']] == [{'score_id', 'yecs_score', 'created_at'}] * 2
+    rest = client.get(f"/api/users/{user_id}/scores?limit=2&cursor={page['next_cursor']}").get_json()
+    assert rest['next_cursor'] is None
+    assert [entry['score_id'] for entry in page['score_history'] + rest['score_history']] == \
+        [entry['score_id'] for entry in history['score_history']]
+
+    assert client.get(f'/api/users/{user_id}/scores?limit=0').status_code == 400
+    assert client.get(f'/api/users/{user_id}/scores?fields=password').status_code == 400
+    assert client.get(f'/api/users/{user_id}/scores?cursor=garbage').status_code == 400
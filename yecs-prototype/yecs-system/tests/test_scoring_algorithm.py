@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from models.scoring_algorithm import BATCH_COLUMNS, YECScoringAlgorithm
+
+# Divisors in the scalar path, which raises ZeroDivisionError on 0
+POSITIVE_COLUMNS = ('industry_average_revenue', 'monthly_income')
+EDUCATION_LEVELS = ['', 'High School', 'Associate Degree', "Bachelor's", 'MBA', 'Master of Science', 'PhD',
+                    'doctorate', 'Bootcamp']
+
+
+def random_user_data(rng):
+    """Nested scoring input with a random subset of keys and values in and beyond their usual ranges"""
+    user_data = {}
+    for section, columns in BATCH_COLUMNS.items():
+        values = {}
+        for column in columns:
+            if rng.random() < 0.15:
+                continue
+            if column == 'education_level':
+                values[column] = EDUCATION_LEVELS[rng.integers(len(EDUCATION_LEVELS))]
+            elif column in POSITIVE_COLUMNS:
+                values[column] = float(rng.uniform(1.0, 200000.0))
+            elif rng.random() < 0.1:
+                values[column] = 0
+            else:
+                scale = rng.choice([1.0, 10.0, 1000.0, 200000.0])
+                values[column] = float(rng.uniform(-0.1, 1.2) * scale)
+        user_data[section] = values
+    return user_data
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_scores_match_scalar_scores(seed):
+    algorithm = YECScoringAlgorithm()
+    rng = np.random.default_rng(seed)
+    records = [random_user_data(rng) for _ in range(2000)]
+
+    final_scores, component_scores = algorithm.calculate_yecs_scores_batch(algorithm.flatten_user_data(records))
+
+    for i, user_data in enumerate(records):
+        expected_score, expected_components = algorithm.calculate_yecs_score(user_data)
+        assert final_scores[i] == expected_score, user_data
+        for name, expected in expected_components.items():
+            assert component_scores[name][i] == expected, (name, user_data)
+
+
+def test_batch_fills_missing_columns_with_scalar_defaults():
+    algorithm = YECScoringAlgorithm()
+    final_scores, component_scores = algorithm.calculate_yecs_scores_batch({'monthly_income': [5000.0, None]})
+
+    for i, user_data in enumerate([{'financial': {'monthly_income': 5000.0}}, {}]):
+        expected_score, expected_components = algorithm.calculate_yecs_score(user_data)
+        assert final_scores[i] == expected_score
+        assert component_scores['risk_level'][i] == expected_components['risk_level']
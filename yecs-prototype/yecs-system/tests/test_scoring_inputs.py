@@ -0,0 +1,37 @@
+from sqlalchemy import event, inspect
+
+
+def test_scoring_inputs_load_in_one_query(app_module, create_applicant):
+    from database.database import db, load_scoring_inputs
+
+    user_id = create_applicant(score=False)
+    with app_module.app.app_context():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            user, business_profile, financial_data = load_scoring_inputs(user_id)
+            missing = load_scoring_inputs(10 ** 9)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    # One SELECT per call, not one per table
+    assert len(statements) == 2
+    assert user.id == business_profile.user_id == financial_data.user_id == user_id
+    assert missing == (None, None, None)
+
+
+def test_user_id_foreign_keys_are_indexed(app_module):
+    from database.database import db, BusinessProfile, FinancialData, CreditScore
+
+    with app_module.app.app_context():
+        inspector = inspect(db.engine)
+        indexed = {model: [index['column_names'] for index in inspector.get_indexes(model.__tablename__)]
+                   for model in (BusinessProfile, FinancialData, CreditScore)}
+
+    assert ['user_id'] in indexed[BusinessProfile]
+    assert ['user_id'] in indexed[FinancialData]
+    assert ['user_id', 'created_at'] in indexed[CreditScore]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.training_pipeline import TrainingPipeline, split_params
+
+SMALL_GRID = {'rf__n_estimators': [3, 5], 'gb__n_estimators': [5]}
+
+
+def run_job(client, app_module, params):
+    job_id = client.post('/api/jobs', json={'kind': 'model_training', 'params': params}).get_json()['job']['job_id']
+    app_module.job_queue.work(app_module.app, worker_id='test-worker', max_jobs=1)
+    return client.get(f'/api/jobs/{job_id}').get_json()['job']
+
+
+def test_pipeline_searches_the_grid_and_reports_every_candidate():
+    rng = np.random.default_rng(0)
+    records = pd.DataFrame({'monthly_income': rng.uniform(1000, 9000, 120), 'age': rng.integers(18, 65, 120)})
+    targets = pd.Series(400 + records['monthly_income'] / 30)
+
+    model, report = TrainingPipeline(folds=2, max_workers=2).run(records, targets, param_grid=SMALL_GRID)
+
+    assert model.is_trained
+    assert [result['params'] for result in report['cv_results']] == [
+        {'gb__n_estimators': 5, 'rf__n_estimators': 3}, {'gb__n_estimators': 5, 'rf__n_estimators': 5}
+    ]
+    assert report['best_params'] in [result['params'] for result in report['cv_results']]
+    assert model.rf_model.n_estimators == report['best_params']['rf__n_estimators']
+    assert set(report['timings']) == {'prepare', 'search', 'fit', 'evaluate'}
+
+
+def test_split_params_rejects_unprefixed_names():
+    assert split_params({'rf__max_depth': 4, 'gb__learning_rate': 0.1}) == ({'max_depth': 4}, {'learning_rate': 0.1})
+    with pytest.raises(ValueError, match="must start with 'rf__' or 'gb__'"):
+        split_params({'max_depth': 4})
+
+
+def test_model_training_job_runs_the_parameter_search(client, app_module, create_applicant):
+    for age, income in zip(range(20, 32), range(2000, 8000, 500)):
+        create_applicant(age=age, monthly_income=float(income))
+
+    job = run_job(client, app_module, {'cv_folds': 2, 'max_workers': 1,
+                                       'search': {'param_grid': SMALL_GRID, 'strategy': 'random', 'n_iter': 1}})
+
+    assert job['status'] == 'succeeded', job
+    result = client.get(f"/api/jobs/{job['job_id']}/result").get_json()
+    assert len(result['cv_results']) == 1
+    assert result['best_params'] == result['cv_results'][0]['params']
+    assert result['training_rows'] >= 12
+    assert 'artifact_dir' not in result
+
+
+def test_model_training_job_rejects_an_unknown_search_strategy(client, app_module):
+    job = run_job(client, app_module, {'search': {'param_grid': SMALL_GRID, 'strategy': 'annealing'}})
+
+    assert job['status'] == 'failed'
+    assert 'Unknown search strategy' in job['error']
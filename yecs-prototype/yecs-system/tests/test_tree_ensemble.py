@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.ml_models import YECSMLModel
+from models.tree_ensemble import FlatTreeEnsemble
+from utils.training_data import TrainingDataStore
+
+
+def train_on_store(tmp_path, rf_params=None, gb_params=None):
+    """A model trained on random features, with targets well inside the 300-850 clip"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 6))
+    np.save(os.path.join(tmp_path, 'features.npy'), X)
+    np.save(os.path.join(tmp_path, 'scores.npy'), 575 + 60 * X[:, 0] - 40 * X[:, 1] * X[:, 2])
+
+    model = YECSMLModel(rf_params={'n_estimators': 10, **(rf_params or {})},
+                        gb_params={'n_estimators': 20, **(gb_params or {})})
+    model.train_model_from_store(TrainingDataStore(str(tmp_path)))
+    return model
+
+
+def test_flat_ensemble_matches_sklearn(tmp_path):
+    model = train_on_store(tmp_path)
+    flat = FlatTreeEnsemble.from_model(model)
+    X = np.random.default_rng(1).normal(size=(300, 6))
+
+    np.testing.assert_allclose(flat.predict_features(X), model.predict_features(X), rtol=1e-9, atol=0)
+    # Batches smaller than the input are stitched back in order
+    np.testing.assert_allclose(flat.predict_features(X, batch_size=7), model.predict_features(X),
+                               rtol=1e-9, atol=0)
+    assert flat.validate(model, X) < 1e-6
+
+
+def test_flat_ensemble_matches_sklearn_on_a_single_row(tmp_path):
+    model = train_on_store(tmp_path)
+    flat = FlatTreeEnsemble.from_model(model)
+    row = np.random.default_rng(2).normal(size=(1, 6))
+
+    assert flat.predict_features(row).shape == (1,)
+    assert flat.predict_features(row)[0] == pytest.approx(model.predict_features(row)[0], rel=1e-9)
+
+
+def test_flat_ensemble_handles_leaf_only_trees(tmp_path):
+    # No RF tree can split, so each is a single leaf next to ordinary boosting trees
+    model = train_on_store(tmp_path, rf_params={'min_samples_split': 10 ** 6})
+    flat = FlatTreeEnsemble.from_model(model)
+    X = np.random.default_rng(3).normal(size=(50, 6))
+
+    assert all(estimator.tree_.node_count == 1 for estimator in model.rf_model.estimators_)
+    np.testing.assert_allclose(flat.predict_features(X), model.predict_features(X), rtol=1e-9, atol=0)
+
+
+def test_flat_ensemble_of_only_leaves_predicts_a_constant(tmp_path):
+    model = train_on_store(tmp_path, rf_params={'min_samples_split': 10 ** 6},
+                           gb_params={'min_samples_split': 10 ** 6})
+    flat = FlatTreeEnsemble.from_model(model)
+    X = np.random.default_rng(4).normal(size=(5, 6))
+
+    assert flat.max_depth == 0
+    np.testing.assert_allclose(flat.predict_features(X), model.predict_features(X), rtol=1e-9, atol=0)
+    assert len(set(flat.predict_features(X))) == 1
+
+
+def test_flat_ensemble_round_trips_through_arrays_and_records(tmp_path):
+    rng = np.random.default_rng(5)
+    records = pd.DataFrame({'monthly_income': rng.uniform(1000, 9000, 300), 'age': rng.integers(18, 65, 300),
+                            'education_level': 'Bachelor'})
+    model = YECSMLModel(rf_params={'n_estimators': 5}, gb_params={'n_estimators': 5})
+    model.train_model(records, pd.Series(400 + records['monthly_income'] / 30))
+
+    flat = FlatTreeEnsemble.from_arrays(model.export_flat_ensemble().to_arrays())
+    batch = records.head(4).to_dict('records')
+    np.testing.assert_allclose(flat.predict_batch(batch), model.predict_batch(batch), rtol=1e-9, atol=0)
+    np.testing.assert_allclose(flat.predict_batch(batch[:1]), model.predict_batch(batch[:1]), rtol=1e-9, atol=0)
+
+
+def test_untrained_model_cannot_be_flattened():
+    with pytest.raises(ValueError, match='trained'):
+        FlatTreeEnsemble.from_model(YECSMLModel())
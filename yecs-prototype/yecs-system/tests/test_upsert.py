@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from database.database import db, BiasGroupStatistic, upsert_add, _upsert_add_portable
+
+KEYS = ['attribute', 'group_value']
+ADDED = ['count', 'score_sum', 'score_sum_sq']
+
+
+def statistic_rows(attribute, *groups):
+    return [{'attribute': attribute, 'group_value': group, 'count': 1, 'score_sum': score,
+             'score_sum_sq': score * score, 'updated_at': datetime(2026, 1, 1, second=score % 60)}
+            for group, score in groups]
+
+
+def stored(attribute):
+    rows = db.session.execute(select(BiasGroupStatistic.__table__).where(BiasGroupStatistic.attribute == attribute))
+    return {row.group_value: (row.count, row.score_sum, row.score_sum_sq, row.updated_at) for row in rows}
+
+
+@pytest.mark.parametrize('upsert', [upsert_add, _upsert_add_portable])
+def test_upsert_inserts_new_keys_and_adds_onto_existing_ones(app_module, upsert):
+    attribute = f'test_{uuid.uuid4().hex[:8]}'
+
+    with app_module.app.app_context():
+        upsert(BiasGroupStatistic, statistic_rows(attribute, ('a', 600)), KEYS, ADDED)
+        upsert(BiasGroupStatistic, statistic_rows(attribute, ('a', 700), ('b', 650)), KEYS, ADDED)
+        db.session.commit()
+
+        assert stored(attribute) == {
+            'a': (2, 1300, 600 ** 2 + 700 ** 2, datetime(2026, 1, 1, second=700 % 60)),
+            'b': (1, 650, 650 ** 2, datetime(2026, 1, 1, second=650 % 60))
+        }
+
+
+def test_portable_upsert_adds_onto_a_row_inserted_after_its_update(app_module, monkeypatch):
+    attribute = f'test_{uuid.uuid4().hex[:8]}'
+    execute = db.session.execute
+    updates = []
+
+    def execute_missing_the_first_update(statement, *args, **kwargs):
+        # The first UPDATE runs as if the key did not exist yet, like a racing insert from another worker
+        if statement.is_dml and statement.is_update:
+            updates.append(statement)
+            if len(updates) == 1:
+                return type('Result', (), {'rowcount': 0})()
+        return execute(statement, *args, **kwargs)
+
+    with app_module.app.app_context():
+        _upsert_add_portable(BiasGroupStatistic, statistic_rows(attribute, ('a', 600)), KEYS, ADDED)
+        monkeypatch.setattr(db.session, 'execute', execute_missing_the_first_update)
+        _upsert_add_portable(BiasGroupStatistic, statistic_rows(attribute, ('a', 700)), KEYS, ADDED)
+        monkeypatch.undo()
+        db.session.commit()
+
+        assert len(updates) == 2
+        assert stored(attribute)['a'][:2] == (2, 1300)
+
+
+def test_portable_upsert_gives_up_after_max_attempts(app_module, monkeypatch):
+    attribute = f'test_{uuid.uuid4().hex[:8]}'
+    execute = db.session.execute
+
+    def execute_never_matching(statement, *args, **kwargs):
+        if statement.is_dml and statement.is_update:
+            return type('Result', (), {'rowcount': 0})()
+        return execute(statement, *args, **kwargs)
+
+    with app_module.app.app_context():
+        _upsert_add_portable(BiasGroupStatistic, statistic_rows(attribute, ('a', 600)), KEYS, ADDED)
+        monkeypatch.setattr(db.session, 'execute', execute_never_matching)
+        with pytest.raises(RuntimeError, match='after 2 attempts'):
+            _upsert_add_portable(BiasGroupStatistic, statistic_rows(attribute, ('a', 700)), KEYS, ADDED,
+                                 max_attempts=2)
+        monkeypatch.undo()
+        db.session.rollback()